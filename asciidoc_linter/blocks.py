@@ -0,0 +1,218 @@
+# blocks.py - Delimited block matching
+"""
+Matching of AsciiDoc delimited blocks.
+
+Delimited blocks are enclosed by a pair of identical delimiter lines. Apart
+from the open block (--) and tables (|===), delimiters consist of at least
+four repetitions of the same character, and the closing delimiter has to
+match the opening one exactly. Blocks of the same type can therefore be
+nested by using delimiters of different length. Delimiter lines start at the
+beginning of the line; indented lines are never delimiters.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional
+
+# Block type by delimiter character for delimiters of variable length
+BLOCK_TYPES: Dict[str, str] = {
+    "-": "listing",
+    "=": "example",
+    "*": "sidebar",
+    ".": "literal",
+    "_": "quote",
+    "/": "comment",
+    "+": "passthrough",
+}
+
+# Human readable block names used in messages
+BLOCK_NAMES: Dict[str, str] = {
+    "listing": "listing block",
+    "example": "example block",
+    "sidebar": "sidebar block",
+    "literal": "literal block",
+    "quote": "quote block",
+    "comment": "comment block",
+    "passthrough": "passthrough block",
+    "table": "table block",
+    "open": "open block",
+}
+
+# Blocks whose content is not parsed as AsciiDoc, so they cannot contain
+# other delimited blocks
+VERBATIM_BLOCK_TYPES = frozenset(
+    {"listing", "literal", "comment", "passthrough", "table"}
+)
+
+# Blocks whose content is shown or dropped as is instead of being rendered
+# as AsciiDoc text, so markup checks should skip them
+RAW_BLOCK_TYPES = frozenset({"listing", "literal", "comment", "passthrough"})
+
+# First characters of table delimiters (|=== and the nested/CSV/DSV variants)
+TABLE_DELIMITER_CHARS = "|!,:"
+
+
+def block_type(stripped: str) -> Optional[str]:
+    """Return the block type of a delimiter line, or None for other lines."""
+    length = len(stripped)
+    if length < 2:
+        return None
+    first = stripped[0]
+    if length == 2:
+        return "open" if stripped == "--" else None
+    if first in TABLE_DELIMITER_CHARS:
+        if length >= 4 and stripped[1] == "=" and stripped.count("=") == length - 1:
+            return "table"
+        return None
+    kind = BLOCK_TYPES.get(first)
+    if kind is not None and length >= 4 and stripped.count(first) == length:
+        return kind
+    return None
+
+
+@dataclass
+class DelimitedBlock:
+    """A delimited block found in a document"""
+
+    kind: str
+    delimiter: str
+    start: int  # 0-based line index of the opening delimiter
+    end: Optional[int] = None  # 0-based line index of the closing delimiter
+    depth: int = 0  # number of enclosing delimited blocks
+    index: int = 0  # position in the list of blocks of the document
+
+    @property
+    def name(self) -> str:
+        return BLOCK_NAMES[self.kind]
+
+    @property
+    def terminated(self) -> bool:
+        return self.end is not None
+
+    @property
+    def verbatim(self) -> bool:
+        return self.kind in VERBATIM_BLOCK_TYPES
+
+
+class BlockTracker:
+    """
+    The open delimited blocks of a document read line by line.
+
+    Only the stack of open blocks is kept, so documents of any length can be
+    tracked in memory proportional to the nesting depth.
+    """
+
+    def __init__(self):
+        self.stack: List[DelimitedBlock] = []
+        self.count = 0  # Number of blocks opened so far
+        self._open_delimiters: Dict[str, int] = {}
+
+    def feed(self, index: int, line: str) -> Optional[DelimitedBlock]:
+        """
+        Track the line with the 0-based index and return its innermost block.
+        Delimiter lines belong to the block they open or close.
+        """
+        stack = self.stack
+        # Trailing whitespace is ignored, indented lines are no delimiters
+        stripped = line.rstrip()
+        if not stripped:
+            return stack[-1] if stack else None
+
+        open_delimiters = self._open_delimiters
+        if stack and stack[-1].verbatim:
+            block = stack[-1]
+            if stripped == block.delimiter:
+                stack.pop().end = index
+                open_delimiters[stripped] -= 1
+            return block
+
+        if open_delimiters.get(stripped):
+            # Close the matching block, inner blocks remain unterminated
+            while True:
+                block = stack.pop()
+                open_delimiters[block.delimiter] -= 1
+                if block.delimiter == stripped:
+                    block.end = index
+                    return block
+
+        kind = block_type(stripped)
+        if kind is not None:
+            block = DelimitedBlock(
+                kind, stripped, index, depth=len(stack), index=self.count
+            )
+            self.count += 1
+            stack.append(block)
+            open_delimiters[stripped] = open_delimiters.get(stripped, 0) + 1
+            return block
+
+        return stack[-1] if stack else None
+
+
+class BlockMap:
+    """
+    The delimited blocks of a document and the innermost block of every line.
+
+    The map is built in a single pass. Delimiter lines belong to the block
+    they open or close. Looking up the block of a line takes constant time.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self.blocks: List[DelimitedBlock] = []
+        # Index into blocks of the innermost block of each line, -1 for none
+        self._line_blocks = array("i")
+
+        tracker = BlockTracker()
+        stack = tracker.stack
+        blocks = self.blocks
+        line_blocks = self._line_blocks
+
+        for index, line in enumerate(lines):
+            if not line:
+                # Most lines, passed as empty strings by the line table
+                line_blocks.append(stack[-1].index if stack else -1)
+                continue
+            block = tracker.feed(index, line)
+            if block is None:
+                line_blocks.append(-1)
+                continue
+            if block.index == len(blocks):
+                blocks.append(block)
+            line_blocks.append(block.index)
+
+    def __len__(self) -> int:
+        return len(self._line_blocks)
+
+    def __iter__(self) -> Iterator[Optional[DelimitedBlock]]:
+        """Iterate over the innermost block of every line"""
+        blocks = self.blocks
+        for block_index in self._line_blocks:
+            yield blocks[block_index] if block_index >= 0 else None
+
+    def block_at(self, index: int) -> Optional[DelimitedBlock]:
+        """Return the innermost block containing the 0-based line index"""
+        block_index = self._line_blocks[index]
+        return self.blocks[block_index] if block_index >= 0 else None
+
+    def kind_at(self, index: int) -> Optional[str]:
+        """Return the type of the innermost block containing the line"""
+        block = self.block_at(index)
+        return block.kind if block is not None else None
+
+    def in_block(self, index: int, kinds: AbstractSet[str]) -> bool:
+        """Check whether the innermost block of the line is of one of the types"""
+        block = self.block_at(index)
+        return block is not None and block.kind in kinds
+
+
+def match_blocks(lines: Iterable[str]) -> List[DelimitedBlock]:
+    """
+    Match the delimiters of all delimited blocks in a single pass.
+
+    A delimiter line closes the innermost open block with the same delimiter.
+    Blocks that are still open inside it, and blocks open at the end of the
+    document, stay unterminated. Inside verbatim blocks only the closing
+    delimiter is recognised.
+
+    Returns the blocks ordered by their opening line.
+    """
+    return BlockMap(lines).blocks
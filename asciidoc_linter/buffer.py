@@ -0,0 +1,109 @@
+# buffer.py - Document text with a line index
+"""
+The text of a document together with an index of its lines.
+
+A document is read and decoded once; large files are decoded straight from a
+memory map, without reading them into a bytes object first. Instead of a
+list of line strings, the buffer keeps the start and end offset of every line
+in two compact arrays. Lines are sliced from the text when they are accessed,
+so the document is held in memory about once, plus 16 bytes per line.
+Character offsets are mapped to lines and columns by bisecting the start
+offsets.
+
+Lines are split like str.splitlines() splits them, and line breaks are
+translated to "\\n" like reading a file in text mode does.
+"""
+
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from operator import add
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, Union, overload
+
+# Files of this size or larger are decoded from a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Characters of text split into lines at once
+CHUNK_SIZE = 1024 * 1024
+
+# Enough for offsets of any file, 8 bytes per entry
+OFFSET_TYPECODE = "q"
+
+
+def translate_newlines(text: str) -> str:
+    """Translate \\r\\n and \\r to \\n like universal newlines mode"""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class DocumentBuffer(Sequence[str]):
+    """
+    The text of a document and the offsets of its lines. As a sequence, the
+    buffer contains the lines of the document without line breaks.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = array(OFFSET_TYPECODE)
+        self.ends = array(OFFSET_TYPECODE)
+        # The text is split in chunks ending after a "\n", which always ends
+        # a line, so only a chunk of line strings exists at a time
+        start = 0
+        length = len(text)
+        while start < length:
+            cut = text.find("\n", start + CHUNK_SIZE) + 1 or length
+            chunk = text[start:cut] if start or cut < length else text
+            line_starts = list(
+                accumulate(map(len, chunk.splitlines(True)), initial=start)
+            )
+            line_starts.pop()  # The end of the chunk
+            self.starts.extend(line_starts)
+            self.ends.extend(map(add, line_starts, map(len, chunk.splitlines())))
+            start = cut
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview, mmap.mmap]) -> "DocumentBuffer":
+        """Decode UTF-8 content, raises UnicodeDecodeError if it is invalid"""
+        return cls(translate_newlines(str(data, "utf-8")))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "DocumentBuffer":
+        """Read a UTF-8 file, decoding large files from a memory map"""
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                return cls.from_bytes(file.read())
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return cls.from_bytes(mapped)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.starts)))]
+        return self.text[self.starts[index] : self.ends[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        for start, end in zip(self.starts, self.ends):
+            yield text[start:end]
+
+    def line_length(self, index: int) -> int:
+        """Return the length of a line without slicing it"""
+        return self.ends[index] - self.starts[index]
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based line and column of a character offset"""
+        index = max(bisect_right(self.starts, offset) - 1, 0)
+        return index + 1, offset - (self.starts[index] if self.starts else 0) + 1
@@ -0,0 +1,258 @@
+# cache.py - Persistent cache for lint results
+"""
+On-disk cache for the findings of linted files.
+
+Results are stored by the hash of the file content combined with a
+fingerprint of the linter (package version, active rules and configuration),
+so identical files share one entry and any change to the rules or the
+configuration invalidates the cache. An index remembers the content hash of
+each path together with its modification time and size, so unchanged files
+are not read again. Paths are dropped from the index when they can no longer
+be found.
+
+Entries are written to temporary files and renamed into place, which keeps
+the cache consistent when several linter processes use it at the same time.
+The index also keeps the total size of the entries, so the entries only
+have to be listed when the cache grows beyond its maximum size. The least
+recently used entries are then removed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+DEFAULT_CACHE_DIR = ".asciidoc-linter-cache"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # bytes
+
+# Files modified this recently are not added to the index, as a later change
+# within the resolution of the file system clock could go unnoticed
+RACY_INTERVAL_NS = 2_000_000_000
+
+INDEX_FILE = "index.json"
+RESULTS_DIR = "results"
+
+
+def content_digest(data: bytes) -> str:
+    """Return the hash of a file content"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a hash of JSON serialisable values"""
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file by renaming a temporary file into place"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ResultCache:
+    """Cache of lint results keyed by file content and linter fingerprint"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = DEFAULT_CACHE_DIR,
+        fingerprint: str = "",
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        self.directory = Path(directory)
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self._index: Optional[Dict[str, List[Any]]] = None
+        self._index_changed = False
+        self._removed: Set[str] = set()
+        self._size: Optional[int] = None  # Total size of the entries if known
+        self._written = 0  # Size of the entries written since the last save
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def index(self) -> Dict[str, List[Any]]:
+        """Content hash, modification time and size by path, loaded on first use"""
+        if self._index is None:
+            self._index = {}
+            self._size = None
+            try:
+                with open(self.directory / INDEX_FILE, "rb") as index_file:
+                    data = json.load(index_file)
+            except (OSError, ValueError):
+                return self._index
+            if isinstance(data, dict) and isinstance(data.get("files"), dict):
+                self._index = data["files"]
+                if isinstance(data.get("size"), int):
+                    self._size = data["size"]
+        return self._index
+
+    def file_digest(
+        self, file_path: Union[str, Path]
+    ) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Return the content hash of a file.
+
+        The hash is taken from the index if the modification time and size of
+        the file are unchanged. Otherwise the file is read and the content is
+        returned together with its hash. Raises OSError if the file cannot be
+        read.
+        """
+        key = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self._drop(key)
+            raise
+        entry = self.index.get(key)
+        if entry and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+            return entry[0], None
+
+        with open(file_path, "rb") as source:
+            data = source.read()
+        digest = content_digest(data)
+        if time.time_ns() - stat.st_mtime_ns > RACY_INTERVAL_NS:
+            self.index[key] = [digest, stat.st_mtime_ns, stat.st_size]
+            self._index_changed = True
+        return digest, data
+
+    def read_file(self, file_path: Union[str, Path]) -> Tuple[str, bytes]:
+        """Read a file regardless of the index and return its hash and content"""
+        self.index.pop(os.path.abspath(file_path), None)
+        return self.file_digest(file_path)
+
+    def _drop(self, key: str) -> None:
+        """Remove a path from the index, also when saved by other processes"""
+        self._removed.add(key)
+        if self.index.pop(key, None) is not None:
+            self._index_changed = True
+
+    def _entry_path(self, digest: str) -> Path:
+        key = hashlib.sha256(f"{self.fingerprint}:{digest}".encode()).hexdigest()
+        return self.directory / RESULTS_DIR / key[:2] / f"{key}.json"
+
+    def get(self, digest: str) -> Optional[List[Any]]:
+        """Return the cached results for a content hash, or None"""
+        path = self._entry_path(digest)
+        try:
+            with open(path, "rb") as entry_file:
+                results = json.load(entry_file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            # Mark the entry as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return results
+
+    def put(self, digest: str, results: List[Any]) -> None:
+        """Store the results for a content hash"""
+        try:
+            data = json.dumps(results, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return  # Results that cannot be serialised are not cached
+        try:
+            self._create_directory()
+            write_atomic(self._entry_path(digest), data)
+        except OSError:
+            return
+        self._written += len(data)
+
+    def _create_directory(self) -> None:
+        """Create the cache directory, ignored by git"""
+        if not self.directory.is_dir():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.directory / ".gitignore", b"*\n")
+
+    def save(self) -> None:
+        """
+        Write the index and evict entries beyond the maximum size if entries
+        were added
+        """
+        if not self._index_changed and not self._written:
+            return
+        self._index_changed = False
+        self._merge_index()
+        if self._written:
+            if self._size is None or self._size + self._written > self.max_size:
+                self._size = self.prune()
+            else:
+                self._size += self._written
+            self._written = 0
+        index = {"files": self._index, "size": self._size}
+        try:
+            self._create_directory()
+            write_atomic(
+                self.directory / INDEX_FILE,
+                json.dumps(index, separators=(",", ":")).encode("utf-8"),
+            )
+        except OSError:
+            pass
+
+    def _merge_index(self) -> None:
+        """Keep index entries written by other processes in the meantime"""
+        current = self._index or {}
+        self._index = None
+        merged = self.index
+        for path in self._removed:
+            merged.pop(path, None)
+        self._removed.clear()
+        merged.update(current)
+
+    def prune(self) -> int:
+        """
+        Remove the least recently used entries if the cache is too large and
+        return the size of the remaining entries
+        """
+        entries = []
+        total_size = 0
+        try:
+            subdirectories = list(os.scandir(self.directory / RESULTS_DIR))
+        except OSError:
+            return 0
+        for subdirectory in subdirectories:
+            if not subdirectory.is_dir():
+                continue
+            try:
+                files = os.scandir(subdirectory.path)
+            except OSError:
+                continue
+            with files:
+                for entry in files:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return total_size
+        # Evict down to 80% of the limit, so not every run has to evict
+        target = self.max_size * 0.8
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total_size -= size
+        return total_size
@@ -4,10 +4,32 @@ Command line interface for the AsciiDoc linter
 """
 
 import argparse
+import itertools
 import sys
-from typing import List, Optional
-from .linter import AsciiDocLinter
-from .reporter import ConsoleReporter, JsonReporter, HtmlReporter, Reporter
+from contextlib import ExitStack
+from typing import Iterable, List, Optional, Sequence, TextIO
+from .cache import DEFAULT_CACHE_DIR, ResultCache
+from .files import find_files, read_file_list
+from .git import (
+    GitError,
+    changed_files,
+    changed_lines,
+    list_blobs,
+    read_blobs,
+)
+from .linter import AsciiDocLinter, FindingLimits, resolve_jobs
+from .linter import collect_report
+from .reporter import (
+    ConsoleReporter,
+    JsonLinesReporter,
+    JsonReporter,
+    HtmlReporter,
+    Reporter,
+    SarifReporter,
+    StreamingReporter,
+)
+from .rules.base import Finding, Rule
+from .watch import Watcher
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -15,13 +37,56 @@ def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Lint AsciiDoc files for common issues and style violations"
     )
-    parser.add_argument("files", nargs="+", help="One or more AsciiDoc files to check")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="AsciiDoc files or directories to check; directories are searched "
+        "recursively for .adoc, .asciidoc and .asc files not ignored by git",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="FILE|-",
+        help="Read the files to check from a file or standard input, one per "
+        "line or separated by NUL characters (as from find -print0)",
+    )
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help="Only check files changed since a git revision and the files "
+        "including them; given files and directories limit the search",
+    )
+    selection.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check the files as they are staged in the git index instead of "
+        "the working tree; without files, all files in the index",
+    )
+    selection.add_argument(
+        "--rev",
+        metavar="REV",
+        help="Check the files as they are in a git revision, without a "
+        "checkout; without files, all files of the revision",
+    )
+    selection.add_argument(
+        "--diff-only",
+        metavar="REV",
+        help="Only report findings on lines changed since a git revision; "
+        "given files and directories limit the search",
+    )
     parser.add_argument("--config", help="Path to configuration file")
     parser.add_argument(
         "--format",
-        choices=["console", "plain", "json", "html"],
+        choices=["console", "plain", "json", "jsonl", "sarif", "html"],
         default="console",
-        help="Output format (default: console)",
+        help="Output format (default: console); jsonl and sarif are written "
+        "as files are linted, jsonl with one JSON object per finding",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        metavar="FILE",
+        help="Write the report to a file instead of standard output",
     )
     parser.add_argument(
         "--verbose",
@@ -33,12 +98,127 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable debug output",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=parse_jobs,
+        default=1,
+        metavar="N|auto",
+        help="Number of files to lint in parallel, 'auto' uses all CPUs (default: 1)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and lint files again when they or the files they "
+        "include change, reporting new and resolved findings",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read files line by line in constant memory, for very large "
+        "documents; only the rules looking at a few lines at a time are run",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first finding, same as --max-findings 1",
+    )
+    parser.add_argument(
+        "--max-findings",
+        type=parse_count,
+        metavar="N",
+        help="Stop linting once N findings have been found",
+    )
+    parser.add_argument(
+        "--max-findings-per-file",
+        type=parse_count,
+        metavar="N",
+        help="Report at most N findings per file and stop checking the file then",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the results of unchanged files from previous runs",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the result cache (default: {DEFAULT_CACHE_DIR})",
+    )
     return parser
 
 
-def get_reporter(format: str) -> Reporter:
+def parse_args(args: List[str]) -> argparse.Namespace:
+    """Parse the command line, exits with a usage message if it is invalid"""
+    parser = create_parser()
+    parsed_args = parser.parse_args(args)
+    if not (
+        parsed_args.files
+        or parsed_args.files_from
+        or parsed_args.changed_since
+        or parsed_args.diff_only
+        or parsed_args.staged
+        or parsed_args.rev
+    ):
+        parser.error("no files given, pass files, directories or --files-from")
+    if parsed_args.watch:
+        if parsed_args.format not in ("console", "plain"):
+            parser.error("--watch only supports the console and plain formats")
+        if (
+            parsed_args.staged
+            or parsed_args.rev
+            or parsed_args.changed_since
+            or parsed_args.diff_only
+        ):
+            parser.error("--watch only watches files and directories")
+    if parsed_args.stream:
+        if parsed_args.watch or parsed_args.cache:
+            parser.error("--stream cannot be combined with --watch or --cache")
+        if parsed_args.staged or parsed_args.rev or parsed_args.diff_only:
+            parser.error("--stream only reads files from the working tree")
+    if parsed_args.fail_fast:
+        if parsed_args.max_findings is not None:
+            parser.error("--fail-fast cannot be combined with --max-findings")
+        parsed_args.max_findings = 1
+    if parsed_args.watch and (
+        parsed_args.max_findings is not None
+        or parsed_args.max_findings_per_file is not None
+    ):
+        parser.error("--watch cannot be combined with finding limits")
+    return parsed_args
+
+
+def parse_jobs(value: str) -> int:
+    """Parse the value of the --jobs option"""
+    try:
+        return resolve_jobs(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid value '{value}', expected a positive number or 'auto'"
+        )
+
+
+def parse_count(value: str) -> int:
+    """Parse the value of an option counting findings"""
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(
+            f"invalid value '{value}', expected a positive number"
+        )
+    return count
+
+
+def get_reporter(format: str, rules: Sequence[Rule] = ()) -> Reporter:
+    """Return the reporter for a format; SARIF logs describe the given rules"""
     if format == "json":
         return JsonReporter()
+    if format == "jsonl":
+        return JsonLinesReporter()
+    if format == "sarif":
+        return SarifReporter(rules)
     if format == "html":
         return HtmlReporter()
     if format == "plain":
@@ -48,21 +228,126 @@ def get_reporter(format: str) -> Reporter:
     raise ValueError(f"Unrecognised format {format}")
 
 
+def finding_limits(parsed_args: argparse.Namespace) -> Optional[FindingLimits]:
+    """Return the finding limits given on the command line, if any"""
+    if parsed_args.max_findings is None and parsed_args.max_findings_per_file is None:
+        return None
+    return FindingLimits(parsed_args.max_findings, parsed_args.max_findings_per_file)
+
+
+def lint_selection(
+    parsed_args: argparse.Namespace,
+    linter: AsciiDocLinter,
+    paths: Iterable[str],
+    cache: Optional[ResultCache] = None,
+    limits: Optional[FindingLimits] = None,
+) -> Iterable[List[Finding]]:
+    """
+    Lint the files selected by the paths and the command line options and
+    return the findings per file (see AsciiDocLinter.lint_results)
+    """
+    jobs = parsed_args.jobs
+    if parsed_args.staged or parsed_args.rev:
+        root, blobs = list_blobs(parsed_args.rev, paths)
+        return linter.lint_content_results(
+            read_blobs(root, blobs), jobs=jobs, cache=cache, limits=limits
+        )
+    stream = parsed_args.stream
+    if parsed_args.changed_since:
+        files = changed_files(parsed_args.changed_since, paths)
+        return linter.lint_results(
+            files, jobs=jobs, cache=cache, stream=stream, limits=limits
+        )
+    if parsed_args.diff_only:
+        changes = changed_lines(parsed_args.diff_only, paths)
+        return linter.lint_results(
+            list(changes), jobs=jobs, cache=cache, changes=changes, limits=limits
+        )
+    # Paths from a file list are read while linting
+    return linter.lint_results(
+        find_files(paths), jobs=jobs, cache=cache, stream=stream, limits=limits
+    )
+
+
+def write_report(
+    parsed_args: argparse.Namespace,
+    linter: AsciiDocLinter,
+    results: Iterable[List[Finding]],
+    limits: Optional[FindingLimits],
+    output: TextIO,
+) -> int:
+    """Write the report in the format given on the command line, returns the exit code"""
+    reporter = get_reporter(parsed_args.format, linter.rules)
+    if isinstance(reporter, StreamingReporter):
+        # Findings are written as files are linted
+        count = reporter.write_results(results, output)
+        reporter.write_end(output, bool(limits and limits.truncated))
+        return 1 if count else 0
+    report = collect_report(results, limits)
+    output.write(reporter.format_report(report) + "\n")
+    return report.exit_code
+
+
+def run(
+    parsed_args: argparse.Namespace,
+    linter: AsciiDocLinter,
+    cache: Optional[ResultCache] = None,
+    output: Optional[TextIO] = None,
+) -> int:
+    """
+    Lint the files given on the command line, write the report to the output
+    file or standard output and return the exit code
+    """
+    with ExitStack() as stack:
+        paths = parsed_args.files
+        files_from = parsed_args.files_from
+        if files_from == "-":
+            paths = itertools.chain(paths, read_file_list(sys.stdin.buffer))
+        elif files_from:
+            file_list = stack.enter_context(open(files_from, "rb"))
+            paths = itertools.chain(paths, read_file_list(file_list))
+        limits = finding_limits(parsed_args)
+        try:
+            results = lint_selection(parsed_args, linter, paths, cache, limits)
+            if parsed_args.output:
+                output = stack.enter_context(
+                    open(parsed_args.output, "w", encoding="utf-8")
+                )
+            return write_report(
+                parsed_args, linter, results, limits, output or sys.stdout
+            )
+        except GitError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+
+
+def watch(parsed_args: argparse.Namespace, linter: AsciiDocLinter) -> int:
+    """Lint the given files and lint them again whenever they change"""
+    paths = list(parsed_args.files)
+    if parsed_args.files_from == "-":
+        paths.extend(read_file_list(sys.stdin.buffer))
+    elif parsed_args.files_from:
+        with open(parsed_args.files_from, "rb") as file_list:
+            paths.extend(read_file_list(file_list))
+    reporter = ConsoleReporter(enable_color=parsed_args.format == "console")
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as output:
+            return Watcher(linter, paths, reporter, output).run()
+    return Watcher(linter, paths, reporter).run()
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """Main entry point for the linter"""
     if args is None:
         args = sys.argv[1:]
 
-    parser = create_parser()
-    parsed_args = parser.parse_args(args)
+    parsed_args = parse_args(args)
 
     linter = AsciiDocLinter(config_path=parsed_args.config)
-    report = linter.lint(parsed_args.files)
-
-    # Set reporter based on format argument
-    print(get_reporter(parsed_args.format).format_report(report))
-
-    return report.exit_code
+    if parsed_args.watch:
+        return watch(parsed_args, linter)
+    cache = ResultCache(parsed_args.cache_dir) if parsed_args.cache else None
+    return run(parsed_args, linter, cache)
 
 
 if __name__ == "__main__":
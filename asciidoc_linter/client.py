@@ -0,0 +1,136 @@
+# client.py - Thin client for the linter daemon
+"""
+Thin client for the linter daemon.
+
+The client forwards its command line arguments and working directory to a
+running daemon (see daemon.py) and writes the report it receives. Without a
+daemon it lints in its own process. Only standard library modules are
+imported up front, so starting the client is fast.
+
+Client and daemon exchange JSON messages, one per line. The client sends a
+single request:
+
+    {"version": ..., "argv": [...], "cwd": ...}
+
+The daemon answers with any number of {"stdout": ...} and {"stderr": ...}
+messages followed by {"exit_code": ...}, or with {"error": ...} if it cannot
+handle the request.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO
+
+from . import __version__
+
+SOCKET_ENV = "ASCIIDOC_LINTER_SOCKET"
+
+
+class DaemonUnavailable(Exception):
+    """Raised when no daemon can handle a request"""
+
+
+def default_socket_path() -> str:
+    """Return the socket path from the environment or a per-user default"""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "asciidoc-linter.sock")
+
+    import tempfile
+
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join(tempfile.gettempdir(), f"asciidoc-linter-{user}.sock")
+
+
+def send_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Write a message as a line of JSON"""
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def receive_messages(stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+    """Read messages until the connection is closed"""
+    for line in stream:
+        yield json.loads(line)
+
+
+def connect(socket_path: Optional[str] = None) -> socket.socket:
+    """Connect to the daemon, raises DaemonUnavailable if none is running"""
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonUnavailable("Unix sockets are not supported")
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path or default_socket_path())
+    except OSError as e:
+        connection.close()
+        raise DaemonUnavailable(str(e))
+    return connection
+
+
+def forward(
+    args: List[str],
+    socket_path: Optional[str] = None,
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> int:
+    """
+    Let the daemon lint with the given arguments and write its output.
+
+    Returns the exit code of the linter. Raises DaemonUnavailable if the
+    daemon does not accept the request.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    with connect(socket_path) as connection:
+        stream = connection.makefile("rwb")
+        send_message(stream, {"version": __version__, "argv": args, "cwd": os.getcwd()})
+        for message in receive_messages(stream):
+            if "error" in message:
+                raise DaemonUnavailable(message["error"])
+            if "stdout" in message:
+                stdout.write(message["stdout"])
+            if "stderr" in message:
+                stderr.write(message["stderr"])
+            if "exit_code" in message:
+                stdout.flush()
+                return message["exit_code"]
+
+    stderr.write("Connection to the linter daemon was lost\n")
+    return 2
+
+
+def reads_stdin(args: List[str]) -> bool:
+    """Check if the arguments read the file list from standard input"""
+    return any(
+        arg == "--files-from=-" or (arg == "--files-from" and value == "-")
+        for arg, value in zip(args, args[1:] + [""])
+    )
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of the client, takes the same arguments as the linter"""
+    if args is None:
+        args = sys.argv[1:]
+
+    try:
+        # The daemon cannot read the standard input of the client
+        if reads_stdin(args):
+            raise DaemonUnavailable("File list on standard input")
+        # Watching keeps a linter of its own running
+        if "--watch" in args:
+            raise DaemonUnavailable("Watch mode")
+        return forward(args)
+    except DaemonUnavailable:
+        # Lint in this process if no daemon is running
+        from .cli import main as cli_main
+
+        return cli_main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
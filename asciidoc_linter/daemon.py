@@ -0,0 +1,261 @@
+# daemon.py - Long-running linter daemon
+"""
+Linter daemon for fast repeated runs.
+
+The daemon listens on a Unix socket and lints files for clients (see
+client.py). It keeps the interpreter, the configured linters and the result
+caches in memory, so a run does not pay for starting Python, importing the
+linter and loading the configuration. Requests are handled one at a time.
+"""
+
+import argparse
+import io
+import os
+import socket
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from . import __version__
+from .cache import ResultCache
+from .cli import parse_args, run
+from .client import (
+    DaemonUnavailable,
+    connect,
+    default_socket_path,
+    receive_messages,
+    send_message,
+)
+from .linter import AsciiDocLinter
+
+DEFAULT_IDLE_TIMEOUT = 3600  # seconds
+CHUNK_SIZE = 64 * 1024  # characters of output per message
+CLIENT_TIMEOUT = 30  # seconds to wait for a request
+
+
+class MessageWriter(io.TextIOBase):
+    """
+    A text stream sending what is written to a client as stdout messages, so
+    the client sees a report while it is written
+    """
+
+    def __init__(self, stream: io.BufferedRWPair):
+        super().__init__()
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        for start in range(0, len(text), CHUNK_SIZE):
+            send_message(self.stream, {"stdout": text[start : start + CHUNK_SIZE]})
+        return len(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class LinterDaemon:
+    """Lints files for clients connecting to a Unix socket"""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.socket_path = socket_path or default_socket_path()
+        self.idle_timeout = idle_timeout
+        self.running = False
+        # Linters by configuration file and its modification time
+        self._linters: Dict[Optional[str], Tuple[Optional[int], AsciiDocLinter]] = {}
+        self._caches: Dict[str, ResultCache] = {}
+
+    def serve(self) -> None:
+        """Handle requests until stopped or idle for longer than the timeout"""
+        server = self._bind()
+        self.running = True
+        try:
+            server.settimeout(self.idle_timeout or None)
+            while self.running:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+                with connection:
+                    connection.settimeout(CLIENT_TIMEOUT)
+                    try:
+                        self.handle(connection.makefile("rwb"))
+                    except (OSError, ValueError):
+                        pass  # The client went away or sent garbage
+        finally:
+            server.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def _bind(self) -> socket.socket:
+        """Create the listening socket, replacing a stale socket file"""
+        if os.path.exists(self.socket_path):
+            try:
+                connect(self.socket_path).close()
+            except DaemonUnavailable:
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the current user may connect
+        previous_umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(previous_umask)
+        server.listen()
+        return server
+
+    def handle(self, stream: io.BufferedRWPair) -> None:
+        """Handle a single request read from a client connection"""
+        request = next(receive_messages(stream), None)
+        if request is None:
+            return
+        if request.get("command") == "stop":
+            self.running = False
+            send_message(stream, {"exit_code": 0})
+            return
+        if request.get("version") != __version__:
+            send_message(
+                stream, {"error": f"Daemon runs version {__version__}, restart it"}
+            )
+            return
+        argv, cwd = request.get("argv"), request.get("cwd")
+        if not (
+            isinstance(argv, list)
+            and all(isinstance(arg, str) for arg in argv)
+            and isinstance(cwd, str)
+        ):
+            send_message(stream, {"error": "Request needs argv and cwd"})
+            return
+
+        stdout = MessageWriter(stream)
+        exit_code, errors = self.lint(argv, cwd, stdout)
+        stdout.flush()
+        if errors:
+            send_message(stream, {"stderr": errors})
+        send_message(stream, {"exit_code": exit_code})
+
+    def lint(self, argv: List[str], cwd: str, stdout: TextIO) -> Tuple[int, str]:
+        """
+        Run the linter with command line arguments in a working directory,
+        writing its output to a stream. Returns the exit code and the errors.
+        """
+        stderr = io.StringIO()
+        previous_cwd = os.getcwd()
+        try:
+            os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    parsed_args = parse_args(argv)
+                    exit_code = run(
+                        parsed_args,
+                        self._linter(parsed_args.config),
+                        self._cache(parsed_args),
+                        stdout,
+                    )
+                except SystemExit as e:
+                    # Raised by argparse for --help and invalid arguments
+                    exit_code = e.code if isinstance(e.code, int) else 2
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 2
+        finally:
+            os.chdir(previous_cwd)
+        return exit_code, stderr.getvalue()
+
+    def _linter(self, config_path: Optional[str]) -> AsciiDocLinter:
+        """Return the linter for a configuration file, reloaded when it changes"""
+        key = os.path.abspath(config_path) if config_path else None
+        try:
+            mtime = os.stat(key).st_mtime_ns if key else None
+        except OSError:
+            mtime = None
+        entry = self._linters.get(key)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, AsciiDocLinter(config_path=key))
+            self._linters[key] = entry
+        return entry[1]
+
+    def _cache(self, parsed_args: argparse.Namespace) -> Optional[ResultCache]:
+        """Return the result cache kept in memory for a cache directory"""
+        if not parsed_args.cache:
+            return None
+        directory = os.path.abspath(parsed_args.cache_dir)
+        if directory not in self._caches:
+            self._caches[directory] = ResultCache(directory)
+        return self._caches[directory]
+
+
+def stop(socket_path: Optional[str] = None) -> bool:
+    """Ask a running daemon to stop, returns False if none is running"""
+    try:
+        with connect(socket_path) as connection:
+            stream = connection.makefile("rwb")
+            send_message(stream, {"command": "stop"})
+            for _ in receive_messages(stream):
+                break
+    except DaemonUnavailable:
+        return False
+    return True
+
+
+def create_daemon_parser() -> argparse.ArgumentParser:
+    """Create the command line parser of the daemon"""
+    parser = argparse.ArgumentParser(
+        description="Run the AsciiDoc linter as a daemon for asciidoc-linter-client"
+    )
+    parser.add_argument(
+        "--socket",
+        help="Path of the Unix socket (default: $ASCIIDOC_LINTER_SOCKET or a "
+        "per-user path in the temporary directory)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Stop after this many seconds without requests, 0 to never stop "
+        f"(default: {DEFAULT_IDLE_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--stop", action="store_true", help="Stop the running daemon and exit"
+    )
+    return parser
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of the daemon"""
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = create_daemon_parser().parse_args(args)
+    if parsed_args.stop:
+        if not stop(parsed_args.socket):
+            print("No daemon is running", file=sys.stderr)
+            return 1
+        return 0
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("The daemon needs Unix socket support", file=sys.stderr)
+        return 1
+    try:
+        LinterDaemon(parsed_args.socket, parsed_args.idle_timeout).serve()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
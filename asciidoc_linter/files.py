@@ -0,0 +1,396 @@
+# files.py - Finding the files to lint
+"""
+Expansion of the paths given to the linter into the files to lint.
+
+Files are linted as given. Directories are walked recursively with
+os.scandir for files with an AsciiDoc extension, leaving out files and
+directories ignored by git (.gitignore files of the walked directories and
+their parents up to the repository root, and .git/info/exclude). Symbolic
+links are followed, but every directory is entered only once, which skips
+symlink loops, and files reached through several paths are linted once,
+identified by their device and inode.
+
+Long lists of paths can be read from a file or standard input instead of
+the command line, separated by line breaks or NUL characters.
+
+Documents depend on the files they include, so the include directives of a
+document give the files whose changes affect it.
+"""
+
+import os
+import re
+from collections import deque
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+ASCIIDOC_EXTENSIONS = (".adoc", ".asciidoc", ".asc")
+GITIGNORE_FILE = ".gitignore"
+FILE_LIST_CHUNK_SIZE = 64 * 1024
+INCLUDE_PATTERN = re.compile(r"include::([^\[]+)\[")
+
+
+def translate_pattern(pattern: str) -> str:
+    """Translate the path part of a gitignore pattern into a regular expression"""
+    parts = []
+    index = 0
+    length = len(pattern)
+    while index < length:
+        char = pattern[index]
+        if char == "*":
+            if pattern.startswith("**", index):
+                after = index + 2
+                if (index == 0 or pattern[index - 1] == "/") and (
+                    after == length or pattern[after] == "/"
+                ):
+                    if after == length:
+                        parts.append(".*")  # Everything below
+                        index = after
+                    else:
+                        parts.append("(?:.*/)?")  # Any number of directories
+                        index = after + 1
+                    continue
+                index = after - 1  # Like a single *
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 2)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[index + 1 : end]
+                if content[0] in "!^":
+                    content = "^" + content[1:]
+                parts.append("[" + content.replace("\\", "\\\\") + "]")
+                index = end
+        elif char == "\\" and index + 1 < length:
+            index += 1
+            parts.append(re.escape(pattern[index]))
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return "".join(parts)
+
+
+class IgnoreMatcher:
+    """
+    The patterns of a gitignore file compiled into a single regular
+    expression. Paths are matched relative to the directory of the file,
+    with a trailing slash for directories.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        alternatives = []
+        self.negated: List[bool] = []
+        for line in lines:
+            line = line.rstrip("\n\r")
+            # Trailing spaces are ignored unless escaped
+            stripped = line.rstrip(" ")
+            if stripped.endswith("\\") and len(stripped) < len(line):
+                stripped += " "
+            line = stripped
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:] if line[1:2] in ("#", "!") else line
+
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # Patterns with a slash are relative to the gitignore file,
+            # others match in any directory below it
+            anchored = "/" in line
+            regex = translate_pattern(line.lstrip("/"))
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            regex += "/" if directory_only else "/?"
+            alternatives.append(f"({regex})")
+            self.negated.append(negated)
+
+        # The last matching pattern decides, so it has to come first
+        alternatives.reverse()
+        self.negated.reverse()
+        self._pattern = (
+            re.compile("|".join(alternatives), re.DOTALL) if alternatives else None
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["IgnoreMatcher"]:
+        """Load a gitignore file, returns None if it does not exist or is empty"""
+        try:
+            with open(path, encoding="utf-8", errors="replace") as ignore_file:
+                matcher = cls(ignore_file)
+        except OSError:
+            return None
+        return matcher if matcher._pattern is not None else None
+
+    def match(self, path: str) -> Optional[bool]:
+        """
+        Return True if the relative path is ignored, False if it is explicitly
+        not ignored and None if no pattern matches.
+        """
+        match = self._pattern.fullmatch(path)
+        if match is None:
+            return None
+        return not self.negated[match.lastindex - 1]
+
+
+# The matchers that apply in a directory, each with the absolute path of
+# its directory including a trailing separator
+IgnoreStack = List[Tuple[str, IgnoreMatcher]]
+
+
+def directory_prefix(directory: str) -> str:
+    return directory.rstrip(os.sep) + os.sep
+
+
+def is_ignored(stack: IgnoreStack, path: str, is_dir: bool) -> bool:
+    """
+    Check an absolute path against the matchers, the deepest matching one
+    decides. The path has to be below the directories of the matchers.
+    """
+    for prefix, matcher in reversed(stack):
+        relative = path[len(prefix) :]
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+        if is_dir:
+            relative += "/"
+        ignored = matcher.match(relative)
+        if ignored is not None:
+            return ignored
+    return False
+
+
+def repository_root(directory: str) -> Optional[str]:
+    """Return the root of the git repository containing a directory"""
+    current = os.path.abspath(directory)
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def parent_ignore_files(directory: str) -> List[Tuple[str, str]]:
+    """
+    Return the ignore files of the repository and the parents of a directory,
+    whether they exist or not, together with the directories they apply to
+    """
+    directory = os.path.abspath(directory)
+    root = repository_root(directory)
+    if root is None:
+        return []
+
+    files = [(root, os.path.join(root, ".git", "info", "exclude"))]
+    parents = []
+    current = os.path.dirname(directory)
+    while len(current) >= len(root):
+        parents.append(current)
+        if current == root:
+            break
+        current = os.path.dirname(current)
+    for parent in reversed(parents):
+        files.append((parent, os.path.join(parent, GITIGNORE_FILE)))
+    return files
+
+
+def parent_matchers(ignore_files: Iterable[Tuple[str, str]]) -> IgnoreStack:
+    """Return the matchers of the existing files of parent_ignore_files"""
+    stack: IgnoreStack = []
+    for parent, path in ignore_files:
+        matcher = IgnoreMatcher.from_file(path)
+        if matcher is not None:
+            stack.append((directory_prefix(parent), matcher))
+    return stack
+
+
+class FileFinder:
+    """Expands paths into the files to lint, each file at most once"""
+
+    def __init__(self, extensions: Tuple[str, ...] = ASCIIDOC_EXTENSIONS):
+        self.extensions = extensions
+        self._seen_files: Set[Tuple[int, int]] = set()
+        self._seen_directories: Set[Tuple[int, int]] = set()
+        # The walked directories, with their state before they were scanned
+        self.directories: Dict[str, os.stat_result] = {}
+        # The ignore files outside of the walked directories that were looked for
+        self.ignore_files: Set[str] = set()
+
+    def find(self, paths: Iterable[str]) -> Iterator[str]:
+        """Yield the given files and the AsciiDoc files in the given directories"""
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                yield path  # Reported as an error by the linter
+                continue
+            if os.path.isdir(path):
+                yield from self.walk(path)
+            elif self._first_visit(self._seen_files, stat.st_dev, stat.st_ino):
+                yield path
+
+    def walk(self, directory: str) -> Iterator[str]:
+        """Yield the AsciiDoc files below a directory that git does not ignore"""
+        ignore_files = parent_ignore_files(directory)
+        self.ignore_files.update(path for _, path in ignore_files)
+        stack = parent_matchers(ignore_files)
+        stat = os.stat(directory)
+        if self._first_visit(self._seen_directories, stat.st_dev, stat.st_ino):
+            yield from self._walk(directory, os.path.abspath(directory), stat, stack)
+
+    def _walk(
+        self, directory: str, absolute: str, stat: os.stat_result, stack: IgnoreStack
+    ) -> Iterator[str]:
+        self.directories[directory] = stat
+        matcher = IgnoreMatcher.from_file(os.path.join(directory, GITIGNORE_FILE))
+        if matcher is not None:
+            stack = stack + [(directory_prefix(absolute), matcher)]
+        try:
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name != ".git":
+                    subdirectories.append(entry)
+                continue
+            if not entry.name.lower().endswith(self.extensions):
+                continue
+            if stack and is_ignored(stack, os.path.join(absolute, entry.name), False):
+                continue
+            try:
+                if entry.is_symlink():
+                    entry_stat = entry.stat()
+                    key = (entry_stat.st_dev, entry_stat.st_ino)
+                else:
+                    # Saves a stat call, files are on the device of the directory
+                    key = (stat.st_dev, entry.inode())
+            except OSError:
+                continue
+            if self._first_visit(self._seen_files, *key):
+                yield entry.path
+
+        for entry in subdirectories:
+            entry_absolute = os.path.join(absolute, entry.name)
+            if stack and is_ignored(stack, entry_absolute, True):
+                continue
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+            if self._first_visit(
+                self._seen_directories, entry_stat.st_dev, entry_stat.st_ino
+            ):
+                yield from self._walk(entry.path, entry_absolute, entry_stat, stack)
+
+    @staticmethod
+    def _first_visit(seen: Set[Tuple[int, int]], device: int, inode: int) -> bool:
+        if inode == 0:
+            return True  # No inode numbers on this file system
+        key = (device, inode)
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+
+def find_files(
+    paths: Iterable[str], extensions: Tuple[str, ...] = ASCIIDOC_EXTENSIONS
+) -> Iterator[str]:
+    """Yield the files to lint for the given files and directories"""
+    return FileFinder(extensions).find(paths)
+
+
+def read_file_list(stream: BinaryIO) -> Iterator[str]:
+    """
+    Yield the paths of a file list as they are read. Paths are separated by
+    NUL characters if the list contains any (as written by find -print0 or
+    git ls-files -z), otherwise by line breaks. Empty entries are skipped.
+    """
+    read = getattr(stream, "read1", stream.read)
+    separator = None
+    buffer = b""
+    while True:
+        chunk = read(FILE_LIST_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        if separator is None:
+            # Decided by the first separator seen, a NUL separated list
+            # only has a line break before that if the first path has one
+            if b"\0" in buffer:
+                separator = b"\0"
+            elif b"\n" in buffer:
+                separator = b"\n"
+            else:
+                continue
+        entries = buffer.split(separator)
+        buffer = entries.pop()
+        for entry in entries:
+            path = _decode_entry(entry, separator)
+            if path:
+                yield path
+    path = _decode_entry(buffer, separator)
+    if path:
+        yield path
+
+
+def _decode_entry(entry: bytes, separator: Optional[bytes]) -> str:
+    if separator != b"\0":
+        entry = entry.rstrip(b"\r")
+    # Like command line arguments, file names that are no valid UTF-8 are kept
+    return os.fsdecode(entry)
+
+
+def include_targets(path: str, lines: Iterable[str]) -> Set[str]:
+    """
+    Return the files included by a document, relative to the directory of the
+    document like its path. Targets with attribute references or URLs are
+    left out.
+    """
+    directory = os.path.dirname(path)
+    targets = set()
+    for line in lines:
+        if not line.startswith("include::"):
+            continue
+        match = INCLUDE_PATTERN.match(line)
+        if match is None:
+            continue
+        target = match.group(1).strip()
+        if "{" in target or "://" in target:
+            continue
+        targets.add(os.path.normpath(os.path.join(directory, target)))
+    return targets
+
+
+def affected_paths(paths: Iterable[str], includers: Dict[str, Set[str]]) -> Set[str]:
+    """Return the paths and all files including them, directly or indirectly"""
+    affected = set(paths)
+    queue = deque(affected)
+    while queue:
+        for including in includers.get(queue.popleft(), ()):
+            if including not in affected:
+                affected.add(including)
+                queue.append(including)
+    return affected
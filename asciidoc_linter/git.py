@@ -0,0 +1,357 @@
+# git.py - Selecting files with git
+"""
+Selection of the files to lint from the history of a git repository.
+
+The local git binary lists the files changed since a revision, including
+renamed and untracked files. Changing an included fragment changes every
+document that includes it, so the documents including a changed file,
+directly or through other includes, are linted as well. Include directives
+are found with git grep, which searches the repository without reading it
+into this process.
+
+For gating on changed lines only, the hunks of git diff -U0 give the changed
+lines of each file.
+
+Files can also be linted as they are in the index or in any revision,
+without a checkout: their contents are streamed through a single git
+cat-file --batch process.
+"""
+
+import codecs
+import os
+import re
+import subprocess
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .files import ASCIIDOC_EXTENSIONS, INCLUDE_PATTERN, affected_paths
+from .intervals import LineIntervals
+
+REGULAR_FILE_MODE = "100644"
+EXECUTABLE_FILE_MODE = "100755"
+HUNK_PATTERN = re.compile(rb"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitError(Exception):
+    """Raised when a git command fails"""
+
+
+def run_git(args: List[str], cwd: str, allowed_codes: Iterable[int] = (0,)) -> bytes:
+    """Run a git command and return its output"""
+    try:
+        process = subprocess.run(
+            ["git"] + args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except OSError as e:
+        raise GitError(f"Cannot run git: {e}")
+    if process.returncode not in allowed_codes:
+        message = process.stderr.decode("utf-8", "replace").strip()
+        raise GitError(message or f"git {args[0]} failed")
+    return process.stdout
+
+
+def repository_root(cwd: str) -> str:
+    """Return the top level directory of the repository containing cwd"""
+    output = run_git(["rev-parse", "--show-toplevel"], cwd)
+    return os.path.normpath(os.fsdecode(output.rstrip(b"\n")))
+
+
+def _split_nul(output: bytes) -> List[str]:
+    return [os.fsdecode(entry) for entry in output.split(b"\0") if entry]
+
+
+def changed_paths(root: str, revision: str) -> Set[str]:
+    """
+    Return the paths relative to the root that differ between a revision and
+    the working tree, including deleted files, both names of renamed files
+    and untracked files that are not ignored.
+    """
+    entries = _split_nul(
+        run_git(
+            ["diff", "--name-status", "-z", "-M", revision, "--"],
+            root,
+        )
+    )
+    paths = set()
+    index = 0
+    while index < len(entries):
+        status = entries[index]
+        # Renames and copies are followed by the old and the new path
+        count = 2 if status[:1] in ("R", "C") else 1
+        paths.update(entries[index + 1 : index + 1 + count])
+        index += 1 + count
+    paths.update(
+        _split_nul(run_git(["ls-files", "-z", "--others", "--exclude-standard"], root))
+    )
+    return paths
+
+
+def include_graph(root: str) -> Dict[str, Set[str]]:
+    """
+    Return the files including each file, by paths relative to the root.
+    Includes with attribute references or URLs as target are not resolved.
+    """
+    output = run_git(
+        ["grep", "-I", "-z", "--untracked", "-e", "^include::", "--"],
+        root,
+        # git grep exits with 1 if nothing matches
+        allowed_codes=(0, 1),
+    )
+    includers: Dict[str, Set[str]] = {}
+    for line in output.splitlines():
+        path, _, text = line.partition(b"\0")
+        match = INCLUDE_PATTERN.match(os.fsdecode(text))
+        if match is None:
+            continue
+        target = match.group(1).strip()
+        if "{" in target or "://" in target:
+            continue
+        including = os.fsdecode(path)
+        if os.path.isabs(target):
+            target = os.path.relpath(target, root)
+            if target.startswith(os.pardir):
+                continue  # Outside of the repository
+        else:
+            target = os.path.join(os.path.dirname(including), target)
+        target = os.path.normpath(target).replace(os.sep, "/")
+        includers.setdefault(target, set()).add(including)
+    return includers
+
+
+def _open_repository(revision: Optional[str], cwd: Optional[str]) -> Tuple[str, str]:
+    """Check a revision and return the working directory and repository root"""
+    if revision is not None and revision.startswith("-"):
+        raise GitError(f"Invalid revision {revision}")
+    # git reports the root with symbolic links resolved
+    cwd = os.path.realpath(cwd or os.getcwd())
+    return cwd, repository_root(cwd)
+
+
+def _select(
+    root: str,
+    cwd: str,
+    candidates: Iterable[str],
+    paths: Optional[Iterable[str]],
+    extensions: Iterable[str],
+    in_working_tree: bool = True,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the AsciiDoc files among paths relative to the root that are at or
+    below one of the given paths, with the path to report them by. Files
+    missing in the working tree are left out unless in_working_tree is False.
+    """
+    extensions = tuple(extensions)
+    scopes = [os.path.realpath(os.path.join(cwd, path)) for path in paths or []]
+    for path in sorted(candidates):
+        if not path.lower().endswith(extensions):
+            continue
+        absolute = os.path.join(root, path.replace("/", os.sep))
+        if in_working_tree and not os.path.isfile(absolute):
+            continue  # Deleted
+        if scopes and not any(
+            absolute == scope or absolute.startswith(scope.rstrip(os.sep) + os.sep)
+            for scope in scopes
+        ):
+            continue
+        yield path, _display_path(absolute, cwd)
+
+
+def changed_files(
+    revision: str,
+    paths: Optional[Iterable[str]] = None,
+    extensions: Iterable[str] = ASCIIDOC_EXTENSIONS,
+    cwd: Optional[str] = None,
+) -> List[str]:
+    """
+    Return the AsciiDoc files changed since a revision or including a changed
+    file. With paths, only files at or below these paths are returned. The
+    files are relative to the working directory if they are below it.
+    """
+    cwd, root = _open_repository(revision, cwd)
+    changed = changed_paths(root, revision)
+    affected = affected_paths(changed, include_graph(root)) if changed else set()
+    return [display for _, display in _select(root, cwd, affected, paths, extensions)]
+
+
+def unquote_path(path: bytes) -> bytes:
+    """Undo the C-style quoting of unusual file names in git output"""
+    if not path.startswith(b'"'):
+        return path
+    return codecs.escape_decode(path[1:-1])[0]
+
+
+def parse_diff(output: bytes) -> Dict[str, LineIntervals]:
+    """
+    Parse the output of git diff -U0 into the changed lines of each file in
+    its new version, by path relative to the root. A hunk only removing lines
+    marks the lines before and after the removal.
+    """
+    changes: Dict[str, LineIntervals] = {}
+    ranges: List[Tuple[int, int]] = []
+    path: Optional[str] = None
+    remaining = 0  # Lines of the current hunk still to skip
+
+    def finish() -> None:
+        if path is not None:
+            changes[path] = LineIntervals(ranges)
+
+    for line in output.split(b"\n"):
+        if remaining:
+            if not line.startswith(b"\\"):  # "\ No newline at end of file"
+                remaining -= 1
+            continue
+        if line.startswith(b"diff --git "):
+            finish()
+            path = None
+            ranges = []
+        elif line.startswith(b"+++ "):
+            name = line[4:]
+            if name.endswith(b"\t"):
+                name = name[:-1]  # Added after names with spaces
+            name = unquote_path(name)
+            # Deleted files have no new version
+            path = os.fsdecode(name[2:]) if name.startswith(b"b/") else None
+        elif line.startswith(b"@@ "):
+            match = HUNK_PATTERN.match(line)
+            if match is None:
+                continue
+            old_count = int(match.group(1) or 1)
+            new_start = int(match.group(2))
+            new_count = int(match.group(3) or 1)
+            remaining = old_count + new_count
+            if new_count:
+                ranges.append((new_start, new_start + new_count - 1))
+            else:
+                ranges.append((max(new_start, 1), new_start + 1))
+    finish()
+    return changes
+
+
+def changed_lines(
+    revision: str,
+    paths: Optional[Iterable[str]] = None,
+    extensions: Iterable[str] = ASCIIDOC_EXTENSIONS,
+    cwd: Optional[str] = None,
+) -> Dict[str, LineIntervals]:
+    """
+    Return the lines of AsciiDoc files changed since a revision, by the path
+    of the file. Untracked files are changed as a whole. Paths limit the
+    files like for changed_files.
+    """
+    cwd, root = _open_repository(revision, cwd)
+    output = run_git(
+        [
+            "diff",
+            "-U0",
+            "-M",
+            "--no-color",
+            "--no-ext-diff",
+            # parse_diff expects the default prefixes, whatever the user's
+            # diff.noprefix and diff.mnemonicPrefix settings
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            revision,
+            "--",
+        ],
+        root,
+    )
+    changes = parse_diff(output)
+    untracked = run_git(["ls-files", "-z", "--others", "--exclude-standard"], root)
+    for path in _split_nul(untracked):
+        changes[path] = LineIntervals.whole_file()
+    return {
+        display: changes[path]
+        for path, display in _select(root, cwd, changes, paths, extensions)
+    }
+
+
+def list_blobs(
+    revision: Optional[str] = None,
+    paths: Optional[Iterable[str]] = None,
+    extensions: Iterable[str] = ASCIIDOC_EXTENSIONS,
+    cwd: Optional[str] = None,
+) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Return the repository root and the AsciiDoc files of a revision, or of
+    the index without a revision, as paths with the id of their blob. Paths
+    limit the files like for changed_files, whether or not they exist in the
+    working tree. Symbolic links, submodules and unmerged files are skipped.
+    """
+    cwd, root = _open_repository(revision, cwd)
+    object_ids = {}
+    if revision is None:
+        output = run_git(["ls-files", "--stage", "-z"], root)
+    else:
+        output = run_git(["ls-tree", "-r", "-z", "--full-tree", revision], root)
+    for entry in _split_nul(output):
+        info, _, path = entry.partition("\t")
+        fields = info.split()
+        if fields[0] != REGULAR_FILE_MODE and fields[0] != EXECUTABLE_FILE_MODE:
+            continue
+        if revision is None:
+            if fields[2] != "0":
+                continue  # Unmerged
+            object_ids[path] = fields[1]
+        else:
+            object_ids[path] = fields[2]
+    return root, [
+        (display, object_ids[path])
+        for path, display in _select(
+            root, cwd, object_ids, paths, extensions, in_working_tree=False
+        )
+    ]
+
+
+def read_blobs(root: str, blobs: List[Tuple[str, str]]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield the paths and contents of blobs, read through a single git
+    cat-file --batch process. All requests are written by a thread while the
+    contents are read, so git never waits for the next request.
+    """
+    try:
+        process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+    except OSError as e:
+        raise GitError(f"Cannot run git: {e}")
+
+    def send_requests() -> None:
+        try:
+            for _, object_id in blobs:
+                process.stdin.write(object_id.encode("ascii") + b"\n")
+        except OSError:
+            pass  # The reader stopped early
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    writer = threading.Thread(target=send_requests, daemon=True)
+    writer.start()
+    try:
+        for path, object_id in blobs:
+            header = process.stdout.readline().split()
+            if len(header) != 3 or header[1] != b"blob":
+                raise GitError(f"Cannot read {path} ({object_id}) from git")
+            data = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Line break after the content
+            yield path, data
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+        writer.join()
+
+
+def _display_path(path: str, cwd: str) -> str:
+    """Return a path relative to the working directory if it is below it"""
+    prefix = cwd.rstrip(os.sep) + os.sep
+    return path[len(prefix) :] if path.startswith(prefix) else path
@@ -0,0 +1,305 @@
+# incremental.py - Incremental linting of edited documents
+"""
+Incremental linting of a document that is edited in place.
+
+The document is divided into chunks: a new chunk starts at every non-blank
+line that follows a blank line outside of delimited blocks. Paragraphs,
+lists and delimited blocks therefore never cross a chunk boundary. Rules
+declare with their ``scope`` which part of the document their findings
+depend on:
+
+* ``block`` rules only look at the lines of a chunk. They are run again on
+  the chunks around the changed lines.
+* ``headings`` rules only look at section titles (lines starting with ``=``)
+  and their line numbers. They are run again, on the section titles alone,
+  if a section title changed or moved to another line.
+* ``document`` rules may depend on anything and are run again on the whole
+  document. This is the default for rules that do not declare a scope.
+
+Edits are recorded right away, while the affected chunks are only linted
+again when the findings are requested, so a series of quick edits is linted
+once. The findings of unaffected chunks are kept and move with their lines.
+Linting after an edit therefore takes time in proportion to the size of the
+changed blocks rather than the size of the document.
+
+Example::
+
+    document = IncrementalDocument(text)
+    document.findings
+    # Replace the first three characters of line 10
+    document.apply_edit((10, 0), (10, 3), "New")
+    document.findings
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .blocks import BlockMap
+from .linter import AsciiDocLinter
+from .rules.base import BLOCK_SCOPE, HEADINGS_SCOPE, Finding, Position
+
+LINE_BREAK_PATTERN = re.compile(r"\r\n|\r|\n")
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    Split a text into lines at line breaks like editors do. A text ending
+    with a line break has an empty last line.
+    """
+    return LINE_BREAK_PATTERN.split(text)
+
+
+def is_blank(line: str) -> bool:
+    return not line or line.isspace()
+
+
+class IncrementalDocument:
+    """
+    A document together with its findings, which are updated incrementally
+    when the document is edited.
+
+    Lines are numbered from 0 like in editors, while the findings report
+    1-based line numbers like all other findings.
+    """
+
+    def __init__(self, text: str = "", linter: Optional[AsciiDocLinter] = None):
+        self.linter = linter or AsciiDocLinter()
+        self.rules = list(self.linter.rules)
+        self._block_rules = [rule for rule in self.rules if rule.scope == BLOCK_SCOPE]
+        self._heading_rules = [
+            rule for rule in self.rules if rule.scope == HEADINGS_SCOPE
+        ]
+        self._document_rules = [
+            rule
+            for rule in self.rules
+            if rule.scope not in (BLOCK_SCOPE, HEADINGS_SCOPE)
+        ]
+
+        self.lines = split_lines(text)
+        # Line numbers of the section titles
+        self._title_lines = [
+            index for index, line in enumerate(self.lines) if line.startswith("=")
+        ]
+        # First line of each chunk and the findings of the chunk with line
+        # numbers relative to its first line, None if it has to be linted
+        self._starts: List[int] = [0]
+        self._chunk_findings: List[Optional[List[Finding]]] = [None]
+        # Findings of the headings and document rules, None if outdated
+        self._heading_findings: Optional[List[Finding]] = (
+            None if self._heading_rules else []
+        )
+        self._document_findings: Optional[List[Finding]] = (
+            None if self._document_rules else []
+        )
+        self._findings: Optional[List[Finding]] = None
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def apply_edit(
+        self, start: Tuple[int, int], end: Tuple[int, int], text: str
+    ) -> None:
+        """
+        Replace the text between two positions with new text.
+
+        Positions are pairs of a 0-based line number and an index into the
+        line. Positions after the end of a line or of the document refer to
+        its end.
+        """
+        if not self.lines:
+            self.replace_lines(0, 0, split_lines(text))
+            return
+        start_line, start_index = self._clamp(start)
+        end_line, end_index = self._clamp(end)
+        if (end_line, end_index) < (start_line, start_index):
+            raise ValueError(f"Edit ends before it starts: {start} - {end}")
+        new_text = (
+            self.lines[start_line][:start_index]
+            + text
+            + self.lines[end_line][end_index:]
+        )
+        self.replace_lines(start_line, end_line + 1, split_lines(new_text))
+
+    def _clamp(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        line, index = position
+        if line < 0 or index < 0:
+            raise IndexError(f"Invalid position {position}")
+        if line >= len(self.lines):
+            return len(self.lines) - 1, len(self.lines[-1])
+        return line, min(index, len(self.lines[line]))
+
+    def replace_lines(self, start: int, end: int, new_lines: Sequence[str]) -> None:
+        """Replace the lines from start up to, but not including, end"""
+        if not 0 <= start <= end <= len(self.lines):
+            raise IndexError(f"Invalid line range {start}-{end}")
+        if start == end and not new_lines:
+            return
+        self.lines[start:end] = new_lines
+        delta = len(new_lines) - (end - start)
+        self._findings = None
+
+        # Section titles matter if one was removed, added or moved
+        titles = self._title_lines
+        first_title = bisect_left(titles, start)
+        last_title = bisect_left(titles, end, first_title)
+        new_titles = [
+            start + offset
+            for offset, line in enumerate(new_lines)
+            if line.startswith("=")
+        ]
+        titles[first_title:last_title] = new_titles
+        moved = first_title + len(new_titles)
+        if delta:
+            for index in range(moved, len(titles)):
+                titles[index] += delta
+        if first_title < last_title or new_titles or (delta and moved < len(titles)):
+            if self._heading_rules:
+                self._heading_findings = None
+        if self._document_rules:
+            self._document_findings = None
+
+        # The chunk containing the line before the edit is linted again, as
+        # the edit may remove the blank line that ends it, and so are all
+        # chunks up to the first chunk starting after the edit
+        starts = self._starts
+        first = max(bisect_right(starts, start - 1) - 1, 0)
+        last = bisect_left(starts, end, first)
+        starts[first:last] = [starts[first] if first < last else start]
+        self._chunk_findings[first:last] = [None]
+        if delta:
+            for index in range(first + 1, len(starts)):
+                starts[index] += delta
+
+    def update(self, cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Lint the parts of the document affected by edits.
+
+        The optional callback is checked between the chunks to be linted.
+        Returns False if it cancelled the update; the remaining chunks are
+        then linted by the next update.
+        """
+        index = 0
+        while index < len(self._starts):
+            if self._chunk_findings[index] is not None:
+                index += 1
+                continue
+            if cancelled is not None and cancelled():
+                return False
+            index = self._lint_chunks(index)
+
+        if self._heading_findings is None:
+            if cancelled is not None and cancelled():
+                return False
+            lines = self.lines
+            skeleton = [""] * len(self._lines())
+            for index in self._title_lines:
+                skeleton[index] = lines[index]
+            self._heading_findings = self.linter.lint_lines(
+                skeleton, self._heading_rules
+            )
+        if self._document_findings is None:
+            if cancelled is not None and cancelled():
+                return False
+            self._document_findings = self.linter.lint_lines(
+                self._lines(), self._document_rules
+            )
+        return True
+
+    @property
+    def findings(self) -> List[Finding]:
+        """The findings of the current document ordered by rule"""
+        self.update()
+        if self._findings is not None:
+            return list(self._findings)
+
+        findings = []
+        for start, chunk_findings in zip(self._starts, self._chunk_findings):
+            for finding in chunk_findings:
+                if finding.position is not None:
+                    position = finding.position
+                    finding = finding.replace(
+                        position=Position(start + position.line, position.column)
+                    )
+                findings.append(finding)
+        findings.extend(self._heading_findings)
+        findings.extend(self._document_findings)
+
+        order = {}
+        for rule in self.rules:
+            order.setdefault(rule.id, len(order))
+        findings.sort(key=lambda finding: order.get(finding.rule_id, len(order)))
+        self._findings = findings
+        return list(findings)
+
+    def _lines(self) -> List[str]:
+        """The lines as the linter sees them, without an empty last line"""
+        if self.lines and self.lines[-1] == "":
+            return self.lines[:-1]
+        return self.lines
+
+    def _lint_chunks(self, index: int) -> int:
+        """
+        Lint the chunk at the index, which is not linted yet, together with
+        any following chunks that have to be linted. Returns the index of the
+        first chunk after them.
+        """
+        starts = self._starts
+        start = starts[index]
+        last = index + 1
+        while True:
+            while last < len(starts) and self._chunk_findings[last] is None:
+                last += 1
+            end = starts[last] if last < len(starts) else len(self.lines)
+            new_starts = self._find_chunks(start, end)
+            if new_starts is not None:
+                break
+            # An edit moved the chunk boundary, e.g. by opening a delimited
+            # block. Take in more chunks, doubling the range each time.
+            last = min(last + (last - index), len(starts))
+
+        lines = self.lines[start:end]
+        if end == len(self.lines) and lines and lines[-1] == "":
+            lines.pop()
+        chunk_findings: List[List[Finding]] = [[] for _ in new_starts]
+        for finding in self.linter.lint_lines(lines, self._block_rules):
+            chunk = 0
+            if finding.position is not None:
+                line = start + finding.position.line - 1
+                chunk = max(bisect_right(new_starts, line) - 1, 0)
+                finding.position = Position(
+                    line - new_starts[chunk] + 1, finding.position.column
+                )
+            chunk_findings[chunk].append(finding)
+
+        starts[index:last] = new_starts
+        self._chunk_findings[index:last] = chunk_findings
+        return index + len(new_starts)
+
+    def _find_chunks(self, start: int, end: int) -> Optional[List[int]]:
+        """
+        Return the first lines of the chunks between the lines start and end,
+        or None if the line end does not start a new chunk.
+        """
+        lines = self.lines[start:end]
+        block_map = BlockMap(lines)
+        if end < len(self.lines) and lines:
+            if (
+                not is_blank(lines[-1])
+                or block_map.block_at(len(lines) - 1) is not None
+            ):
+                return None
+
+        if not lines:
+            return []
+        starts = [start]
+        after_blank = False
+        for offset, line in enumerate(lines):
+            if is_blank(line):
+                after_blank = block_map.block_at(offset) is None
+            else:
+                if after_blank:
+                    starts.append(start + offset)
+                after_blank = False
+        return starts
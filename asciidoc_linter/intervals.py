@@ -0,0 +1,63 @@
+# intervals.py - Sets of line ranges
+"""
+Sets of line numbers stored as sorted, disjoint ranges.
+
+Used to describe the changed lines of a file, so findings can be checked
+against the changes by bisection instead of comparing every finding with
+every changed range.
+"""
+
+import sys
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+# The end of a range covering the rest of a file
+END_OF_FILE = sys.maxsize
+
+
+class LineIntervals:
+    """A set of 1-based line numbers as sorted, disjoint, inclusive ranges"""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        # Adjacent and overlapping ranges are merged
+        for start, end in sorted(ranges):
+            if end < start:
+                continue
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def whole_file(cls) -> "LineIntervals":
+        return cls([(1, END_OF_FILE)])
+
+    def __contains__(self, line: int) -> bool:
+        index = bisect_right(self.starts, line) - 1
+        return index >= 0 and line <= self.ends[index]
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LineIntervals):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self) -> str:
+        return f"LineIntervals({list(zip(self.starts, self.ends))})"
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Check if any line from start to end (inclusive) is in the set"""
+        index = bisect_right(self.starts, end) - 1
+        return index >= 0 and self.ends[index] >= start
+
+    def lines(self, last_line: int) -> Iterator[int]:
+        """Yield the line numbers in the set up to the last line of a file"""
+        for start, end in zip(self.starts, self.ends):
+            if start > last_line:
+                return
+            yield from range(start, min(end, last_line) + 1)
@@ -0,0 +1,261 @@
+# line_table.py - Per-document line classification
+"""
+Classification of the lines of a document.
+
+Every line is classified once into a kind (blank, heading, delimiter, list
+item, ...) together with its heading level or list depth, its indentation and
+whitespace flags. The results of a document are stored column-wise in compact
+arrays, so rules can look at a line without allocating stripped copies of it.
+"""
+
+import re
+from array import array
+from enum import IntEnum
+from typing import (
+    AbstractSet,
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .blocks import TABLE_DELIMITER_CHARS, BlockMap, DelimitedBlock, block_type
+from .buffer import DocumentBuffer
+
+
+class LineKind(IntEnum):
+    """Kinds of lines in an AsciiDoc document"""
+
+    TEXT = 0
+    BLANK = 1
+    HEADING = 2
+    DELIMITER = 3
+    LIST_ITEM = 4
+    ATTRIBUTE_ENTRY = 5
+    COMMENT = 6
+    BLOCK_ATTRIBUTES = 7
+    BLOCK_TITLE = 8
+
+
+# Line flags
+TRAILING_WHITESPACE = 1
+HAS_TAB = 2
+
+HEADER_PATTERN = re.compile(r"^(=+) \s*\S")
+ATTRIBUTE_ENTRY_PATTERN = re.compile(r"^:(!?\w[\w-]*!?):(?:[ \t]+(.*))?$")
+LIST_ITEM_PATTERN = re.compile(
+    r"^[ \t]*(?:(?P<unordered>-|\*+)|(?P<ordered>\.+|\d+\.))[ \t]+\S"
+)
+
+# First characters of lines that may be block delimiters
+DELIMITER_CHARS = frozenset("-=*._/+|!,:")
+LIST_MARKER_CHARS = frozenset("*-.0123456789")
+
+
+def get_line_content(line: Union[str, Any]) -> str:
+    """Extract the content from a line object or return the line if it's a string."""
+    if isinstance(line, str):
+        return line
+    if hasattr(line, "content"):
+        return line.content
+    return str(line)
+
+
+def classify_line(text: str) -> Tuple[int, int, int, int]:
+    """
+    Classify a single line.
+
+    Returns:
+        Tuple of kind, level (heading level or list marker length),
+        indentation and flags
+    """
+    if not text:
+        return LineKind.BLANK, 0, 0, 0
+
+    flags = 0
+    if text[-1].isspace():
+        flags |= TRAILING_WHITESPACE
+    if "\t" in text:
+        flags |= HAS_TAB
+
+    first = text[0]
+    if first.isspace():
+        indent = len(text) - len(text.lstrip())
+        if indent == len(text):
+            return LineKind.BLANK, 0, indent, flags
+        first = text[indent]
+    else:
+        indent = 0
+
+    if first in DELIMITER_CHARS:
+        # Delimiters repeat their first character, apart from tables (|===)
+        second = text[indent + 1 : indent + 2]
+        if indent == 0 and (
+            second == first or (second == "=" and first in TABLE_DELIMITER_CHARS)
+        ):
+            if block_type(text.rstrip()) is not None:
+                return LineKind.DELIMITER, 0, indent, flags
+        if first == "=":
+            match = HEADER_PATTERN.match(text)
+            if match:
+                level = min(len(match.group(1)), 255)
+                return LineKind.HEADING, level, indent, flags
+        elif first == "/":
+            if text.startswith("//", indent):
+                return LineKind.COMMENT, 0, indent, flags
+        elif first == ":":
+            if ATTRIBUTE_ENTRY_PATTERN.match(text):
+                return LineKind.ATTRIBUTE_ENTRY, 0, indent, flags
+        elif first == "." and indent == 0 and len(text) > 1:
+            if not text[1].isspace() and text[1] != ".":
+                return LineKind.BLOCK_TITLE, 0, indent, flags
+    elif first == "[":
+        if text.rstrip().endswith("]"):
+            return LineKind.BLOCK_ATTRIBUTES, 0, indent, flags
+
+    if first in LIST_MARKER_CHARS:
+        match = LIST_ITEM_PATTERN.match(text)
+        if match:
+            marker = match.group("unordered") or match.group("ordered")
+            level = 1 if marker[0].isdigit() else len(marker)
+            return LineKind.LIST_ITEM, min(level, 255), indent, flags
+
+    return LineKind.TEXT, 0, indent, flags
+
+
+class LineInfo:
+    """
+    A single document line together with its classification.
+    The values are computed once per line and shared by all line rules.
+    """
+
+    __slots__ = (
+        "index",
+        "text",
+        "kind",
+        "level",
+        "indent",
+        "flags",
+        "block",
+        "_stripped",
+    )
+
+    def __init__(self, index: int, text: str, block: Optional[DelimitedBlock] = None):
+        self.index = index  # 0-based line number
+        self.text = text
+        self.kind, self.level, self.indent, self.flags = classify_line(text)
+        self.block = block  # innermost delimited block containing the line
+        self._stripped: Optional[str] = None
+
+    @property
+    def is_blank(self) -> bool:
+        return self.kind == LineKind.BLANK
+
+    @property
+    def lstripped(self) -> str:
+        return self.text[self.indent :]
+
+    @property
+    def stripped(self) -> str:
+        """The line without surrounding whitespace, computed on first use"""
+        stripped = self._stripped
+        if stripped is None:
+            stripped = self.text[self.indent :]
+            if self.flags & TRAILING_WHITESPACE:
+                stripped = stripped.rstrip()
+            self._stripped = stripped
+        return stripped
+
+    @property
+    def first_char(self) -> str:
+        """The first non-whitespace character, empty for blank lines"""
+        if self.kind == LineKind.BLANK:
+            return ""
+        return self.text[self.indent]
+
+    @property
+    def trailing_whitespace(self) -> bool:
+        return bool(self.flags & TRAILING_WHITESPACE)
+
+    @property
+    def has_tab(self) -> bool:
+        return bool(self.flags & HAS_TAB)
+
+    def startswith(self, prefix: Union[str, Tuple[str, ...]]) -> bool:
+        """Check the line content after the indentation for a prefix"""
+        return self.text.startswith(prefix, self.indent)
+
+    def in_block(self, kinds: AbstractSet[str]) -> bool:
+        """Check whether the line is inside a delimited block of the given types"""
+        return self.block is not None and self.block.kind in kinds
+
+    @classmethod
+    def from_lines(cls, lines: Sequence[Union[str, Any]]) -> "LineTable":
+        """Create the line table for a list of strings or objects with content"""
+        return LineTable(lines)
+
+
+class LineTable(Sequence[LineInfo]):
+    """
+    The classified lines of a document.
+
+    Classification results are stored in one compact array per column. Indexing
+    or iterating the table returns ``LineInfo`` objects for the lines.
+    """
+
+    def __init__(self, lines: Iterable[Union[str, Any]]):
+        if isinstance(lines, DocumentBuffer) or (
+            isinstance(lines, list) and all(isinstance(line, str) for line in lines)
+        ):
+            self.texts = lines
+        else:
+            self.texts = [get_line_content(line) for line in lines]
+        self.kinds = array("B")
+        self.levels = array("B")
+        self.indents = array("I")
+        self.flags = array("B")
+
+        for text in self.texts:
+            kind, level, indent, flags = classify_line(text)
+            self.kinds.append(kind)
+            self.levels.append(level)
+            self.indents.append(indent)
+            self.flags.append(flags)
+
+        # Delimiters are recognised on the stripped line; all other lines are
+        # passed as empty strings to avoid stripping them
+        self.block_map = BlockMap(
+            text if kind == LineKind.DELIMITER else ""
+            for text, kind in zip(self.texts, self.kinds)
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> LineInfo:
+        if index < 0:
+            index += len(self.texts)
+        line = LineInfo.__new__(LineInfo)
+        line.index = index
+        line.text = self.texts[index]
+        line._stripped = None
+        line.kind = self.kinds[index]
+        line.level = self.levels[index]
+        line.indent = self.indents[index]
+        line.flags = self.flags[index]
+        line.block = self.block_map.block_at(index)
+        return line
+
+    def __iter__(self) -> Iterator[LineInfo]:
+        for index in range(len(self.texts)):
+            yield self[index]
+
+    def is_blank(self, index: int) -> bool:
+        return self.kinds[index] == LineKind.BLANK
+
+    def startswith(self, index: int, prefix: Union[str, Tuple[str, ...]]) -> bool:
+        """Check the content of a line after its indentation for a prefix"""
+        return self.texts[index].startswith(prefix, self.indents[index])
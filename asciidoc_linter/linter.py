@@ -3,11 +3,40 @@
 Main linter module that processes AsciiDoc files and applies rules
 """
 
-from typing import List
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 import yaml
 
-from .rules.base import Finding, Severity
+from . import __version__
+from .buffer import DocumentBuffer
+from .cache import ResultCache, content_digest, fingerprint
+from .intervals import LineIntervals
+from .line_table import LineTable
+from .rules.base import (
+    HEADINGS_SCOPE,
+    Finding,
+    Severity,
+    Position,
+    Rule,
+    LineRule,
+    walk_line_rules,
+)
 from .rules.heading_rules import (
     HeadingFormatRule,
     HeadingHierarchyRule,
@@ -25,6 +54,223 @@ from .rules.format_rules import (
 from .rules.markdown_table_rules import MarkdownTableRule
 from .parser import AsciiDocParser
 from .reporter import LintReport
+from .stream import can_stream, read_lines, run_streaming_rules
+
+# A finding as transferred from a worker process:
+# (message, severity, line, column, rule_id, context)
+PackedFinding = Tuple[str, str, Optional[int], Optional[int], Optional[str], Any]
+
+
+def resolve_jobs(jobs: Union[int, str, None]) -> int:
+    """Return the number of worker processes for a jobs value (a number or 'auto')"""
+    if jobs is None:
+        return 1
+    if jobs == "auto":
+        return os.cpu_count() or 1
+    jobs = int(jobs)
+    if jobs < 1:
+        raise ValueError(f"Invalid number of jobs: {jobs}")
+    return jobs
+
+
+def _file_size(file_path: Union[str, Path]) -> int:
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
+
+
+def _pack_finding(finding: Finding) -> PackedFinding:
+    position = finding.position
+    return (
+        finding.message,
+        finding.severity.value,
+        position.line if position else None,
+        position.column if position else None,
+        finding.rule_id,
+        finding.context,
+    )
+
+
+# Severities by value, faster than calling Severity
+_SEVERITIES = {severity.value: severity for severity in Severity}
+
+
+def _unpack_finding(packed: PackedFinding, file: str) -> Finding:
+    message, severity, line, column, rule_id, context = packed
+    return Finding(
+        message,
+        _SEVERITIES[severity],
+        Position(line, column) if line is not None else None,
+        rule_id,
+        context,
+        file,
+    )
+
+
+def _error_finding(file_path: Union[str, Path], error: Exception) -> Finding:
+    return Finding(
+        message=f"Error linting file: {error}",
+        severity=Severity.ERROR,
+        file=str(file_path),
+    )
+
+
+# The linter of a worker process, set up by _init_worker
+_worker_linter: Optional["AsciiDocLinter"] = None
+
+
+def _init_worker(linter: "AsciiDocLinter") -> None:
+    global _worker_linter
+    _worker_linter = linter
+
+
+def _lint_file_in_worker(
+    task: Tuple[Union[str, Path], Optional[LineIntervals]],
+) -> List[PackedFinding]:
+    return [_pack_finding(finding) for finding in _worker_linter.lint_file(*task)]
+
+
+def _stream_file_in_worker(file_path: Union[str, Path]) -> List[PackedFinding]:
+    return [_pack_finding(finding) for finding in _worker_linter.stream_file(file_path)]
+
+
+def _take_file_in_worker(
+    task: Tuple[Union[str, Path], Optional[LineIntervals], bool, Optional[int]],
+) -> Tuple[List[PackedFinding], bool]:
+    file_path, changes, stream, limit = task
+    limits = FindingLimits(max_file_findings=limit)
+    findings = limits.take(_worker_linter._walk_file(file_path, changes, stream))
+    return [_pack_finding(finding) for finding in findings], limits.truncated
+
+
+def _take_data_in_worker(
+    task: Tuple[Union[str, Path], bytes, Optional[int]],
+) -> Tuple[List[PackedFinding], bool]:
+    file_path, data, limit = task
+    limits = FindingLimits(max_file_findings=limit)
+    findings = limits.take(_worker_linter._walk_data(file_path, data))
+    return [_pack_finding(finding) for finding in findings], limits.truncated
+
+
+def _lint_data_in_worker(task: Tuple[Union[str, Path], bytes]) -> List[PackedFinding]:
+    return [_pack_finding(finding) for finding in _worker_linter.lint_data(*task)]
+
+
+def _on_changed_line(finding: Finding, changes: LineIntervals) -> bool:
+    position = finding.position
+    return position is None or position.line is None or position.line in changes
+
+
+def on_changed_lines(findings: List[Finding], changes: LineIntervals) -> List[Finding]:
+    """Return the findings on changed lines and those without a line"""
+    return [finding for finding in findings if _on_changed_line(finding, changes)]
+
+
+class FindingLimits:
+    """
+    Limits on the number of findings of a run, in total and per file.
+
+    The findings of a file are cut off at the limit, and no more files are
+    linted once the total limit is reached. ``truncated`` records whether
+    findings or files were left out.
+    """
+
+    def __init__(
+        self,
+        max_findings: Optional[int] = None,
+        max_file_findings: Optional[int] = None,
+    ):
+        self.remaining = max_findings
+        self.max_file_findings = max_file_findings
+        self.truncated = False
+
+    @property
+    def reached(self) -> bool:
+        """Whether the total limit has been reached"""
+        return self.remaining is not None and self.remaining <= 0
+
+    @property
+    def file_limit(self) -> Optional[int]:
+        """The number of findings the next file may still have"""
+        if self.remaining is None:
+            return self.max_file_findings
+        if self.max_file_findings is None:
+            return self.remaining
+        return min(self.remaining, self.max_file_findings)
+
+    def add(self, findings: List[Finding], truncated: bool = False) -> List[Finding]:
+        """Count the findings of a file and return them cut off at the limit"""
+        limit = self.file_limit
+        if limit is not None and len(findings) > limit:
+            findings = findings[:limit]
+            truncated = True
+        if truncated:
+            self.truncated = True
+        if self.remaining is not None:
+            self.remaining -= len(findings)
+        return findings
+
+    def take(self, walk: Iterator[Tuple[int, Finding]]) -> List[Finding]:
+        """
+        Collect the findings of a file from a walk yielding them with the
+        index of their rule, up to the limit, and stop the walk. The findings
+        are returned in rule order.
+        """
+        limit = self.file_limit
+        try:
+            found = list(itertools.islice(walk, limit))
+            truncated = limit is not None and next(walk, None) is not None
+        finally:
+            walk.close()
+        found.sort(key=itemgetter(0))
+        return self.add([finding for _, finding in found], truncated)
+
+    def take_files(
+        self, walks: Iterable[Iterator[Tuple[int, Finding]]]
+    ) -> Iterator[List[Finding]]:
+        """Collect the findings of files (see take) until the limit is reached"""
+        for walk in walks:
+            if self.reached:
+                self.truncated = True  # Files are left unchecked
+                walk.close()
+                return
+            yield self.take(walk)
+
+    def apply(self, results: Iterable[List[Finding]]) -> Iterator[List[Finding]]:
+        """Limit the findings of files that have been linted already"""
+        for findings in results:
+            if self.reached:
+                self.truncated = True
+                return
+            yield self.add(findings)
+
+
+def collect_report(
+    results: Iterable[List[Finding]], limits: Optional[FindingLimits] = None
+) -> LintReport:
+    """Collect the findings of files in a report"""
+    all_findings = []
+    for findings in results:
+        all_findings.extend(findings)
+    return LintReport(all_findings, truncated=bool(limits and limits.truncated))
+
+
+def _source_stamp(rules: List[Rule]) -> List[Tuple[str, int, int]]:
+    """Size and modification time of the linter sources and rule modules"""
+    paths = set(Path(__file__).parent.rglob("*.py"))
+    for rule in rules:
+        module_file = getattr(sys.modules.get(type(rule).__module__), "__file__", None)
+        if module_file:
+            paths.add(Path(module_file))
+    stamp = []
+    for path in sorted(paths):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamp.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return stamp
 
 
 class AsciiDocLinter:
@@ -47,20 +293,199 @@ class AsciiDocLinter:
             MarkdownTableRule(),
         ]
         self.config_path = config_path
+        self.config: Dict[str, Any] = {}
 
-    def lint(self, file_paths: List[str]) -> LintReport:
+    def lint(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        jobs: Union[int, str] = 1,
+        cache: Optional[ResultCache] = None,
+        changes: Optional[Dict[str, LineIntervals]] = None,
+        stream: bool = False,
+        limits: Optional[FindingLimits] = None,
+    ) -> LintReport:
         """
         Lint content and return formatted output using the current reporter
+        (see lint_results for the options)
+        """
+        results = self.lint_results(file_paths, jobs, cache, changes, stream, limits)
+        return collect_report(results, limits)
+
+    def lint_results(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        jobs: Union[int, str] = 1,
+        cache: Optional[ResultCache] = None,
+        changes: Optional[Dict[str, LineIntervals]] = None,
+        stream: bool = False,
+        limits: Optional[FindingLimits] = None,
+    ) -> Iterable[List[Finding]]:
+        """
+        Lint files and return the findings of every file, in file order.
+        Files linted serially are linted as the results are consumed, so the
+        findings of a file can be reported before the next one is read.
+
+        This is the main entry point used by the CLI. With more than one job
+        the files are linted in a pool of worker processes; the findings are
+        reported in the same order as in a serial run. With a cache, the
+        results of unchanged files are taken from the cache, and files with
+        identical content are linted only once. With the changed lines of
+        files, only findings on these lines are reported (see lint_changes).
+        With stream, files are read line by line (see stream_file).
 
-        This is the main entry point used by the CLI
+        With limits, the rules stop checking a file once it has as many
+        findings as allowed, and no more files are linted once the total
+        limit is reached; the report is then marked as truncated. With a
+        cache, files are linted completely and only the report is limited.
+        Whether the results were truncated is known once they are consumed.
         """
+        if stream and (cache is not None or changes is not None):
+            raise ValueError("Streamed files cannot be cached or limited to changes")
         if self.config_path:
             self.load_config(self.config_path)
 
-        all_findings = []
-        for file_path in file_paths:
-            all_findings.extend(self.lint_file(file_path))
-        return LintReport(all_findings)
+        def lint_file(file_path: Union[str, Path]) -> List[Finding]:
+            if stream:
+                return list(self.stream_file(file_path))
+            if changes is not None:
+                return self.lint_file(file_path, changes.get(str(file_path)))
+            return self.lint_file(file_path)
+
+        def file_changes(file_path: Union[str, Path]) -> Optional[LineIntervals]:
+            return changes.get(str(file_path)) if changes is not None else None
+
+        jobs = resolve_jobs(jobs)
+        results: Iterable[List[Finding]]
+        if cache is not None or jobs > 1:
+            file_paths = list(file_paths)
+        if cache is not None:
+            # Cache entries hold the findings of all rules and lines
+            results = self._lint_cached(file_paths, jobs, cache)
+            if changes is not None:
+                results = [
+                    (
+                        on_changed_lines(findings, changes[str(file_path)])
+                        if str(file_path) in changes
+                        else findings
+                    )
+                    for file_path, findings in zip(file_paths, results)
+                ]
+            if limits is not None:
+                results = limits.apply(results)
+        elif jobs > 1 and len(file_paths) > 1:
+            if limits is None:
+                results = self._lint_parallel(file_paths, jobs, changes, stream)
+            else:
+                results = self._take_parallel(
+                    _take_file_in_worker,
+                    [
+                        (file_path, file_changes(file_path), stream, limits.file_limit)
+                        for file_path in file_paths
+                    ],
+                    file_paths,
+                    jobs,
+                    limits,
+                )
+        elif limits is not None:
+            # Files are linted as their paths arrive, until the limit
+            results = limits.take_files(
+                self._walk_file(file_path, file_changes(file_path), stream)
+                for file_path in file_paths
+            )
+        else:
+            # Files are linted as their paths arrive
+            results = map(lint_file, file_paths)
+        return results
+
+    def lint_contents(
+        self,
+        contents: Iterable[Tuple[Union[str, Path], bytes]],
+        jobs: Union[int, str] = 1,
+        cache: Optional[ResultCache] = None,
+        limits: Optional[FindingLimits] = None,
+    ) -> LintReport:
+        """
+        Lint files whose content has been read already, e.g. from git, given
+        as pairs of path and content. Jobs, cache and limits work like for
+        lint.
+        """
+        results = self.lint_content_results(contents, jobs, cache, limits)
+        return collect_report(results, limits)
+
+    def lint_content_results(
+        self,
+        contents: Iterable[Tuple[Union[str, Path], bytes]],
+        jobs: Union[int, str] = 1,
+        cache: Optional[ResultCache] = None,
+        limits: Optional[FindingLimits] = None,
+    ) -> Iterable[List[Finding]]:
+        """Lint given contents and return the findings per file like lint_results"""
+        if self.config_path:
+            self.load_config(self.config_path)
+
+        jobs = resolve_jobs(jobs)
+        results: Iterable[List[Finding]]
+        if cache is not None or jobs > 1:
+            contents = list(contents)
+        if cache is not None:
+            results = self._lint_cached(
+                [file_path for file_path, _ in contents],
+                jobs,
+                cache,
+                [data for _, data in contents],
+            )
+            if limits is not None:
+                results = limits.apply(results)
+        elif jobs > 1 and len(contents) > 1:
+            file_paths = [file_path for file_path, _ in contents]
+            if limits is None:
+                packed_results = self._run_parallel(
+                    _lint_data_in_worker,
+                    contents,
+                    [len(data) for _, data in contents],
+                    jobs,
+                )
+                results = [
+                    [
+                        _unpack_finding(packed, str(file_path))
+                        for packed in packed_findings
+                    ]
+                    for file_path, packed_findings in zip(file_paths, packed_results)
+                ]
+            else:
+                results = self._take_parallel(
+                    _take_data_in_worker,
+                    [
+                        (file_path, data, limits.file_limit)
+                        for file_path, data in contents
+                    ],
+                    file_paths,
+                    jobs,
+                    limits,
+                )
+        elif limits is not None:
+            # Contents are linted as they arrive, until the limit
+            results = limits.take_files(
+                self._walk_data(file_path, data) for file_path, data in contents
+            )
+        else:
+            # Contents are linted as they arrive
+            results = (self.lint_data(file_path, data) for file_path, data in contents)
+        return results
+
+    def fingerprint(self) -> str:
+        """Identify the linter version, active rules and configuration"""
+        rules = [
+            (
+                rule.id,
+                type(rule).__module__,
+                type(rule).__qualname__,
+                getattr(rule, "version", None),
+                str(rule.severity),
+            )
+            for rule in self.rules
+        ]
+        return fingerprint(__version__, rules, self.config, _source_stamp(self.rules))
 
     def load_config(self, config_path: str) -> None:
         """Load configuration from a YAML file"""
@@ -73,6 +498,7 @@ class AsciiDocLinter:
 
     def apply_config(self, config: dict) -> None:
         """Apply configuration to the linter"""
+        self.config = config
         rules_config = config.get("rules", {})
         for rule in self.rules:
             rule_config = rules_config.get(rule.id, {})
@@ -81,46 +507,358 @@ class AsciiDocLinter:
             else:
                 rule.severity = Severity(rule_config.get("severity", rule.severity))
 
-    def lint_file(self, file_path: Path) -> List[Finding]:
-        """Lint a single file and return a report"""
+    def _lint_parallel(
+        self,
+        file_paths: List[Union[str, Path]],
+        jobs: int,
+        changes: Optional[Dict[str, LineIntervals]] = None,
+        stream: bool = False,
+    ) -> List[List[Finding]]:
+        """Lint files in worker processes and return the findings per file."""
+        if stream:
+            worker: Callable[[Any], List[PackedFinding]] = _stream_file_in_worker
+            tasks: List[Any] = list(file_paths)
+        else:
+            worker = _lint_file_in_worker
+            tasks = [
+                (file_path, changes.get(str(file_path)) if changes else None)
+                for file_path in file_paths
+            ]
+        packed_results = self._run_parallel(
+            worker, tasks, [_file_size(file_path) for file_path in file_paths], jobs
+        )
+        return [
+            [_unpack_finding(packed, str(file_path)) for packed in packed_findings]
+            for file_path, packed_findings in zip(file_paths, packed_results)
+        ]
+
+    def _run_parallel(
+        self,
+        worker: Callable[[Any], List[PackedFinding]],
+        tasks: List[Any],
+        sizes: List[int],
+        jobs: int,
+    ) -> List[List[PackedFinding]]:
+        """Run tasks in worker processes and return the results in task order."""
+        # Hand out the largest files first, so a single big file does not
+        # keep one worker busy after all others are done
+        order = sorted(range(len(tasks)), key=sizes.__getitem__, reverse=True)
+        chunksize = max(1, min(16, len(order) // (jobs * 32)))
+
+        results: List[List[PackedFinding]] = [[] for _ in tasks]
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            packed_results = executor.map(
+                worker, [tasks[index] for index in order], chunksize=chunksize
+            )
+            for index, packed_findings in zip(order, packed_results):
+                results[index] = packed_findings
+        return results
+
+    def _take_parallel(
+        self,
+        worker: Callable[[Any], Tuple[List[PackedFinding], bool]],
+        tasks: List[Any],
+        file_paths: List[Union[str, Path]],
+        jobs: int,
+        limits: FindingLimits,
+    ) -> Iterator[List[Finding]]:
+        """
+        Run limited tasks in worker processes and yield the findings per file
+        in task order. The tasks are started in order, and the tasks not yet
+        started are cancelled once the total limit is reached.
+        """
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)),
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            futures = [executor.submit(worker, task) for task in tasks]
+            try:
+                for file_path, future in zip(file_paths, futures):
+                    if limits.reached:
+                        limits.truncated = True  # Files are left unchecked
+                        return
+                    packed_findings, truncated = future.result()
+                    file = str(file_path)
+                    yield limits.add(
+                        [_unpack_finding(packed, file) for packed in packed_findings],
+                        truncated,
+                    )
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _lint_cached(
+        self,
+        file_paths: List[Union[str, Path]],
+        jobs: int,
+        cache: ResultCache,
+        contents: Optional[List[bytes]] = None,
+    ) -> List[List[Finding]]:
+        """
+        Lint the files that are not in the cache and return findings per file.
+        The files are read unless their contents are given.
+        """
+        cache.fingerprint = self.fingerprint()
+        digests: List[Optional[str]] = []
+        packed_by_digest: Dict[str, List[PackedFinding]] = {}
+        pending: Dict[str, Tuple[Union[str, Path], bytes]] = {}
+
+        for index, file_path in enumerate(file_paths):
+            try:
+                if contents is not None:
+                    data = contents[index]
+                    digest = content_digest(data)
+                else:
+                    digest, data = cache.file_digest(file_path)
+                if digest not in packed_by_digest and digest not in pending:
+                    packed = cache.get(digest)
+                    if packed is not None:
+                        packed_by_digest[digest] = packed
+                    else:
+                        if data is None:
+                            digest, data = cache.read_file(file_path)
+                        pending.setdefault(digest, (file_path, data))
+            except OSError:
+                digest = None  # Linted on its own to report the error
+            digests.append(digest)
+
+        tasks = list(pending.values())
+        if min(jobs, len(tasks)) > 1:
+            packed_results = self._run_parallel(
+                _lint_data_in_worker, tasks, [len(data) for _, data in tasks], jobs
+            )
+        else:
+            packed_results = [
+                [_pack_finding(finding) for finding in self.lint_data(*task)]
+                for task in tasks
+            ]
+        for digest, packed in zip(pending, packed_results):
+            packed_by_digest[digest] = packed
+            cache.put(digest, packed)
+        cache.save()
+
+        results = []
+        for file_path, digest in zip(file_paths, digests):
+            if digest is None:
+                results.append(self.lint_file(file_path))
+            else:
+                file = str(file_path)
+                results.append(
+                    [
+                        _unpack_finding(packed, file)
+                        for packed in packed_by_digest[digest]
+                    ]
+                )
+        return results
+
+    def lint_file(
+        self, file_path: Path, changes: Optional[LineIntervals] = None
+    ) -> List[Finding]:
+        """Lint a single file and return a report, optionally of changed lines"""
+        try:
+            content = DocumentBuffer.from_file(file_path)
+            if changes is None:
+                findings = self.lint_string(content)
+            else:
+                findings = self.lint_changes(content, changes)
+            return [finding.set_file(str(file_path)) for finding in findings]
+        except Exception as e:
+            return [_error_finding(file_path, e)]
+
+    def lint_data(self, file_path: Union[str, Path], data: bytes) -> List[Finding]:
+        """Lint the content of a file that has already been read"""
         try:
+            content = DocumentBuffer.from_bytes(data)
             return [
                 finding.set_file(str(file_path))
-                for finding in self.lint_string(
-                    Path(file_path).read_text(encoding="utf-8")
-                )
+                for finding in self.lint_string(content)
             ]
         except Exception as e:
-            return [
-                Finding(
-                    message=f"Error linting file: {e}",
-                    severity=Severity.ERROR,
-                    file=str(file_path),
+            return [_error_finding(file_path, e)]
+
+    def streaming_rules(self) -> List[LineRule]:
+        """The rules that can lint documents streamed line by line"""
+        return [rule for rule in self.rules if can_stream(rule)]
+
+    def stream_file(self, file_path: Union[str, Path]) -> Iterator[Finding]:
+        """
+        Lint a file read line by line and yield the findings as they are
+        found, in line order. Memory use does not depend on the size of the
+        file, but only the rules returned by streaming_rules are run.
+        """
+        return (finding for _, finding in self._walk_file(file_path, stream=True))
+
+    def lint_stream(self, lines: Iterable[str]) -> Iterator[Finding]:
+        """Lint a document given line by line with the streaming rules"""
+        return run_streaming_rules(self.streaming_rules(), lines)
+
+    def iter_lint(
+        self, file_paths: Iterable[Union[str, Path]], stream: bool = False
+    ) -> Iterator[Finding]:
+        """
+        Lint files one after the other and yield the findings as they are
+        found (see iter_file). Files are only read and checked as far as the
+        findings are consumed.
+        """
+        if self.config_path:
+            self.load_config(self.config_path)
+        lint_file = self.stream_file if stream else self.iter_file
+        for file_path in file_paths:
+            yield from lint_file(file_path)
+
+    def iter_file(self, file_path: Union[str, Path]) -> Iterator[Finding]:
+        """
+        Lint a single file and yield the findings as they are found, those of
+        the line rules in line order first (see iter_lines).
+        """
+        return (finding for _, finding in self._walk_file(file_path))
+
+    def _walk_file(
+        self,
+        file_path: Union[str, Path],
+        changes: Optional[LineIntervals] = None,
+        stream: bool = False,
+    ) -> Iterator[Tuple[int, Finding]]:
+        """
+        Yield the findings of a file with the index of their rule as they are
+        found, optionally only those on changed lines or of a streamed file.
+        """
+        file = str(file_path)
+        try:
+            if stream:
+                with open(file_path, "r", encoding="utf-8") as text:
+                    for finding in self.lint_stream(read_lines(text)):
+                        yield 0, finding.set_file(file)
+                return
+            content = DocumentBuffer.from_file(file_path)
+            if changes is None:
+                walk = self._walk(content, self.rules, None)
+            else:
+                rules = self._rules_for_changes(content, changes)
+                walk = (
+                    (index, finding)
+                    for index, finding in self._walk(content, rules, None)
+                    if _on_changed_line(finding, changes)
                 )
-            ]
+            for index, finding in walk:
+                yield index, finding.set_file(file)
+        except Exception as e:
+            yield -1, _error_finding(file_path, e)
+
+    def _walk_data(
+        self, file_path: Union[str, Path], data: bytes
+    ) -> Iterator[Tuple[int, Finding]]:
+        """Yield the findings of a file content like _walk_file"""
+        file = str(file_path)
+        try:
+            content = DocumentBuffer.from_bytes(data)
+            for index, finding in self._walk(content, self.rules, None):
+                yield index, finding.set_file(file)
+        except Exception as e:
+            yield -1, _error_finding(file_path, e)
 
-    def lint_string(self, content: str) -> List[Finding]:
-        """Lint a string and return a report"""
-        document = self.parser.parse(content)
-        raw_lines = content.splitlines()
-        findings = []
+    def lint_string(self, content: Union[str, DocumentBuffer]) -> List[Finding]:
+        """Lint a string or document buffer and return a report"""
+        if not isinstance(content, DocumentBuffer):
+            content = DocumentBuffer(content)
+        return self.lint_lines(content)
 
-        for rule in self.rules:
-            # These rules need raw lines, not parsed elements
-            if isinstance(
-                rule,
-                (
-                    WhitespaceRule,
-                    MarkdownSyntaxRule,
-                    ExplicitNumberedListRule,
-                    NonSemanticDefinitionListRule,
-                    CounterInTitleRule,
-                    MarkdownTableRule,
-                ),
+    def lint_changes(
+        self, content: Union[str, DocumentBuffer], changes: LineIntervals
+    ) -> List[Finding]:
+        """
+        Lint a string or document buffer and return the findings on the
+        changed lines.
+
+        Rules that only look at section titles report their findings on
+        section titles, so they are skipped if no section title changed.
+        """
+        lines = (
+            content if isinstance(content, DocumentBuffer) else DocumentBuffer(content)
+        )
+        rules = self._rules_for_changes(lines, changes)
+        return on_changed_lines(self.lint_lines(lines, rules), changes)
+
+    def _rules_for_changes(
+        self, lines: Sequence[str], changes: LineIntervals
+    ) -> List[Rule]:
+        """The rules to run for findings on changed lines, see lint_changes"""
+        if any(lines[line - 1].startswith("=") for line in changes.lines(len(lines))):
+            return self.rules
+        return [rule for rule in self.rules if rule.scope != HEADINGS_SCOPE]
+
+    def lint_lines(
+        self,
+        lines: Sequence[str],
+        rules: Optional[Sequence[Rule]] = None,
+        content: Optional[str] = None,
+    ) -> List[Finding]:
+        """
+        Lint a document given as a list of lines or a document buffer with all
+        or some of the rules. The findings are ordered by rule.
+
+        The document is only parsed if one of the rules needs the parsed
+        document, from the content if given, the buffer or else from the
+        joined lines.
+        """
+        if rules is None:
+            rules = self.rules
+        results: List[List[Finding]] = [[] for _ in rules]
+        for index, finding in self._walk(lines, rules, content):
+            results[index].append(finding)
+        return [finding for findings in results for finding in findings]
+
+    def iter_lines(
+        self,
+        lines: Sequence[str],
+        rules: Optional[Sequence[Rule]] = None,
+        content: Optional[str] = None,
+    ) -> Iterator[Finding]:
+        """
+        Lint a document like lint_lines, but yield the findings as they are
+        found: those of the line rules in line order, then those of the other
+        rules rule by rule. The rules only run as far as the findings are
+        consumed, so a consumer stopping early stops the rule work as well.
+        """
+        if rules is None:
+            rules = self.rules
+        return (finding for _, finding in self._walk(lines, rules, content))
+
+    def _walk(
+        self,
+        lines: Sequence[str],
+        rules: Sequence[Rule],
+        content: Optional[str],
+    ) -> Iterator[Tuple[int, Finding]]:
+        """Yield the findings of the rules with the index of their rule"""
+        # Line rules share a single walk over the document, all other rules
+        # check the parsed document
+        line_rules = [
+            (index, rule)
+            for index, rule in enumerate(rules)
+            if isinstance(rule, LineRule)
+        ]
+        if line_rules:
+            for position, finding in walk_line_rules(
+                [rule for _, rule in line_rules], LineTable(lines)
             ):
-                rule_findings = rule.check(raw_lines)
-            else:
-                rule_findings = rule.check(document)
-            findings.extend(rule_findings)
+                yield line_rules[position][0], finding
 
-        return findings
+        document = None
+        for index, rule in enumerate(rules):
+            if isinstance(rule, LineRule):
+                continue
+            if document is None:
+                if content is not None:
+                    document = self.parser.parse(content)
+                elif isinstance(lines, DocumentBuffer):
+                    document = self.parser.parse(lines)
+                else:
+                    document = self.parser.parse("\n".join(lines))
+            for finding in rule.check(document):
+                yield index, finding
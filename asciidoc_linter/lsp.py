@@ -0,0 +1,381 @@
+# lsp.py - Language server for editors
+"""
+Language server for the AsciiDoc linter.
+
+The server speaks the Language Server Protocol over stdin and stdout and
+publishes the findings of open documents as diagnostics. Documents are
+synchronised incrementally: changes are applied to an IncrementalDocument
+(see incremental.py) as they arrive, and the document is linted once it has
+not changed for a short time. Only the parts of the document around the
+changed lines are linted again. A lint run that is overtaken by another
+change is abandoned, and the new state is linted after the next pause.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stdout
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from . import __version__
+from .incremental import IncrementalDocument, split_lines
+from .linter import AsciiDocLinter
+from .rules.base import Finding
+
+DEFAULT_DEBOUNCE = 0.3  # seconds without changes before a document is linted
+
+# Values defined by the protocol
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+DIAGNOSTIC_SEVERITIES = {"error": 1, "warning": 2, "info": 3}
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read a message with its headers, returns None at the end of the stream"""
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            if length is None:
+                continue  # Tolerate blank lines between messages
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return json.loads(stream.read(length))
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Write a message with a Content-Length header"""
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def utf16_length(text: str) -> int:
+    """Return the length of a string in UTF-16 code units"""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def utf16_index(text: str, units: int) -> int:
+    """Return the index into a string of a position given in UTF-16 code units"""
+    if text.isascii():
+        return min(units, len(text))
+    count = 0
+    for index, char in enumerate(text):
+        if count >= units:
+            return index
+        count += 2 if ord(char) > 0xFFFF else 1
+    return len(text)
+
+
+class OpenDocument:
+    """A document opened in the editor"""
+
+    def __init__(self, uri: str, version: int, text: str, linter: AsciiDocLinter):
+        self.uri = uri
+        self.version = version
+        self.document = IncrementalDocument(text, linter)
+        # Held while the document is changed or linted
+        self.lock = threading.Lock()
+        # Counts the received changes, a lint run is abandoned when it grows
+        self.changes = 0
+
+
+class LanguageServer:
+    """Publishes the findings of the documents opened in an editor"""
+
+    def __init__(
+        self,
+        linter: Optional[AsciiDocLinter] = None,
+        debounce: float = DEFAULT_DEBOUNCE,
+        input_stream: Optional[BinaryIO] = None,
+        output_stream: Optional[BinaryIO] = None,
+    ):
+        self.linter = linter or AsciiDocLinter()
+        self.debounce = debounce
+        self.input_stream = input_stream or sys.stdin.buffer
+        self.output_stream = output_stream or sys.stdout.buffer
+        self.documents: Dict[str, OpenDocument] = {}
+        self.utf16 = True  # Positions are counted in UTF-16 code units
+        self.shutdown_requested = False
+        self.running = False
+        self._write_lock = threading.Lock()
+        # Documents waiting to be linted, by the time they are due
+        self._due: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+        }
+
+    def serve(self) -> int:
+        """Handle messages until the client exits, returns the exit code"""
+        self.running = True
+        worker = threading.Thread(target=self._lint_loop, daemon=True)
+        worker.start()
+        try:
+            while True:
+                message = read_message(self.input_stream)
+                if message is None or message.get("method") == "exit":
+                    break
+                self.handle(message)
+        finally:
+            with self._condition:
+                self.running = False
+                self._condition.notify()
+            worker.join()
+        return 0 if self.shutdown_requested else 1
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        """Handle a request or notification from the client"""
+        method = message.get("method")
+        if method is None:
+            return  # A response, the server sends no requests
+        handler = self._handlers.get(method)
+        params = message.get("params") or {}
+
+        if "id" not in message:
+            if handler is not None:
+                try:
+                    handler(params)
+                except Exception:
+                    traceback.print_exc()
+            return
+
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        if handler is None:
+            response["error"] = {
+                "code": METHOD_NOT_FOUND,
+                "message": f"Unsupported method {method}",
+            }
+        elif self.shutdown_requested:
+            response["error"] = {
+                "code": INVALID_REQUEST,
+                "message": "The server is shutting down",
+            }
+        else:
+            try:
+                response["result"] = handler(params)
+            except Exception as e:
+                traceback.print_exc()
+                response["error"] = {"code": INTERNAL_ERROR, "message": str(e)}
+        self.send(response)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        with self._write_lock:
+            write_message(self.output_stream, message)
+
+    def initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        encodings = (
+            params.get("capabilities", {}).get("general", {}).get("positionEncodings")
+        )
+        # Python strings are indexed by code points, UTF-32 avoids converting
+        self.utf16 = "utf-32" not in (encodings or [])
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                },
+            },
+            "serverInfo": {"name": "asciidoc-linter", "version": __version__},
+        }
+
+    def shutdown(self, params: Dict[str, Any]) -> None:
+        self.shutdown_requested = True
+
+    def did_open(self, params: Dict[str, Any]) -> None:
+        item = params["textDocument"]
+        uri = item["uri"]
+        self.documents[uri] = OpenDocument(
+            uri, item.get("version", 0), item["text"], self.linter
+        )
+        self.schedule(uri, 0)
+
+    def did_change(self, params: Dict[str, Any]) -> None:
+        item = params["textDocument"]
+        open_document = self.documents.get(item["uri"])
+        if open_document is None:
+            return
+        # Counted before waiting for the lock, so a running lint stops early
+        open_document.changes += 1
+        with open_document.lock:
+            for change in params["contentChanges"]:
+                self._apply_change(open_document.document, change)
+            open_document.version = item.get("version", open_document.version)
+        self.schedule(open_document.uri, self.debounce)
+
+    def did_close(self, params: Dict[str, Any]) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        with self._condition:
+            self._due.pop(uri, None)
+        self.publish(uri, None, [])
+
+    def _apply_change(
+        self, document: IncrementalDocument, change: Dict[str, Any]
+    ) -> None:
+        """Apply a full or ranged change to the text of a document"""
+        if "range" not in change:
+            document.replace_lines(0, len(document.lines), split_lines(change["text"]))
+            return
+
+        document.apply_edit(
+            self._position(document.lines, change["range"]["start"]),
+            self._position(document.lines, change["range"]["end"]),
+            change["text"],
+        )
+
+    def _position(self, lines: List[str], position: Dict[str, int]) -> Tuple[int, int]:
+        """Return the line and the index into the line of a protocol position"""
+        line = position["line"]
+        character = position["character"]
+        if self.utf16 and line < len(lines):
+            return line, utf16_index(lines[line], character)
+        return line, character
+
+    def schedule(self, uri: str, delay: float) -> None:
+        """Lint a document after a delay, postponing an earlier schedule"""
+        with self._condition:
+            self._due[uri] = time.monotonic() + delay
+            self._condition.notify()
+
+    def _lint_loop(self) -> None:
+        """Lint documents when they are due, runs in a thread of its own"""
+        while True:
+            with self._condition:
+                while self.running:
+                    now = time.monotonic()
+                    due = [uri for uri, when in self._due.items() if when <= now]
+                    if due:
+                        break
+                    timeout = min(self._due.values(), default=now + 60) - now
+                    self._condition.wait(timeout)
+                if not self.running:
+                    return
+                for uri in due:
+                    del self._due[uri]
+            for uri in due:
+                open_document = self.documents.get(uri)
+                if open_document is not None:
+                    self.lint(open_document)
+
+    def flush(self) -> None:
+        """Lint all documents waiting to be linted right away"""
+        with self._condition:
+            due = list(self._due)
+            self._due.clear()
+        for uri in due:
+            open_document = self.documents.get(uri)
+            if open_document is not None:
+                self.lint(open_document)
+
+    def lint(self, open_document: OpenDocument) -> bool:
+        """
+        Lint a document and publish its diagnostics. Returns False if the run
+        was abandoned because the document changed in the meantime.
+        """
+        changes = open_document.changes
+        with open_document.lock:
+            document = open_document.document
+            if not document.update(lambda: open_document.changes != changes):
+                return False
+            version = open_document.version
+            diagnostics = [
+                self.diagnostic(finding, document.lines)
+                for finding in document.findings
+            ]
+        if self.documents.get(open_document.uri) is not open_document:
+            return False  # Closed in the meantime
+        self.publish(open_document.uri, version, diagnostics)
+        return True
+
+    def diagnostic(self, finding: Finding, lines: List[str]) -> Dict[str, Any]:
+        """Convert a finding to a diagnostic covering the rest of its line"""
+        position = finding.position
+        line = max(position.line - 1, 0) if position else 0
+        text = lines[line] if line < len(lines) else ""
+        start = 0
+        if position and position.column:
+            start = min(position.column - 1, len(text))
+        if self.utf16:
+            end = utf16_length(text)
+            start = utf16_length(text[:start])
+        else:
+            end = len(text)
+
+        diagnostic = {
+            "range": {
+                "start": {"line": line, "character": start},
+                "end": {"line": line, "character": end},
+            },
+            "severity": DIAGNOSTIC_SEVERITIES.get(str(finding.severity), 2),
+            "source": "asciidoc-linter",
+            "message": finding.message,
+        }
+        if finding.rule_id:
+            diagnostic["code"] = finding.rule_id
+        return diagnostic
+
+    def publish(
+        self, uri: str, version: Optional[int], diagnostics: List[Dict[str, Any]]
+    ) -> None:
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.send(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/publishDiagnostics",
+                "params": params,
+            }
+        )
+
+
+def create_lsp_parser() -> argparse.ArgumentParser:
+    """Create the command line parser of the language server"""
+    parser = argparse.ArgumentParser(
+        description="Run the AsciiDoc linter as a language server on stdin and stdout"
+    )
+    parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEFAULT_DEBOUNCE,
+        help="Seconds to wait after a change before linting "
+        f"(default: {DEFAULT_DEBOUNCE})",
+    )
+    return parser
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Entry point of the language server"""
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = create_lsp_parser().parse_args(args)
+    linter = AsciiDocLinter()
+    if parsed_args.config:
+        # Standard output carries the protocol, report errors on stderr
+        with redirect_stdout(sys.stderr):
+            linter.load_config(parsed_args.config)
+    return LanguageServer(linter, parsed_args.debounce).serve()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
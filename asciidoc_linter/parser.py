@@ -4,16 +4,43 @@ Parser for AsciiDoc content that creates an internal representation
 for rule checking
 """
 
-from typing import List, Optional
-from dataclasses import dataclass
+import re
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from dataclasses import dataclass, field
+
+from .blocks import block_type, VERBATIM_BLOCK_TYPES
+from .buffer import DocumentBuffer
 
 
 @dataclass
 class AsciiDocElement:
-    """Base class for AsciiDoc elements"""
+    """
+    Base class for AsciiDoc elements
+
+    ``line_number`` and ``end_line`` are the 1-based first and last line of the
+    element, ``start_offset`` and ``end_offset`` the character offsets of the
+    element in the source. ``content`` is the source text of the element; for
+    sections, lists and compound blocks it only holds the first line.
+    """
 
     line_number: int
     content: str
+    end_line: int = field(default=0, init=False)
+    start_offset: int = field(default=0, init=False)
+    end_offset: int = field(default=0, init=False)
+    children: List["AsciiDocElement"] = field(
+        default_factory=list, init=False, repr=False
+    )
 
 
 @dataclass
@@ -22,34 +49,553 @@ class Header(AsciiDocElement):
 
     level: int
 
+    @property
+    def title(self) -> str:
+        return self.content[self.level :].strip()
+
+
+@dataclass
+class Section(Header):
+    """Represents a section, its children are the blocks of the section"""
+
+
+@dataclass
+class DelimitedElement(AsciiDocElement):
+    """Base class for delimited blocks"""
+
+    kind: str = field(default="", init=False)
+    delimiter: str = field(default="", init=False)
+    terminated: bool = field(default=True, init=False)
+
+
+@dataclass
+class Block(DelimitedElement):
+    """Represents a delimited block that is not a code block or table"""
+
 
 @dataclass
-class CodeBlock(AsciiDocElement):
+class CodeBlock(DelimitedElement):
     """Represents a code block"""
 
     language: Optional[str]
 
 
 @dataclass
-class Table(AsciiDocElement):
+class Table(DelimitedElement):
     """Represents a table"""
 
     columns: int
 
 
+@dataclass
+class Paragraph(AsciiDocElement):
+    """Represents a paragraph"""
+
+
+@dataclass
+class ListBlock(AsciiDocElement):
+    """Represents a list, its children are the list items"""
+
+    kind: str
+
+
+@dataclass
+class ListItem(AsciiDocElement):
+    """Represents a list item"""
+
+    kind: str
+    marker: str
+
+
+@dataclass
+class AttributeEntry(AsciiDocElement):
+    """Represents a document attribute entry (:name: value)"""
+
+    name: str
+    value: Optional[str]
+
+
+@dataclass
+class BlockAttributes(AsciiDocElement):
+    """Represents a block attribute line ([source,python])"""
+
+    attributes: str
+
+
+@dataclass
+class BlockTitle(AsciiDocElement):
+    """Represents a block title (.Title)"""
+
+    title: str
+
+
+@dataclass
+class BlockMacro(AsciiDocElement):
+    """Represents a block macro (image::path[attributes])"""
+
+    name: str
+    target: str
+    attributes: str
+
+
+@dataclass
+class Comment(AsciiDocElement):
+    """Represents a single line comment"""
+
+
+ElementType = TypeVar("ElementType", bound=AsciiDocElement)
+
+
+class Document(list):
+    """
+    A parsed AsciiDoc document.
+
+    The top-level elements of the block tree are in ``blocks``, which is built
+    when it is first used. For compatibility with earlier versions of the
+    parser, the document itself is the list of all headers in document order,
+    each an element of its own line.
+    """
+
+    def __init__(self, source: str, lines: Sequence[str], line_offsets: Sequence[int]):
+        super().__init__()
+        self.source = source
+        self.lines = lines
+        self.line_offsets = line_offsets
+        self._blocks: Optional[List[AsciiDocElement]] = None
+
+    @property
+    def blocks(self) -> List[AsciiDocElement]:
+        """The top-level elements of the block tree"""
+        if self._blocks is None:
+            self._blocks = _BlockParser(self).parse()
+        return self._blocks
+
+    def walk(self) -> Iterator[AsciiDocElement]:
+        """Iterate over all elements of the tree in document order"""
+        stack = list(reversed(self.blocks))
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+    def find_all(self, element_type: Type[ElementType]) -> List[ElementType]:
+        """Return all elements of the given type in document order"""
+        return [e for e in self.walk() if isinstance(e, element_type)]
+
+    def text(self, element: AsciiDocElement) -> str:
+        """Return the complete source text of an element"""
+        return self.source[element.start_offset : element.end_offset]
+
+
+# Characters str.splitlines() treats as line boundaries
+LINE_TERMINATORS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+HEADER_PATTERN = re.compile(r"^(=+) +\S")
+ATTRIBUTE_ENTRY_PATTERN = re.compile(r"^:(!?\w[\w-]*!?):(?:[ \t]+(.*))?$")
+BLOCK_ATTRIBUTES_PATTERN = re.compile(r"^\[(.*)\]$")
+BLOCK_TITLE_PATTERN = re.compile(r"^\.([^\s.].*)$")
+BLOCK_MACRO_PATTERN = re.compile(r"^(\w[\w-]*)::(\S*?)\[(.*)\]$")
+LIST_ITEM_PATTERN = re.compile(
+    r"^[ \t]*(?:(?P<unordered>-|\*+)|(?P<ordered>\.+|\d+\.))[ \t]+\S"
+)
+DESCRIPTION_ITEM_PATTERN = re.compile(r"^[ \t]*(\S.*?)(:::{0,2}|;;)(?:[ \t]+\S.*)?$")
+COLS_PATTERN = re.compile(r"cols\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^,\]]+))")
+
+
+def split_lines(content: str) -> Tuple[List[str], List[int]]:
+    """Split content like str.splitlines() and record the offset of each line"""
+    lines = []
+    offsets = []
+    offset = 0
+    for raw_line in content.splitlines(True):
+        offsets.append(offset)
+        offset += len(raw_line)
+        if raw_line.endswith("\r\n"):
+            raw_line = raw_line[:-2]
+        elif raw_line[-1] in LINE_TERMINATORS:
+            raw_line = raw_line[:-1]
+        lines.append(raw_line)
+    return lines, offsets
+
+
+def count_table_columns(
+    attributes: Optional[str], first_row: str, separator: str
+) -> int:
+    """Determine the number of table columns from cols or the first row"""
+    if attributes:
+        match = COLS_PATTERN.search(attributes)
+        if match:
+            spec = next(group for group in match.groups() if group is not None)
+            if spec.strip().isdigit():
+                return int(spec)
+            columns = 0
+            for column in spec.split(","):
+                multiplier, star, _ = column.partition("*")
+                columns += int(multiplier) if star and multiplier.isdigit() else 1
+            return columns
+    if separator in ",:":
+        return first_row.count(separator) + 1
+    return first_row.count(separator)
+
+
+class _Frame:
+    """An open container together with the state of its current block"""
+
+    __slots__ = (
+        "element",
+        "paragraph",
+        "list",
+        "item",
+        "item_text_end",
+        "attributes",
+        "continued",
+    )
+
+    def __init__(self, element: Optional[AsciiDocElement]):
+        self.element = element
+        self.paragraph: Optional[Paragraph] = None
+        self.list: Optional[ListBlock] = None
+        self.item: Optional[ListItem] = None
+        self.item_text_end = -1
+        self.attributes: Optional[str] = None
+        self.continued = False
+
+
+def _find_headers(document: Document) -> Iterator[Header]:
+    """
+    Yield the headers of a document outside of verbatim blocks, which is all
+    the list of headers depends on, without building the block tree
+    """
+    lines, offsets = document.lines, document.line_offsets
+    verbatim: Optional[str] = None  # Delimiter of the open verbatim block
+    for index, line in enumerate(lines):
+        # Delimiter lines and headers start at the beginning of the line
+        if not line or line[0].isspace():
+            continue
+        stripped = line.rstrip()
+        if verbatim is not None:
+            if stripped == verbatim:
+                verbatim = None
+            continue
+        kind = block_type(stripped)
+        if kind is not None:
+            if kind in VERBATIM_BLOCK_TYPES:
+                verbatim = stripped
+            continue
+        if line[0] == "=":
+            match = HEADER_PATTERN.match(line)
+            if match:
+                header = Header(index + 1, line, len(match.group(1)))
+                header.end_line = index + 1
+                header.start_offset = offsets[index]
+                header.end_offset = offsets[index] + len(line)
+                yield header
+
+
+class _BlockParser:
+    """Builds the block tree of a single document in one pass"""
+
+    def __init__(self, document: Document):
+        # The lines of a buffer are sliced when they are visited
+        self.lines, self.offsets = document.lines, document.line_offsets
+        self.document = document
+        self.blocks: List[AsciiDocElement] = []
+        self.frames = [_Frame(None)]
+        self.open_delimiters: Dict[str, int] = {}
+        self.verbatim: Optional[DelimitedElement] = None
+        self.verbatim_attributes: Optional[str] = None
+
+    # Element helpers
+
+    def _line_end(self, index: int) -> int:
+        return self.offsets[index] + len(self.lines[index])
+
+    def _start(self, element: ElementType, index: int) -> ElementType:
+        element.start_offset = self.offsets[index]
+        self._finish(element, index)
+        return element
+
+    def _finish(self, element: AsciiDocElement, index: int) -> None:
+        element.end_line = index + 1
+        element.end_offset = self._line_end(index)
+
+    def _finish_with_text(self, element: AsciiDocElement, index: int) -> None:
+        self._finish(element, index)
+        element.content = self.document.source[
+            element.start_offset : element.end_offset
+        ]
+
+    def _extend_parents(self, element: AsciiDocElement) -> None:
+        """Make the open containers end no earlier than the given element"""
+        for frame in self.frames:
+            for parent in (frame.element, frame.list, frame.item):
+                if parent is not None and parent.end_offset < element.end_offset:
+                    parent.end_line = element.end_line
+                    parent.end_offset = element.end_offset
+
+    def _append(self, element: AsciiDocElement) -> None:
+        frame = self.frames[-1]
+        if frame.continued and frame.item is not None:
+            frame.item.children.append(element)
+        elif frame.element is None:
+            self.blocks.append(element)
+        else:
+            frame.element.children.append(element)
+        self._extend_parents(element)
+
+    # Paragraphs and lists
+
+    def _end_paragraph(self) -> None:
+        frame = self.frames[-1]
+        if frame.paragraph is not None:
+            self._finish_with_text(frame.paragraph, frame.paragraph.end_line - 1)
+            frame.paragraph = None
+
+    def _end_list(self) -> None:
+        frame = self.frames[-1]
+        frame.list = None
+        frame.item = None
+        frame.continued = False
+
+    def _end_blocks(self) -> None:
+        self._end_paragraph()
+        self._end_list()
+
+    def _add_list_item(self, index: int, line: str, kind: str, marker: str) -> None:
+        frame = self.frames[-1]
+        self._end_paragraph()
+        if frame.list is None:
+            frame.continued = False
+            frame.list = self._start(ListBlock(index + 1, line, kind), index)
+            self._append(frame.list)
+            frame.attributes = None
+        item = self._start(ListItem(index + 1, line, kind, marker), index)
+        frame.list.children.append(item)
+        frame.item = item
+        frame.item_text_end = index
+        frame.continued = False
+        self._extend_parents(item)
+
+    def _add_text(self, index: int, line: str) -> None:
+        frame = self.frames[-1]
+        if frame.paragraph is not None:
+            self._finish(frame.paragraph, index)
+            self._extend_parents(frame.paragraph)
+            return
+        if frame.item is not None and not frame.continued:
+            if frame.item_text_end == index - 1:
+                # Line continues the text of the list item
+                frame.item_text_end = index
+                self._finish_with_text(frame.item, index)
+                self._extend_parents(frame.item)
+                return
+            self._end_list()
+        frame.paragraph = self._start(Paragraph(index + 1, line), index)
+        self._append(frame.paragraph)
+        frame.continued = False
+        frame.attributes = None
+
+    # Sections and delimited blocks
+
+    def _add_section(self, index: int, line: str, level: int) -> None:
+        self._end_blocks()
+        self.frames[-1].attributes = None
+        in_block = any(
+            isinstance(frame.element, DelimitedElement) for frame in self.frames
+        )
+        if in_block:
+            self._append(self._start(Header(index + 1, line, level), index))
+            return
+        while len(self.frames) > 1 and self.frames[-1].element.level >= level:
+            self.frames.pop()
+        section = self._start(Section(index + 1, line, level), index)
+        self._append(section)
+        self.frames.append(_Frame(section))
+
+    def _open_block(self, index: int, line: str, kind: str, delimiter: str) -> None:
+        frame = self.frames[-1]
+        self._end_paragraph()
+        if not frame.continued:
+            self._end_list()
+        attributes = frame.attributes
+        frame.attributes = None
+
+        if kind in ("listing", "literal"):
+            language = None
+            if attributes:
+                parts = [part.strip() for part in attributes.split(",")]
+                if parts[0] == "source" and len(parts) > 1 and "=" not in parts[1]:
+                    language = parts[1] or None
+            block = CodeBlock(index + 1, line, language)
+        elif kind == "table":
+            block = Table(index + 1, line, count_table_columns(attributes, "", "|"))
+        else:
+            block = Block(index + 1, line)
+        block.kind = kind
+        block.delimiter = delimiter
+        block.terminated = False
+        self._start(block, index)
+        self._append(block)
+        frame.continued = False
+
+        if kind in VERBATIM_BLOCK_TYPES:
+            self.verbatim = block
+            self.verbatim_attributes = attributes
+        else:
+            self.frames.append(_Frame(block))
+            self.open_delimiters[delimiter] = self.open_delimiters.get(delimiter, 0) + 1
+
+    def _close_block(self, index: int, delimiter: str) -> None:
+        """Close the innermost compound block with the given delimiter"""
+        self._end_blocks()
+        while True:
+            frame = self.frames.pop()
+            element = frame.element
+            if isinstance(element, DelimitedElement):
+                self.open_delimiters[element.delimiter] -= 1
+                if element.delimiter == delimiter:
+                    element.terminated = True
+                    self._finish(element, index)
+                    self._extend_parents(element)
+                    return
+            # Blocks and sections opened inside end before the delimiter
+            self._end_paragraph()
+
+    def _verbatim_line(self, index: int, line: str, stripped: str) -> None:
+        block = self.verbatim
+        if stripped == block.delimiter and not line[0].isspace():
+            block.terminated = True
+            self._finish_with_text(block, index)
+            self._extend_parents(block)
+            self.verbatim = None
+            return
+        if isinstance(block, Table) and not block.columns and stripped:
+            block.columns = count_table_columns(
+                self.verbatim_attributes, stripped, block.delimiter[0]
+            )
+        self._finish(block, index)
+        self._extend_parents(block)
+
+    # Main loop
+
+    def parse(self) -> List[AsciiDocElement]:
+        for index, line in enumerate(self.lines):
+            stripped = line.strip()
+            if self.verbatim is not None:
+                self._verbatim_line(index, line, stripped)
+                continue
+            frame = self.frames[-1]
+
+            if not stripped:
+                self._end_paragraph()
+                frame.item_text_end = -1
+                continue
+
+            # Delimiter lines start at the beginning of the line
+            if not line[0].isspace():
+                if self.open_delimiters.get(stripped):
+                    self._close_block(index, stripped)
+                    continue
+
+                kind = block_type(stripped)
+                if kind is not None:
+                    self._open_block(index, line, kind, stripped)
+                    continue
+
+            header = HEADER_PATTERN.match(line)
+            if header:
+                self._add_section(index, line, len(header.group(1)))
+                continue
+
+            if stripped == "+" and frame.item is not None:
+                self._end_paragraph()
+                frame.item_text_end = -1
+                frame.continued = True
+                continue
+
+            list_item = LIST_ITEM_PATTERN.match(line)
+            if list_item:
+                kind = "unordered" if list_item.group("unordered") else "ordered"
+                marker = list_item.group(kind)
+                self._add_list_item(index, line, kind, marker)
+                continue
+
+            if frame.paragraph is None:
+                if self._block_line(index, line, stripped):
+                    continue
+                description = DESCRIPTION_ITEM_PATTERN.match(line)
+                if description:
+                    self._add_list_item(
+                        index, line, "description", description.group(2)
+                    )
+                    continue
+
+            self._add_text(index, line)
+
+        if self.verbatim is not None:
+            self._finish_with_text(self.verbatim, self.verbatim.end_line - 1)
+        while self.frames:
+            self._end_paragraph()
+            self.frames.pop()
+        return self.blocks
+
+    def _block_line(self, index: int, line: str, stripped: str) -> bool:
+        """Handle lines that are only recognised between blocks"""
+        frame = self.frames[-1]
+        element: Optional[AsciiDocElement] = None
+
+        if stripped.startswith("//"):
+            element = Comment(index + 1, line)
+        elif line.startswith(":"):
+            match = ATTRIBUTE_ENTRY_PATTERN.match(line)
+            if match:
+                element = AttributeEntry(
+                    index + 1, line, match.group(1), match.group(2)
+                )
+        elif line.startswith("["):
+            match = BLOCK_ATTRIBUTES_PATTERN.match(line)
+            if match:
+                element = BlockAttributes(index + 1, line, match.group(1))
+                frame.attributes = match.group(1)
+        elif line.startswith("."):
+            match = BLOCK_TITLE_PATTERN.match(line)
+            if match:
+                element = BlockTitle(index + 1, line, match.group(1))
+        else:
+            match = BLOCK_MACRO_PATTERN.match(line)
+            if match:
+                element = BlockMacro(index + 1, line, *match.groups())
+                frame.attributes = None
+
+        if element is None:
+            return False
+        if frame.list is not None and not isinstance(element, Comment):
+            if not frame.continued:
+                self._end_list()
+        frame.item_text_end = -1
+        frame.continued = False
+        self._append(self._start(element, index))
+        return True
+
+
 class AsciiDocParser:
     """Parser for AsciiDoc content"""
 
-    def parse(self, content: str) -> List[AsciiDocElement]:
-        """Parse AsciiDoc content into elements"""
-        # TODO: Implement actual parsing
-        elements = []
-        for line_number, line in enumerate(content.splitlines(), 1):
-            if line.startswith("="):
-                level = len(line) - len(line.lstrip("="))
-                # Only treat as header if there's content after the = characters
-                # Block delimiters like ==== should not be treated as headers
-                rest = line[level:]
-                if rest.startswith(" ") and rest.strip():
-                    elements.append(Header(line_number, line, level))
-        return elements
+    def parse(self, content: Union[str, DocumentBuffer]) -> Document:
+        """
+        Parse AsciiDoc content, a string or a document buffer, into a
+        document tree.
+
+        The document is parsed in a single pass over its lines. Sections,
+        delimited blocks, lists, paragraphs, attribute entries, block
+        attributes, block titles, block macros and comments become elements
+        of the tree. Only the headers are found right away; the tree is
+        built when ``blocks`` is first used, so callers that only need the
+        headers do not pay for it.
+        """
+        if isinstance(content, DocumentBuffer):
+            document = Document(content.text, content, content.starts)
+        else:
+            document = Document(content, *split_lines(content))
+        document.extend(_find_headers(document))
+        return document
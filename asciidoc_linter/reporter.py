@@ -6,10 +6,15 @@ Different output formatters for lint results
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Dict
+from pathlib import Path, PurePath
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from urllib.parse import quote
+import io
 import json
+import os
 
-from .rules.base import Finding
+from . import __version__
+from .rules.base import Finding, Rule
 
 
 @dataclass
@@ -17,6 +22,8 @@ class LintReport:
     """Contains all lint findings for a document"""
 
     findings: List[Finding]
+    # Whether findings or files were left out because of a limit
+    truncated: bool = False
 
     def grouped_findings(self) -> Dict[str, List[Finding]]:
         grouped = defaultdict(list)
@@ -35,6 +42,17 @@ class LintReport:
         return len(self.findings)
 
 
+TRUNCATED_NOTE = (
+    "Stopped early: the finding limit was reached, not all findings are reported"
+)
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# SARIF result levels of the severities
+SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+
+
 class Reporter(ABC):
     """Base class for lint report formatters."""
 
@@ -43,11 +61,56 @@ class Reporter(ABC):
         pass
 
 
-class ConsoleReporter(Reporter):
-    """Base class for formatting lint reports"""
+class StreamingReporter(Reporter):
+    """
+    Base class for reporters writing the findings of every file as soon as
+    it is linted, without holding the whole report. A report is written with
+    write_results followed by write_end.
+    """
+
+    def write_start(self, output: TextIO) -> None:
+        """Write what comes before the findings, resets the reporter"""
+
+    @abstractmethod
+    def write_findings(self, findings: List[Finding], output: TextIO) -> None:
+        """Write the findings of a file"""
+
+    @abstractmethod
+    def write_end(self, output: TextIO, truncated: bool) -> None:
+        """Write what comes after the findings"""
+
+    def write_results(self, results: Iterable[List[Finding]], output: TextIO) -> int:
+        """
+        Start a report and write the findings of files as they are linted,
+        returns the number of findings
+        """
+        self.write_start(output)
+        count = 0
+        for findings in results:
+            if findings:
+                self.write_findings(findings, output)
+                count += len(findings)
+        return count
+
+    def format_report(self, report: LintReport) -> str:
+        output = io.StringIO()
+        self.write_results(report.grouped_findings().values(), output)
+        self.write_end(output, report.truncated)
+        return output.getvalue()
+
+
+class ConsoleReporter(StreamingReporter):
+    """
+    Formats findings for reading in a terminal, grouped by file. Written as
+    a stream, the findings of every file are written in one go as soon as
+    the file is linted.
+    """
 
     def __init__(self, enable_color):
         self.enable_color = enable_color
+        # Prefixes are coloured once instead of for every finding
+        self.cross = self._red("✗")
+        self.findings = 0
 
     def _green(self, text):
         if not self.enable_color:
@@ -61,28 +124,48 @@ class ConsoleReporter(Reporter):
 
     def format_report(self, report: LintReport) -> str:
         """Format the report as string"""
-        if not report:
-            return self._green("✓ No issues found")
+        # Without the line break ending the written report
+        return super().format_report(report)[:-1]
 
-        output = []
-        for file, findings in report.grouped_findings().items():
-            if file:
-                output.append(f"Results for {file}:")
+    def write_start(self, output: TextIO) -> None:
+        self.findings = 0
+
+    def write_findings(self, findings: List[Finding], output: TextIO) -> None:
+        file = findings[0].file
+        lines = [f"Results for {file}:" if file else "Results without file:"]
+        cross = self.cross
+        for finding in findings:
+            location = finding.location
+            if location:
+                lines.append(f"{cross} {location}: {finding.message}")
             else:
-                output.append("Results without file:")
-
-            for finding in findings:
-                location = finding.location
-                if location:
-                    output.append(
-                        f"{self._red('✗')} {finding.location}: {finding.message}"
-                    )
-                else:
-                    output.append(f"{self._red('✗')} {finding.message}")
-            output.append("\n")
+                lines.append(f"{cross} {finding.message}")
+        # Files are separated by two blank lines
+        lines.append("\n\n")
+        output.write("\n".join(lines))
+        self.findings += len(findings)
 
+    def write_end(self, output: TextIO, truncated: bool) -> None:
+        if not self.findings:
+            output.write(self._green("✓ No issues found") + "\n")
+        elif truncated:
+            output.write(TRUNCATED_NOTE + "\n")
+
+    def format_changes(self, new: List[Finding], resolved: List[Finding]) -> str:
+        """Format the findings added and resolved by a change, e.g. in watch mode"""
+        output = []
+        for finding in new:
+            output.append(f"{self._red('+ ✗')} {self._describe(finding)}")
+        for finding in resolved:
+            output.append(f"{self._green('- ✓')} {self._describe(finding)}")
+        output.append(f"{len(new)} new, {len(resolved)} resolved")
         return "\n".join(output)
 
+    @staticmethod
+    def _describe(finding: Finding) -> str:
+        location = finding.location
+        return f"{location}: {finding.message}" if location else finding.message
+
 
 class JsonReporter(Reporter):
     """Reports findings in JSON format"""
@@ -91,53 +174,391 @@ class JsonReporter(Reporter):
         return json.dumps(
             {
                 "findings": [finding.to_json_object() for finding in report.findings],
+                "truncated": report.truncated,
             },
             indent=2,
         )
 
 
-class HtmlReporter(Reporter):
-    """Reports findings in HTML format"""
+class JsonLinesReporter(StreamingReporter):
+    """
+    Reports findings in JSON Lines format: one compact JSON object per
+    finding, ending with a summary record
+    """
 
-    def format_report(self, report: LintReport) -> str:
-        rows = []
-        for finding in report.findings:
-            rows.extend(
-                [
-                    "<tr>",
-                    f"<td>{finding.severity}</td>",
-                    f'<td>{finding.rule_id or ""}</td>',
-                    f"<td>{finding.location}</td>",
-                    f"<td>{finding.message}</td>",
-                    "</tr>",
-                ]
-            )
+    def __init__(self):
+        self.encoder = json.JSONEncoder(separators=(",", ":"))
+        self.findings = 0
+        self.files = 0
+
+    def write_start(self, output: TextIO) -> None:
+        self.findings = 0
+        self.files = 0
+
+    def write_findings(self, findings: List[Finding], output: TextIO) -> None:
+        encode = self.encoder.encode
+        output.write(
+            "".join(encode(finding.to_json_object()) + "\n" for finding in findings)
+        )
+        self.findings += len(findings)
+        self.files += 1
+
+    def write_end(self, output: TextIO, truncated: bool) -> None:
+        """Write the summary, counting the findings and files with findings"""
+        summary = {
+            "findings": self.findings,
+            "files": self.files,
+            "truncated": truncated,
+        }
+        output.write(self.encoder.encode({"summary": summary}) + "\n")
+
+
+def artifact_uri(file: str) -> str:
+    """The URI of a file in a SARIF log, relative paths stay relative"""
+    if os.path.isabs(file):
+        return Path(file).as_uri()
+    return quote(PurePath(file).as_posix())
+
+
+class SarifReporter(StreamingReporter):
+    """
+    Reports findings as a SARIF 2.1.0 log, e.g. for code scanning. The rules
+    are described once in the tool section, results refer to them and to the
+    linted files by index. Results are written as files are linted; the
+    table of files follows them.
+    """
 
-        rows = "\n".join(rows)
+    def __init__(self, rules: Iterable[Rule] = ()):
+        self.rules: List[Rule] = []
+        self.rule_indexes: Dict[str, int] = {}
+        for rule in rules:
+            if rule.id not in self.rule_indexes:
+                self.rule_indexes[rule.id] = len(self.rules)
+                self.rules.append(rule)
+        self.encoder = json.JSONEncoder(separators=(",", ":"))
+        self.artifact_indexes: Dict[str, int] = {}
+        self.separator = ""
 
-        return f"""<!DOCTYPE html>
+    def _describe_rule(self, rule: Rule) -> Dict[str, Any]:
+        descriptor: Dict[str, Any] = {"id": rule.id}
+        if rule.name:
+            descriptor["name"] = rule.name
+        if rule.description:
+            descriptor["shortDescription"] = {"text": rule.description}
+        descriptor["defaultConfiguration"] = {"level": SARIF_LEVELS[str(rule.severity)]}
+        return descriptor
+
+    def write_start(self, output: TextIO) -> None:
+        self.artifact_indexes = {}
+        self.separator = ""
+        driver = {
+            "name": "asciidoc-linter",
+            "version": __version__,
+            "rules": [self._describe_rule(rule) for rule in self.rules],
+        }
+        encode = self.encoder.encode
+        output.write(
+            f'{{"$schema":{encode(SARIF_SCHEMA)},"version":"2.1.0","runs":[{{'
+            f'"tool":{encode({"driver": driver})},"results":[\n'
+        )
+
+    def _result(self, finding: Finding) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        if finding.rule_id is not None:
+            result["ruleId"] = finding.rule_id
+            index = self.rule_indexes.get(finding.rule_id)
+            if index is not None:
+                result["ruleIndex"] = index
+        result["level"] = SARIF_LEVELS[str(finding.severity)]
+        result["message"] = {"text": finding.message}
+        if finding.file is not None:
+            uri = artifact_uri(finding.file)
+            index = self.artifact_indexes.setdefault(uri, len(self.artifact_indexes))
+            location: Dict[str, Any] = {
+                "artifactLocation": {"uri": uri, "index": index}
+            }
+            if finding.position is not None and finding.position.line:
+                region = {"startLine": finding.position.line}
+                if finding.position.column:
+                    region["startColumn"] = finding.position.column
+                location["region"] = region
+            result["locations"] = [{"physicalLocation": location}]
+        return result
+
+    def write_findings(self, findings: List[Finding], output: TextIO) -> None:
+        encode = self.encoder.encode
+        output.write(
+            self.separator
+            + ",\n".join(encode(self._result(finding)) for finding in findings)
+        )
+        self.separator = ",\n"
+
+    def write_end(self, output: TextIO, truncated: bool) -> None:
+        encode = self.encoder.encode
+        artifacts = [{"location": {"uri": uri}} for uri in self.artifact_indexes]
+        output.write(
+            f'\n],"artifacts":{encode(artifacts)},'
+            f'"properties":{encode({"truncated": truncated})}}}]}}\n'
+        )
+
+
+# Rows of the HTML report are arrays of these fields; file, rule, severity and
+# message are given by their index in the lists of the summary
+HTML_FIELDS = ["file", "line", "column", "rule", "severity", "message"]
+SEVERITIES = ["error", "warning", "info"]
+
+HTML_START = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <title>AsciiDoc Lint Results</title>
     <style>
-        table {{ border-collapse: collapse; width: 100%; }}
-        th, td {{ padding: 8px; text-align: left; border: 1px solid #ddd; }}
-        th {{ background-color: #f2f2f2; }}
-        tr:nth-child(even) {{ background-color: #f9f9f9; }}
-        tr:hover {{ background-color: #f5f5f5; }}
+        body { font-family: sans-serif; margin: 1em 2em; }
+        main { display: flex; gap: 1.5em; }
+        nav { flex: 0 0 22em; max-height: 80vh; overflow-y: auto; }
+        nav ul { list-style: none; margin: 0; padding: 0; }
+        nav li { cursor: pointer; padding: 3px 6px; overflow-wrap: anywhere; }
+        nav li:hover { background-color: #f5f5f5; }
+        nav li.selected { background-color: #e0e8f5; }
+        section { flex: 1; min-width: 0; }
+        table { border-collapse: collapse; width: 100%; table-layout: fixed; }
+        th, td { padding: 0 8px; text-align: left; border: 1px solid #ddd;
+                 height: 27px; white-space: nowrap; overflow: hidden;
+                 text-overflow: ellipsis; }
+        th { background-color: #f2f2f2; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        tr:hover { background-color: #f5f5f5; }
+        tr.error td:first-child { color: #b00020; }
+        #viewport { height: 75vh; overflow-y: auto; position: relative; }
+        #viewport table { position: absolute; top: 0; }
     </style>
 </head>
 <body>
     <h1>AsciiDoc Lint Results</h1>
-    <table>
-        <tr>
-            <th>Severity</th>
-            <th>Rule ID</th>
-            <th>Location</th>
-            <th>Message</th>
-        </tr>
-        {rows}
-    </table>
-</body>
-</html>"""
+    <p id="totals"></p>
+    <noscript>Showing the findings needs JavaScript.</noscript>
+    <main>
+        <nav>
+            <label>Group by
+                <select id="group-by">
+                    <option value="file">file</option>
+                    <option value="rule">rule</option>
+                </select>
+            </label>
+            <ul id="groups"></ul>
+        </nav>
+        <section>
+            <table>
+                <colgroup>
+                    <col style="width: 6em"><col style="width: 6em">
+                    <col style="width: 30%"><col>
+                </colgroup>
+                <tr>
+                    <th>Severity</th>
+                    <th>Rule ID</th>
+                    <th>Location</th>
+                    <th>Message</th>
+                </tr>
+            </table>
+            <div id="viewport">
+                <div id="spacer"></div>
+                <table>
+                    <colgroup>
+                        <col style="width: 6em"><col style="width: 6em">
+                        <col style="width: 30%"><col>
+                    </colgroup>
+                    <tbody id="rows"></tbody>
+                </table>
+            </div>
+        </section>
+    </main>
+"""
+
+# Renders the rows in view from the embedded data
+HTML_SCRIPT = """<script>
+(function () {
+    var ROW_HEIGHT = 28;
+    var FILE = 0, LINE = 1, COLUMN = 2, RULE = 3, SEVERITY = 4, MESSAGE = 5;
+    var rows = JSON.parse(document.getElementById("findings").textContent);
+    var summary = JSON.parse(document.getElementById("summary").textContent);
+    var viewport = document.getElementById("viewport");
+    var spacer = document.getElementById("spacer");
+    var body = document.getElementById("rows");
+    var groups = document.getElementById("groups");
+    var groupBy = document.getElementById("group-by");
+    var shown = rows;
+    var pending = false;
+
+    function describe(row) {
+        var parts = [];
+        var file = summary.files[row[FILE]];
+        if (file !== null) parts.push(file);
+        if (row[LINE] !== null) parts.push("line " + row[LINE]);
+        if (row[COLUMN] !== null) parts.push("column " + row[COLUMN]);
+        return parts.join(", ");
+    }
+
+    function cell(tr, text) {
+        var td = document.createElement("td");
+        td.textContent = text;
+        td.title = text;
+        tr.appendChild(td);
+    }
+
+    function render() {
+        pending = false;
+        var first = Math.floor(viewport.scrollTop / ROW_HEIGHT);
+        var last = Math.min(
+            shown.length, first + Math.ceil(viewport.clientHeight / ROW_HEIGHT) + 1
+        );
+        var fragment = document.createDocumentFragment();
+        for (var i = first; i < last; i++) {
+            var row = shown[i];
+            var severity = summary.severities[row[SEVERITY]];
+            var tr = document.createElement("tr");
+            tr.className = severity;
+            cell(tr, severity);
+            cell(tr, summary.rules[row[RULE]] || "");
+            cell(tr, describe(row));
+            cell(tr, summary.messages[row[MESSAGE]]);
+            fragment.appendChild(tr);
+        }
+        body.textContent = "";
+        body.appendChild(fragment);
+        body.parentNode.style.top = first * ROW_HEIGHT + "px";
+    }
+
+    function show(field, index) {
+        shown = field === null ? rows : rows.filter(function (row) {
+            return row[field] === index;
+        });
+        spacer.style.height = shown.length * ROW_HEIGHT + "px";
+        viewport.scrollTop = 0;
+        render();
+    }
+
+    function item(text, field, index) {
+        var li = document.createElement("li");
+        li.textContent = text;
+        li.addEventListener("click", function () {
+            var selected = groups.querySelector(".selected");
+            if (selected) selected.className = "";
+            li.className = "selected";
+            show(field, index);
+        });
+        groups.appendChild(li);
+        return li;
+    }
+
+    function showGroups() {
+        var field = groupBy.value === "rule" ? RULE : FILE;
+        var names = field === RULE ? summary.rules : summary.files;
+        var counts = field === RULE ? summary.rule_counts : summary.file_counts;
+        var order = names.map(function (_, index) { return index; });
+        order.sort(function (a, b) { return counts[b] - counts[a]; });
+        groups.textContent = "";
+        item("All (" + summary.findings + ")", null, null).className = "selected";
+        order.forEach(function (index) {
+            var name = names[index] === null ? "(none)" : names[index];
+            item(name + " (" + counts[index] + ")", field, index);
+        });
+        show(null, null);
+    }
+
+    var totals = summary.severities.map(function (severity, index) {
+        return summary.severity_counts[index] + " " + severity;
+    });
+    document.getElementById("totals").textContent = summary.findings +
+        " findings in " + summary.files.length + " files: " + totals.join(", ");
+    viewport.addEventListener("scroll", function () {
+        if (!pending) {
+            pending = true;
+            window.requestAnimationFrame(render);
+        }
+    });
+    window.addEventListener("resize", render);
+    groupBy.addEventListener("change", showGroups);
+    showGroups();
+})();
+</script>
+"""
+
+
+class HtmlReporter(StreamingReporter):
+    """
+    Reports findings as an HTML page. The findings are embedded as compact
+    JSON rows (see HTML_FIELDS), with file names, rule ids and messages
+    stored once, and a script renders only the rows in view, so pages with
+    100k findings stay small and open quickly. The counts per file, rule
+    and severity are computed while the rows are written.
+    """
+
+    def __init__(self):
+        self.encoder = json.JSONEncoder(separators=(",", ":"))
+        self._reset()
+
+    def _reset(self) -> None:
+        self.files: Dict[Optional[str], int] = {}
+        self.file_counts: List[int] = []
+        self.rules: Dict[Optional[str], int] = {}
+        self.rule_counts: List[int] = []
+        self.severity_counts = [0] * len(SEVERITIES)
+        self.messages: Dict[str, int] = {}
+        self.separator = ""
+
+    def write_start(self, output: TextIO) -> None:
+        self._reset()
+        output.write(HTML_START)
+        output.write('<script type="application/json" id="findings">[')
+
+    @staticmethod
+    def _index(indexes: Dict[Optional[str], int], counts: List[int], key) -> int:
+        index = indexes.get(key)
+        if index is None:
+            index = indexes[key] = len(counts)
+            counts.append(0)
+        counts[index] += 1
+        return index
+
+    def _encode(self, value: Any) -> str:
+        # "<" only occurs in strings, escaped it cannot end the script element
+        return self.encoder.encode(value).replace("<", "\\u003c")
+
+    def write_findings(self, findings: List[Finding], output: TextIO) -> None:
+        rows = []
+        for finding in findings:
+            severity = SEVERITIES.index(str(finding.severity))
+            self.severity_counts[severity] += 1
+            position = finding.position
+            rows.append(
+                [
+                    self._index(self.files, self.file_counts, finding.file),
+                    position.line if position else None,
+                    position.column if position else None,
+                    self._index(self.rules, self.rule_counts, finding.rule_id),
+                    severity,
+                    self.messages.setdefault(finding.message, len(self.messages)),
+                ]
+            )
+        output.write(self.separator + self._encode(rows)[1:-1])
+        self.separator = ","
+
+    def write_end(self, output: TextIO, truncated: bool) -> None:
+        summary = {
+            "fields": HTML_FIELDS,
+            "files": list(self.files),
+            "file_counts": self.file_counts,
+            "rules": list(self.rules),
+            "rule_counts": self.rule_counts,
+            "severities": SEVERITIES,
+            "severity_counts": self.severity_counts,
+            "messages": list(self.messages),
+            "findings": sum(self.severity_counts),
+            "truncated": truncated,
+        }
+        output.write("]</script>\n")
+        output.write('<script type="application/json" id="summary">')
+        output.write(self._encode(summary) + "</script>\n")
+        if truncated:
+            output.write(f"<p>{TRUNCATED_NOTE}</p>\n")
+        output.write(HTML_SCRIPT + "</body>\n</html>\n")
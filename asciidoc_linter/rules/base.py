@@ -4,9 +4,27 @@ Base functionality and registry for AsciiDoc linting rules.
 This module provides the core classes and functionality for the rule system.
 """
 
-from typing import Type, Dict, List, Optional, Any
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 from enum import Enum
-from dataclasses import dataclass
+from sys import intern
+
+from ..line_table import LineInfo, LineTable, get_line_content  # noqa: F401
+
+# Parts of a document the findings of a rule may depend on, see Rule.scope
+BLOCK_SCOPE = "block"
+HEADINGS_SCOPE = "headings"
+DOCUMENT_SCOPE = "document"
 
 
 class Severity(str, Enum):
@@ -28,17 +46,47 @@ class Severity(str, Enum):
         Enhanced equality check that handles string comparison.
         Allows comparison with strings in a case-insensitive way.
         """
+        if other is self:
+            return True
         if isinstance(other, str):
-            return self.value.lower() == other.lower()
+            # Values are lowercase, exact matches need no lowercasing
+            return self.value == other or self.value == other.lower()
         return super().__eq__(other)
 
 
-@dataclass
+def to_severity(value: Any) -> Severity:
+    """Convert a severity name to a Severity, unknown names become warnings"""
+    if isinstance(value, str) and not isinstance(value, Severity):
+        try:
+            return Severity(value.lower())
+        except ValueError:
+            return Severity.WARNING  # Default to warning if invalid
+    return value
+
+
 class Position:
-    """Represents a position in a text file"""
+    """
+    Represents a position in a text file. Positions and findings have slots
+    instead of a __dict__, as runs over large trees hold millions of them.
+    """
+
+    __slots__ = ("line", "column")
 
-    line: int
-    column: Optional[int] = None
+    def __init__(self, line: int, column: Optional[int] = None):
+        self.line = line
+        self.column = column
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.line == other.line and self.column == other.column
+
+    __hash__ = None  # Mutable, compared by value
+
+    def __repr__(self) -> str:
+        return f"Position(line={self.line!r}, column={self.column!r})"
 
     def __str__(self) -> str:
         if self.column is not None:
@@ -46,16 +94,55 @@ class Position:
         return f"line {self.line}"
 
 
-@dataclass
 class Finding:
     """Represents a rule violation finding"""
 
-    message: str
-    severity: Severity
-    position: Optional[Position] = None
-    rule_id: Optional[str] = None
-    context: Optional[Any] = None
-    file: Optional[str] = None
+    __slots__ = ("message", "severity", "position", "rule_id", "context", "file")
+
+    def __init__(
+        self,
+        message: str,
+        severity: Severity,
+        position: Optional[Position] = None,
+        rule_id: Optional[str] = None,
+        context: Optional[Any] = None,
+        file: Optional[str] = None,
+    ):
+        self.message = message
+        # Rules hold a Severity already, only names need converting
+        self.severity = (
+            severity if type(severity) is Severity else to_severity(severity)
+        )
+        self.position = position
+        # Findings unpickled from worker processes would each hold a copy
+        self.rule_id = intern(rule_id) if type(rule_id) is str else rule_id
+        self.context = context
+        self.file = file
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return (
+            self.message,
+            self.severity,
+            self.position,
+            self.rule_id,
+            self.context,
+            self.file,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable, compared by value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self.__slots__, self._fields())
+        )
+        return f"Finding({fields})"
 
     @property
     def line_number(self) -> int:
@@ -88,16 +175,11 @@ class Finding:
         self.file = file
         return self
 
-    def __post_init__(self):
-        """
-        Ensure severity is always a Severity enum instance.
-        Converts string values to enum values if needed.
-        """
-        if isinstance(self.severity, str):
-            try:
-                self.severity = Severity(self.severity.lower())
-            except ValueError:
-                self.severity = Severity.WARNING  # Default to warning if invalid
+    def replace(self, **changes: Any) -> "Finding":
+        """Return a copy of the finding with some attributes changed"""
+        fields = dict(zip(self.__slots__, self._fields()))
+        fields.update(changes)
+        return Finding(**fields)
 
 
 class Rule:
@@ -107,6 +189,11 @@ class Rule:
     name: str = ""  # Should be overridden by subclasses
     description: str = ""  # Should be overridden by subclasses
     severity: Severity = Severity.WARNING  # Default severity
+    version: int = 1  # Increase when the findings of the rule change
+    # The findings of a rule depend on the lines of a single block, on the
+    # section titles only or on the whole document. Incremental linting uses
+    # the scope to decide which rules have to run again after an edit.
+    scope: str = DOCUMENT_SCOPE
 
     def __init__(self):
         """
@@ -126,7 +213,7 @@ class Rule:
         """
         return self.id
 
-    def check(self, content: str) -> List[Finding]:
+    def check(self, content: str) -> Iterable[Finding]:
         """
         Check the content for rule violations.
         Must be implemented by concrete rule classes.
@@ -135,7 +222,8 @@ class Rule:
             content: The content to check
 
         Returns:
-            List of findings
+            The findings, as a list or yielded lazily by a generator; the
+            linter stops a generator when no more findings are needed
         """
         raise NotImplementedError("Rule must implement check method")
 
@@ -210,6 +298,92 @@ class Rule:
         )
 
 
+class LineRule(Rule):
+    """
+    Base class for rules that inspect a document line by line.
+
+    Instead of iterating over the document themselves, line rules register
+    callbacks which the linter invokes while it walks the document once for
+    all line rules:
+
+    * ``start_document`` receives the ``LineTable`` of the document, so rules
+      can look at neighbouring lines and reset their state
+    * ``visit_line`` is called for every line in document order
+    * ``finish_document`` is called after the last line
+
+    Callbacks may return a list of findings, a generator yielding them or
+    ``None``.
+
+    Rules declare in ``window`` how many lines before and after the visited
+    line they look at through the lines given to ``start_document``. Only
+    rules with a window can lint documents streamed line by line (see
+    stream.py); None means that a rule may look at any line.
+    """
+
+    enabled: bool = True
+    window: Optional[Tuple[int, int]] = None
+
+    def start_document(self, lines: LineTable) -> None:
+        """Prepare the rule for a new document."""
+
+    def visit_line(self, line: LineInfo) -> Optional[Iterable[Finding]]:
+        """Check a single line. Override this method in concrete rules."""
+        return None
+
+    def finish_document(self) -> Optional[Iterable[Finding]]:
+        """Report findings that can only be determined after the last line."""
+        return None
+
+    def check(self, document: Sequence[Union[str, Any]]) -> List[Finding]:
+        """Check the entire document by running the line callbacks."""
+        return run_line_rules([self], LineTable(document))[0]
+
+
+def walk_line_rules(
+    rules: Sequence[LineRule], lines: LineTable
+) -> Iterator[Tuple[int, Finding]]:
+    """
+    Walk the document once and feed every line to all given line rules.
+
+    Yields the findings together with the index of their rule in ``rules``
+    as soon as a callback returns them, so the walk only continues as far as
+    the findings are consumed. Disabled rules are skipped.
+    """
+    callbacks = []
+    for index, rule in enumerate(rules):
+        if rule.enabled:
+            rule.start_document(lines)
+            callbacks.append((index, rule.visit_line))
+
+    if callbacks:
+        for line in lines:
+            for index, visit in callbacks:
+                line_findings = visit(line)
+                if line_findings:
+                    for finding in line_findings:
+                        yield index, finding
+
+    for index, rule in enumerate(rules):
+        if rule.enabled:
+            final_findings = rule.finish_document()
+            if final_findings:
+                for finding in final_findings:
+                    yield index, finding
+
+
+def run_line_rules(rules: Sequence[LineRule], lines: LineTable) -> List[List[Finding]]:
+    """
+    Walk the document once and feed every line to all given line rules.
+
+    Returns one list of findings per rule, in the order of ``rules``. Disabled
+    rules are skipped and produce an empty list.
+    """
+    results: List[List[Finding]] = [[] for _ in rules]
+    for index, finding in walk_line_rules(rules, lines):
+        results[index].append(finding)
+    return results
+
+
 class RuleRegistry:
     """Registry for all available rules"""
 
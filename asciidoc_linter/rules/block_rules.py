@@ -1,162 +1,172 @@
 # block_rules.py - Rules for checking AsciiDoc blocks
 
-from typing import List, Dict, Any, Union
-from .base import Rule, Finding, Severity, Position
+from typing import List, Dict, Any, Optional, Union
+from .base import BLOCK_SCOPE, LineRule, LineInfo, Finding, Severity, Position
+from ..blocks import DelimitedBlock
+from ..line_table import LineKind, LineTable
+from ..parser import Document
 
 
-class UnterminatedBlockRule(Rule):
-    """Rule to check for unterminated blocks in AsciiDoc files."""
+class DelimitedBlockRule(LineRule):
+    """
+    Base class for rules that check delimited blocks.
+
+    The rules use the block map of the line table, which matches the block
+    delimiters of a document once for all rules, and check a block when its
+    opening or closing delimiter line is visited.
+    """
+
+    scope = BLOCK_SCOPE
 
     def __init__(self):
         super().__init__()
-        self.id = "BLOCK001"
-        self.block_markers = {
-            "----": "listing block",
-            "====": "example block",
-            "****": "sidebar block",
-            "....": "literal block",
-            "____": "quote block",
-            "|===": "table block",
-            "////": "comment block",
-            "++++": "passthrough block",
-        }
-        self.open_blocks = {}
-
-    @property
-    def description(self) -> str:
-        return "Checks for blocks that are not properly terminated"
+        self.lines: Optional[LineTable] = None
+        self._document = None
+        self._document_length = 0
+
+    def start_document(self, lines: LineTable) -> None:
+        """Remember the document lines."""
+        self.lines = lines
+
+    def finish_document(self) -> None:
+        """Don't keep the document alive after the walk."""
+        self.lines = None
+
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        block = line.block
+        if block is None:
+            return None
+        if block.start == line.index:
+            return self.check_opening(block, line)
+        if block.end == line.index:
+            return self.check_closing(block, line)
+        return None
+
+    def check_opening(
+        self, block: DelimitedBlock, line: LineInfo
+    ) -> Optional[List[Finding]]:
+        """Check a block at its opening delimiter line."""
+        return None
+
+    def check_closing(
+        self, block: DelimitedBlock, line: LineInfo
+    ) -> Optional[List[Finding]]:
+        """Check a block at its closing delimiter line."""
+        return None
 
     def check_line(
         self, line: str, line_num: int, document: List[str]
     ) -> List[Finding]:
-        findings = []
-        stripped_line = line.strip()
-
-        if stripped_line in self.block_markers:
-            if stripped_line in self.open_blocks:
-                # This is a closing delimiter
-                del self.open_blocks[stripped_line]
-            else:
-                # This is an opening delimiter
-                self.open_blocks[stripped_line] = line_num
-
-                # Look ahead for matching end delimiter
-                is_terminated = False
-                for i, next_line in enumerate(
-                    document[line_num + 1 :], start=line_num + 1
-                ):
-                    if next_line.strip() == stripped_line:
-                        is_terminated = True
-                        break
-
-                if not is_terminated:
-                    findings.append(
-                        Finding(
-                            rule_id=self.id,
-                            position=Position(line=line_num + 1),
-                            message=f"Unterminated {self.block_markers[stripped_line]} starting",
-                            severity=Severity.ERROR,
-                            context=line,
-                        )
-                    )
-
-        return findings
-
-    def check(self, document: Union[Dict[str, Any], List[Any]]) -> List[Finding]:
-        findings = []
-        self.open_blocks = {}  # Reset open blocks
-
+        # The line table is built once for all lines of the same document
+        if document is not self._document or len(document) != self._document_length:
+            self.start_document(LineTable(document))
+            self._document = document
+            self._document_length = len(document)
+        return list(self.visit_line(self.lines[line_num]) or [])
+
+    def check(
+        self, document: Union[Dict[str, Any], List[Any], Document]
+    ) -> List[Finding]:
         # Convert document to lines if it's not already
         if isinstance(document, dict):
             lines = document.get("content", "").splitlines()
         elif isinstance(document, str):
             lines = document.splitlines()
+        elif isinstance(document, Document):
+            # The parsed document is the list of its headers
+            lines = document.lines
         else:
             lines = document
+        return super().check(lines)
 
-        for line_num, line in enumerate(lines):
-            if isinstance(line, str):
-                findings.extend(self.check_line(line, line_num, lines))
 
-        return findings
+class UnterminatedBlockRule(DelimitedBlockRule):
+    """Rule to check for unterminated blocks in AsciiDoc files."""
 
+    def __init__(self):
+        super().__init__()
+        self.id = "BLOCK001"
 
-class BlockSpacingRule(Rule):
-    """Rule to check for proper spacing around blocks."""
+    @property
+    def description(self) -> str:
+        return "Checks for blocks that are not properly terminated"
+
+    def check_opening(
+        self, block: DelimitedBlock, line: LineInfo
+    ) -> Optional[List[Finding]]:
+        if block.terminated:
+            return None
+        return [
+            Finding(
+                rule_id=self.id,
+                position=Position(line=block.start + 1),
+                message=f"Unterminated {block.name} starting",
+                severity=Severity.ERROR,
+                context=line.text,
+            )
+        ]
+
+
+class BlockSpacingRule(DelimitedBlockRule):
+    """
+    Rule to check for proper spacing around blocks.
+
+    Block attribute lines ([source,python]) and block titles (.Title) directly
+    above a block belong to the block, so the blank line is expected above
+    them. A list continuation (+) attaches a block to a list item and needs no
+    blank line either.
+    """
+
+    BLOCK_PREFIX_KINDS = (LineKind.BLOCK_ATTRIBUTES, LineKind.BLOCK_TITLE)
 
     def __init__(self):
         super().__init__()
         self.id = "BLOCK002"
-        self.block_markers = {
-            "----",
-            "====",
-            "****",
-            "....",
-            "____",
-            "|===",
-            "////",
-            "++++",
-        }
-        self.open_blocks = {}
 
     @property
     def description(self) -> str:
         return "Checks for proper blank lines around blocks"
 
-    def check_line(
-        self, line: str, line_num: int, document: List[str]
-    ) -> List[Finding]:
-        findings = []
-        stripped_line = line.strip()
-
-        if stripped_line in self.block_markers:
-            if stripped_line in self.open_blocks:
-                # This is a closing delimiter
-                if line_num + 1 < len(document):
-                    next_line = document[line_num + 1].strip()
-                    if next_line and not next_line.startswith("="):
-                        findings.append(
-                            Finding(
-                                rule_id=self.id,
-                                position=Position(line=line_num + 2),
-                                message="Block should be followed by a blank line",
-                                severity=Severity.WARNING,
-                                context=document[line_num + 1],
-                            )
-                        )
-                del self.open_blocks[stripped_line]
-            else:
-                # This is an opening delimiter
-                if line_num > 0:
-                    prev_line = document[line_num - 1].strip()
-                    if prev_line and not prev_line.startswith("="):
-                        findings.append(
-                            Finding(
-                                rule_id=self.id,
-                                position=Position(line=line_num + 1),
-                                message="Block should be preceded by a blank line",
-                                severity=Severity.WARNING,
-                                context=line,
-                            )
-                        )
-                self.open_blocks[stripped_line] = line_num
-
-        return findings
-
-    def check(self, document: Union[Dict[str, Any], List[Any]]) -> List[Finding]:
-        findings = []
-        self.open_blocks = {}  # Reset open blocks
-
-        # Convert document to lines if it's not already
-        if isinstance(document, dict):
-            lines = document.get("content", "").splitlines()
-        elif isinstance(document, str):
-            lines = document.splitlines()
-        else:
-            lines = document
-
-        for line_num, line in enumerate(lines):
-            if isinstance(line, str):
-                findings.extend(self.check_line(line, line_num, lines))
-
-        return findings
+    def _separates(self, index: int) -> bool:
+        """Check whether a line may be next to a block without a blank line."""
+        lines = self.lines
+        return (
+            lines.is_blank(index)
+            or lines.startswith(index, "=")
+            or lines.texts[index].strip() == "+"
+        )
+
+    def check_opening(
+        self, block: DelimitedBlock, line: LineInfo
+    ) -> Optional[List[Finding]]:
+        previous = block.start - 1
+        kinds = self.lines.kinds
+        while previous >= 0 and kinds[previous] in self.BLOCK_PREFIX_KINDS:
+            previous -= 1
+        if previous < 0 or self._separates(previous):
+            return None
+        return [
+            Finding(
+                rule_id=self.id,
+                position=Position(line=block.start + 1),
+                message="Block should be preceded by a blank line",
+                severity=Severity.WARNING,
+                context=line.text,
+            )
+        ]
+
+    def check_closing(
+        self, block: DelimitedBlock, line: LineInfo
+    ) -> Optional[List[Finding]]:
+        following = block.end + 1
+        if following >= len(self.lines) or self._separates(following):
+            return None
+        return [
+            Finding(
+                rule_id=self.id,
+                position=Position(line=following + 1),
+                message="Block should be followed by a blank line",
+                severity=Severity.WARNING,
+                context=self.lines.texts[following],
+            )
+        ]
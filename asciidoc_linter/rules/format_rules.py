@@ -6,11 +6,13 @@ accidentally use Markdown syntax instead of AsciiDoc.
 """
 
 import re
-from typing import List, Union
-from .base import Rule, Finding, Severity, Position
+from typing import List, Optional
+from .base import BLOCK_SCOPE, LineRule, LineInfo, Finding, Severity, Position
+from ..blocks import RAW_BLOCK_TYPES
+from ..line_table import LineKind
 
 
-class MarkdownSyntaxRule(Rule):
+class MarkdownSyntaxRule(LineRule):
     """
     FMT004: Detect Markdown-style syntax in AsciiDoc files.
 
@@ -31,6 +33,8 @@ class MarkdownSyntaxRule(Rule):
         "Detects Markdown syntax in AsciiDoc files and suggests AsciiDoc alternatives"
     )
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
+    window = (0, 0)
 
     # Regex patterns for Markdown syntax
     # Markdown heading: # Heading (1-6 hash symbols followed by space and text)
@@ -48,67 +52,26 @@ class MarkdownSyntaxRule(Rule):
     # Markdown blockquote: > text (at start of line)
     MARKDOWN_BLOCKQUOTE_PATTERN = re.compile(r"^(>+)\s+(.+)$")
 
-    # AsciiDoc block delimiters that indicate code/literal blocks
-    ASCIIDOC_CODE_BLOCK_DELIMITERS = {"----", "....", "++++"}
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        """Check a line for Markdown syntax, skipping code blocks."""
+        # Skip code, literal, passthrough and comment blocks
+        if line.in_block(RAW_BLOCK_TYPES):
+            return None
 
-    def __init__(self):
-        super().__init__()
-        self.enabled = True
+        return self._check_line(line)
 
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for Markdown syntax."""
-        if not self.enabled:
-            return []
-
-        findings = []
-        in_code_block = False
-        current_delimiter = None
-
-        for line_number, line in enumerate(document):
-            line_content = self._get_line_content(line)
-            stripped = line_content.strip()
-
-            # Check for code block delimiters
-            if stripped in self.ASCIIDOC_CODE_BLOCK_DELIMITERS:
-                if not in_code_block:
-                    in_code_block = True
-                    current_delimiter = stripped
-                elif stripped == current_delimiter:
-                    in_code_block = False
-                    current_delimiter = None
-                continue
-
-            # Skip content inside code blocks
-            if in_code_block:
-                continue
-
-            findings.extend(self._check_line(line_content, line_number))
-        return findings
-
-    def _get_line_content(self, line: Union[str, object]) -> str:
-        """Extract the content from a line object or return the line if it's a string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
-
-    def _check_line(self, line: str, line_number: int) -> List[Finding]:
+    def _check_line(self, line_info: LineInfo) -> List[Finding]:
         """Check a single line for Markdown syntax patterns."""
         findings = []
+        line = line_info.text
+        line_number = line_info.index
 
-        # Skip empty lines
-        if not line.strip():
-            return findings
-
-        # Skip AsciiDoc comments
-        if line.strip().startswith("//"):
+        # Skip empty lines, AsciiDoc comments and block delimiters
+        if line_info.kind in (LineKind.BLANK, LineKind.COMMENT, LineKind.DELIMITER):
             return findings
 
         # Skip AsciiDoc attributes (lines starting with :)
-        if line.strip().startswith(":"):
-            return findings
-
-        # Skip AsciiDoc block delimiters
-        if line.strip() in ("----", "====", "****", "....", "____", "----"):
+        if line_info.first_char == ":":
             return findings
 
         # Check for Markdown headings
@@ -121,7 +84,7 @@ class MarkdownSyntaxRule(Rule):
         findings.extend(self._check_markdown_link(line, line_number))
 
         # Check for Markdown code fences
-        findings.extend(self._check_markdown_code_fence(line, line_number))
+        findings.extend(self._check_markdown_code_fence(line_info))
 
         # Check for Markdown blockquotes
         findings.extend(self._check_markdown_blockquote(line, line_number))
@@ -213,10 +176,14 @@ class MarkdownSyntaxRule(Rule):
 
         return findings
 
-    def _check_markdown_code_fence(self, line: str, line_number: int) -> List[Finding]:
+    def _check_markdown_code_fence(self, line_info: LineInfo) -> List[Finding]:
         """Check for Markdown-style code fences."""
         findings = []
-        match = self.MARKDOWN_CODE_FENCE_PATTERN.match(line.strip())
+        line = line_info.text
+        line_number = line_info.index
+        if line_info.first_char != "`":
+            return findings
+        match = self.MARKDOWN_CODE_FENCE_PATTERN.match(line_info.stripped)
 
         if match:
             language = match.group(1)
@@ -262,7 +229,7 @@ class MarkdownSyntaxRule(Rule):
         return findings
 
 
-class ExplicitNumberedListRule(Rule):
+class ExplicitNumberedListRule(LineRule):
     """
     FMT001: Detect explicit numbered lists in AsciiDoc files.
 
@@ -282,64 +249,28 @@ class ExplicitNumberedListRule(Rule):
         "using AsciiDoc dot-syntax (.) instead"
     )
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
+    window = (0, 0)
 
     # Regex pattern for explicit numbered list: starts with number, dot, space
     EXPLICIT_NUMBERED_LIST_PATTERN = re.compile(r"^(\d+)\.\s+(.+)$")
 
-    # AsciiDoc block delimiters that indicate code/literal blocks
-    ASCIIDOC_CODE_BLOCK_DELIMITERS = {"----", "....", "++++"}
-
-    def __init__(self):
-        super().__init__()
-        self.enabled = True
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        """Check a line for explicit numbered lists, skipping code blocks."""
+        # Skip code, literal, passthrough and comment blocks
+        if line.in_block(RAW_BLOCK_TYPES):
+            return None
 
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for explicit numbered lists."""
-        if not self.enabled:
-            return []
+        return self._check_line(line)
 
-        findings = []
-        in_code_block = False
-        current_delimiter = None
-
-        for line_number, line in enumerate(document):
-            line_content = self._get_line_content(line)
-            stripped = line_content.strip()
-
-            # Check for code block delimiters
-            if stripped in self.ASCIIDOC_CODE_BLOCK_DELIMITERS:
-                if not in_code_block:
-                    in_code_block = True
-                    current_delimiter = stripped
-                elif stripped == current_delimiter:
-                    in_code_block = False
-                    current_delimiter = None
-                continue
-
-            # Skip content inside code blocks
-            if in_code_block:
-                continue
-
-            findings.extend(self._check_line(line_content, line_number))
-
-        return findings
-
-    def _get_line_content(self, line: Union[str, object]) -> str:
-        """Extract the content from a line object or return the line if it's a string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
-
-    def _check_line(self, line: str, line_number: int) -> List[Finding]:
+    def _check_line(self, line_info: LineInfo) -> List[Finding]:
         """Check a single line for explicit numbered list pattern."""
         findings = []
+        line = line_info.text
+        line_number = line_info.index
 
-        # Skip empty lines
-        if not line.strip():
-            return findings
-
-        # Skip AsciiDoc comments
-        if line.strip().startswith("//"):
+        # Skip empty lines and AsciiDoc comments
+        if line_info.kind in (LineKind.BLANK, LineKind.COMMENT):
             return findings
 
         match = self.EXPLICIT_NUMBERED_LIST_PATTERN.match(line)
@@ -362,7 +293,7 @@ class ExplicitNumberedListRule(Rule):
         return findings
 
 
-class NonSemanticDefinitionListRule(Rule):
+class NonSemanticDefinitionListRule(LineRule):
     """
     FMT002: Detect non-semantic definition list patterns in AsciiDoc files.
 
@@ -383,6 +314,8 @@ class NonSemanticDefinitionListRule(Rule):
         "using AsciiDoc 'Term:: Definition' syntax"
     )
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
+    window = (0, 0)
 
     # Regex patterns for non-semantic definition lists
     # Pattern 1: *Term*: at start of line (single asterisk)
@@ -397,68 +330,30 @@ class NonSemanticDefinitionListRule(Rule):
     # Pattern 4: * *Term*: (asterisk list item with bold term)
     ASTERISK_LIST_BOLD_PATTERN = re.compile(r"^\*\s+\*([^*]+)\*:\s+")
 
-    # AsciiDoc block delimiters that indicate code/literal blocks
-    ASCIIDOC_CODE_BLOCK_DELIMITERS = {"----", "....", "++++"}
-
-    def __init__(self):
-        super().__init__()
-        self.enabled = True
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        """Check a line for non-semantic definition list patterns, skipping code blocks."""
+        # Skip code, literal, passthrough and comment blocks
+        if line.in_block(RAW_BLOCK_TYPES):
+            return None
 
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for non-semantic definition list patterns."""
-        if not self.enabled:
-            return []
+        return self._check_line(line)
 
-        findings = []
-        in_code_block = False
-        current_delimiter = None
-
-        for line_number, line in enumerate(document):
-            line_content = self._get_line_content(line)
-            stripped = line_content.strip()
-
-            # Check for code block delimiters
-            if stripped in self.ASCIIDOC_CODE_BLOCK_DELIMITERS:
-                if not in_code_block:
-                    in_code_block = True
-                    current_delimiter = stripped
-                elif stripped == current_delimiter:
-                    in_code_block = False
-                    current_delimiter = None
-                continue
-
-            # Skip content inside code blocks
-            if in_code_block:
-                continue
-
-            findings.extend(self._check_line(line_content, line_number))
-
-        return findings
-
-    def _get_line_content(self, line: Union[str, object]) -> str:
-        """Extract the content from a line object or return the line if it's a string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
-
-    def _check_line(self, line: str, line_number: int) -> List[Finding]:
+    def _check_line(self, line_info: LineInfo) -> List[Finding]:
         """Check a single line for non-semantic definition list patterns."""
         findings = []
+        line = line_info.text
+        line_number = line_info.index
 
-        # Skip empty lines
-        if not line.strip():
-            return findings
-
-        # Skip AsciiDoc comments
-        if line.strip().startswith("//"):
+        # Skip empty lines and AsciiDoc comments
+        if line_info.kind in (LineKind.BLANK, LineKind.COMMENT):
             return findings
 
         # Skip AsciiDoc attributes (lines starting with :)
-        if line.strip().startswith(":"):
+        if line_info.first_char == ":":
             return findings
 
         # Skip proper AsciiDoc definition lists (Term::)
-        if "::" in line and not line.strip().startswith("*"):
+        if "::" in line and line_info.first_char != "*":
             return findings
 
         # Check for single bold term pattern: *Term*:
@@ -505,7 +400,7 @@ class NonSemanticDefinitionListRule(Rule):
         )
 
 
-class CounterInTitleRule(Rule):
+class CounterInTitleRule(LineRule):
     """
     FMT003: Detect counter syntax in section titles.
 
@@ -525,65 +420,29 @@ class CounterInTitleRule(Rule):
         "reviewing if counters are really needed"
     )
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
+    window = (0, 0)
 
     # Regex pattern for counter in section title
     # Matches lines starting with = followed by {counter:name} or {counter2:name}
     COUNTER_IN_TITLE_PATTERN = re.compile(r"^(=+)\s+.*\{counter2?:([^}]+)\}")
 
-    # AsciiDoc block delimiters that indicate code/literal blocks
-    ASCIIDOC_CODE_BLOCK_DELIMITERS = {"----", "....", "++++"}
-
-    def __init__(self):
-        super().__init__()
-        self.enabled = True
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        """Check a line for counter syntax in section titles, skipping code blocks."""
+        # Skip code, literal, passthrough and comment blocks
+        if line.in_block(RAW_BLOCK_TYPES):
+            return None
 
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for counter syntax in section titles."""
-        if not self.enabled:
-            return []
+        return self._check_line(line)
 
-        findings = []
-        in_code_block = False
-        current_delimiter = None
-
-        for line_number, line in enumerate(document):
-            line_content = self._get_line_content(line)
-            stripped = line_content.strip()
-
-            # Check for code block delimiters
-            if stripped in self.ASCIIDOC_CODE_BLOCK_DELIMITERS:
-                if not in_code_block:
-                    in_code_block = True
-                    current_delimiter = stripped
-                elif stripped == current_delimiter:
-                    in_code_block = False
-                    current_delimiter = None
-                continue
-
-            # Skip content inside code blocks
-            if in_code_block:
-                continue
-
-            findings.extend(self._check_line(line_content, line_number))
-
-        return findings
-
-    def _get_line_content(self, line: Union[str, object]) -> str:
-        """Extract the content from a line object or return the line if it's a string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
-
-    def _check_line(self, line: str, line_number: int) -> List[Finding]:
+    def _check_line(self, line_info: LineInfo) -> List[Finding]:
         """Check a single line for counter syntax in section title."""
         findings = []
-
-        # Skip empty lines
-        if not line.strip():
-            return findings
+        line = line_info.text
+        line_number = line_info.index
 
         # Only check lines that start with = (section titles)
-        if not line.strip().startswith("="):
+        if line_info.first_char != "=":
             return findings
 
         match = self.COUNTER_IN_TITLE_PATTERN.match(line)
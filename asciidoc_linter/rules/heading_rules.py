@@ -4,7 +4,7 @@ This module contains rules for checking AsciiDoc heading structure and format.
 """
 
 from typing import List, Optional, Tuple, Dict, Any, Union
-from .base import Rule, Finding, Severity, Position
+from .base import BLOCK_SCOPE, HEADINGS_SCOPE, Rule, Finding, Severity, Position
 import re
 
 
@@ -16,6 +16,8 @@ class HeadingFormatRule(Rule):
     - Proper capitalization
     """
 
+    scope = BLOCK_SCOPE
+
     def __init__(self):
         super().__init__()
         self.id = "HEAD002"
@@ -86,6 +88,8 @@ class HeadingHierarchyRule(Rule):
     Ensures that heading levels are not skipped (e.g., h1 -> h3).
     """
 
+    scope = HEADINGS_SCOPE
+
     def __init__(self):
         super().__init__()
         self.id = "HEAD001"
@@ -144,6 +148,8 @@ class MultipleTopLevelHeadingsRule(Rule):
     Ensures that a document has only one top-level (=) heading.
     """
 
+    scope = HEADINGS_SCOPE
+
     def __init__(self):
         super().__init__()
         self.id = "HEAD003"
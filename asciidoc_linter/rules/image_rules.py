@@ -3,7 +3,7 @@
 import os
 import re
 from typing import List, Dict, Any, Union
-from .base import Rule, Finding, Severity, Position
+from .base import BLOCK_SCOPE, Rule, Finding, Severity, Position
 
 
 class ImageAttributesRule(Rule):
@@ -13,6 +13,7 @@ class ImageAttributesRule(Rule):
     name = "Image Attributes Check"
     description = "Checks for proper image attributes and file references"
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
 
     def __init__(self):
         super().__init__()
@@ -6,11 +6,13 @@ accidentally use Markdown table syntax instead of AsciiDoc tables.
 """
 
 import re
-from typing import List, Union
-from .base import Rule, Finding, Severity, Position
+from typing import List, Optional
+from .base import BLOCK_SCOPE, LineRule, LineInfo, Finding, Severity, Position
+from ..blocks import RAW_BLOCK_TYPES
+from ..line_table import LineTable
 
 
-class MarkdownTableRule(Rule):
+class MarkdownTableRule(LineRule):
     """
     FMT005: Detect Markdown table syntax in AsciiDoc files.
 
@@ -30,6 +32,8 @@ class MarkdownTableRule(Rule):
         "AsciiDoc table syntax (|===) instead"
     )
     severity = Severity.ERROR
+    scope = BLOCK_SCOPE
+    window = (0, 0)
 
     # Markdown table separator: |---| with optional colons for alignment
     SEPARATOR_PATTERN = re.compile(r"^\s*\|[\s:]*-{2,}[\s:]*[-|\s:]*$")
@@ -37,122 +41,72 @@ class MarkdownTableRule(Rule):
     # Markdown table row: starts and ends with | (with content between)
     TABLE_ROW_PATTERN = re.compile(r"^\s*\|.+\|\s*$")
 
-    # AsciiDoc table delimiter
-    ASCIIDOC_TABLE_DELIMITER = re.compile(r"^\s*\|===\s*$")
-
-    # AsciiDoc block delimiters that indicate code/literal blocks
-    ASCIIDOC_CODE_BLOCK_DELIMITERS = {"----", "....", "++++"}
+    # Blocks whose content is not checked for Markdown tables
+    SKIPPED_BLOCK_TYPES = RAW_BLOCK_TYPES | {"table"}
 
     def __init__(self):
         super().__init__()
-        self.enabled = True
-
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for Markdown table syntax."""
-        if not self.enabled:
-            return []
-
-        lines, skip_lines = self._preprocess(document)
-        return self._find_markdown_tables(lines, skip_lines)
-
-    def _preprocess(self, document):
-        """Extract lines and determine which to skip (code blocks, tables)."""
-        lines = []
-        in_code_block = False
-        current_delimiter = None
-        in_asciidoc_table = False
-        skip_lines = set()
-
-        for i, line in enumerate(document):
-            line_content = self._get_line_content(line)
-            lines.append(line_content)
-            stripped = line_content.strip()
-
-            if stripped in self.ASCIIDOC_CODE_BLOCK_DELIMITERS:
-                if not in_code_block:
-                    in_code_block = True
-                    current_delimiter = stripped
-                elif stripped == current_delimiter:
-                    in_code_block = False
-                    current_delimiter = None
-                skip_lines.add(i)
-                continue
-
-            if in_code_block:
-                skip_lines.add(i)
-                continue
-
-            if self.ASCIIDOC_TABLE_DELIMITER.match(line_content):
-                in_asciidoc_table = not in_asciidoc_table
-                skip_lines.add(i)
-                continue
-
-            if in_asciidoc_table:
-                skip_lines.add(i)
-
-        return lines, skip_lines
-
-    def _find_markdown_tables(self, lines, skip_lines):
-        """Find separator lines and expand to adjacent table rows."""
-        findings = []
-        flagged_lines = set()
-
-        for i, line_content in enumerate(lines):
-            if i in skip_lines:
-                continue
-            if self.SEPARATOR_PATTERN.match(line_content):
-                flagged_lines.add(i)
-                findings.append(
-                    Finding(
-                        rule_id=self.id,
-                        position=Position(line=i + 1),
-                        message=(
-                            "Markdown table separator detected. "
-                            "Use AsciiDoc table syntax (|===) instead"
-                        ),
-                        severity=self.severity,
-                        context=line_content,
-                    )
-                )
-
-                # Expand upward to find adjacent table rows
-                j = i - 1
-                while j >= 0 and j not in skip_lines:
-                    if self.TABLE_ROW_PATTERN.match(lines[j]):
-                        flagged_lines.add(j)
-                    else:
-                        break
-                    j -= 1
-
-                # Expand downward to find adjacent table rows
-                j = i + 1
-                while j < len(lines) and j not in skip_lines:
-                    if self.TABLE_ROW_PATTERN.match(lines[j]):
-                        flagged_lines.add(j)
-                    else:
-                        break
-                    j += 1
-
-        # Add findings for adjacent data rows
-        for i in sorted(flagged_lines):
-            if not self.SEPARATOR_PATTERN.match(lines[i]):
-                findings.append(
-                    Finding(
-                        rule_id=self.id,
-                        position=Position(line=i + 1),
-                        message=(
-                            "Markdown table row detected. "
-                            "Use AsciiDoc table syntax (|===) instead"
-                        ),
-                        severity=self.severity,
-                        context=lines[i],
-                    )
+        # Consecutive table rows not yet known to be part of a table
+        self.pending_rows: List[LineInfo] = []
+        # Whether the rows following the current line belong to a table
+        self.in_table = False
+
+    def start_document(self, lines: LineTable) -> None:
+        """Reset the rows seen so far."""
+        self.pending_rows = []
+        self.in_table = False
+
+    def visit_line(self, line: LineInfo) -> Optional[List[Finding]]:
+        """
+        Report separator lines and the table rows adjacent to them. Rows
+        before a separator are kept until the separator is found, so the rule
+        never has to look back in the document.
+        """
+        # Code blocks and tables end the rows, their content is not checked
+        if line.in_block(self.SKIPPED_BLOCK_TYPES):
+            self.pending_rows = []
+            self.in_table = False
+            return None
+
+        if self.SEPARATOR_PATTERN.match(line.text):
+            findings = [
+                self._finding(
+                    line,
+                    "Markdown table separator detected. "
+                    "Use AsciiDoc table syntax (|===) instead",
                 )
-
-        return findings
-
-    def _get_line_content(self, line: Union[str, object]) -> str:
-        """Extract content from a line object or return the string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
+            ]
+            findings.extend(self._row_finding(row) for row in self.pending_rows)
+            self.pending_rows = []
+            self.in_table = True
+            return findings
+
+        if self.TABLE_ROW_PATTERN.match(line.text):
+            if self.in_table:
+                return [self._row_finding(line)]
+            self.pending_rows.append(line)
+            return None
+
+        self.pending_rows = []
+        self.in_table = False
+        return None
+
+    def finish_document(self) -> None:
+        """Forget the rows of the document."""
+        self.pending_rows = []
+        self.in_table = False
+
+    def _row_finding(self, line: LineInfo) -> Finding:
+        return self._finding(
+            line,
+            "Markdown table row detected. Use AsciiDoc table syntax (|===) instead",
+        )
+
+    def _finding(self, line: LineInfo, message: str) -> Finding:
+        return Finding(
+            rule_id=self.id,
+            position=Position(line=line.index + 1),
+            message=message,
+            severity=self.severity,
+            context=line.text,
+        )
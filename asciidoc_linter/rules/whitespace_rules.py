@@ -1,36 +1,53 @@
 # whitespace_rules.py - Rules for checking whitespace in AsciiDoc files
 
-from typing import List, Union
-from .base import Rule, Finding, Severity, Position
-
-
-class WhitespaceRule(Rule):
+from typing import Callable, List, Optional, Union
+from .base import (
+    BLOCK_SCOPE,
+    LineRule,
+    LineInfo,
+    Finding,
+    Severity,
+    Position,
+    get_line_content,
+)
+from ..line_table import LineKind, LineTable
+
+
+class WhitespaceRule(LineRule):
     """Rule to check for proper whitespace usage."""
 
     id = "WS001"
     name = "Whitespace Check"
     description = "Checks for proper whitespace usage"
     severity = Severity.WARNING
+    scope = BLOCK_SCOPE
+    window = (1, 1)  # Lines around section titles and admonitions
+
+    ADMONITION_MARKERS = ("NOTE:", "TIP:", "IMPORTANT:", "WARNING:", "CAUTION:")
 
     def __init__(self):
         super().__init__()
         self.consecutive_empty_lines = 0
-        self.enabled = True
+        self.lines: Optional[LineTable] = None
 
-    def check(self, document: List[Union[str, object]]) -> List[Finding]:
-        """Check the entire document for whitespace issues."""
-        if not self.enabled:
-            return []
-        findings = []
-        for line_number, line in enumerate(document):
-            findings.extend(self.check_line(line, line_number, document))
-        return findings
+    def start_document(self, lines: LineTable) -> None:
+        """Reset the empty line counter and remember the document lines."""
+        self.consecutive_empty_lines = 0
+        self.lines = lines
+
+    def visit_line(self, line: LineInfo) -> List[Finding]:
+        """Check a line using its neighbours from the current document."""
+        return self._check_line(line, self._document_line)
+
+    def _document_line(self, index: int) -> Optional[LineInfo]:
+        """Return a line of the current document, None outside of it."""
+        if 0 <= index < len(self.lines):
+            return self.lines[index]
+        return None
 
     def get_line_content(self, line: Union[str, object]) -> str:
         """Extract the content from a line object or return the line if it's a string."""
-        if hasattr(line, "content"):
-            return line.content
-        return str(line)
+        return get_line_content(line)
 
     def _is_bold_syntax(self, stripped: str) -> bool:
         """Check if a line starting with * is bold syntax rather than a list marker.
@@ -65,11 +82,31 @@ class WhitespaceRule(Rule):
         line_number: int,
         context: List[Union[str, object]],
     ) -> List[Finding]:
+
+        def context_line(index: int) -> Optional[LineInfo]:
+            if 0 <= index < len(context):
+                return LineInfo(index, get_line_content(context[index]))
+            return None
+
+        return self._check_line(
+            LineInfo(line_number, get_line_content(line)), context_line
+        )
+
+    def _check_line(
+        self,
+        line: LineInfo,
+        get_line: Callable[[int], Optional[LineInfo]],
+    ) -> List[Finding]:
+        """
+        Check a classified line. Neighbouring lines are looked up with
+        get_line only when a check needs them.
+        """
         findings = []
-        line_content = self.get_line_content(line)
+        line_content = line.text
+        line_number = line.index
 
         # Check for multiple consecutive empty lines
-        if not line_content.strip():
+        if line.kind == LineKind.BLANK:
             self.consecutive_empty_lines += 1
             if self.consecutive_empty_lines > 2:
                 findings.append(
@@ -85,15 +122,10 @@ class WhitespaceRule(Rule):
             self.consecutive_empty_lines = 0
 
         # Check for proper list marker spacing
-        stripped = line_content.lstrip()
-        if stripped.startswith(("*", "-", ".")):
+        if line.first_char in ("*", "-", "."):
             # Skip block delimiters (----, ****, ....)
-            if stripped.rstrip() in ("----", "****", "....") or (
-                len(stripped) >= 4
-                and stripped.rstrip() == stripped[0] * len(stripped.rstrip())
-            ):
-                pass  # Block delimiter, not a list marker
-            else:
+            if line.kind != LineKind.DELIMITER:
+                stripped = line.lstripped
                 # Count consecutive markers for nested lists (**, ***, etc.)
                 marker = stripped[0]
                 marker_count = 0
@@ -121,7 +153,7 @@ class WhitespaceRule(Rule):
                         )
 
         # Check for trailing whitespace
-        if line_content.rstrip() != line_content:
+        if line.trailing_whitespace:
             findings.append(
                 Finding(
                     rule_id=self.id,
@@ -133,7 +165,7 @@ class WhitespaceRule(Rule):
             )
 
         # Check for tabs
-        if "\t" in line_content:
+        if line.has_tab:
             findings.append(
                 Finding(
                     rule_id=self.id,
@@ -145,7 +177,35 @@ class WhitespaceRule(Rule):
             )
 
         # Check for proper section title spacing
-        if line_content.startswith("="):
+        if line.kind == LineKind.HEADING:
+            # Check for blank line before section title (except for first line)
+            prev_line = get_line(line_number - 1)
+            if prev_line is not None:
+                if not prev_line.is_blank and not prev_line.startswith(("[.", "[[")):
+                    findings.append(
+                        Finding(
+                            rule_id=self.id,
+                            position=Position(line=line_number + 1),
+                            message="Section title should be preceded by a blank line",
+                            severity=self.severity,
+                            context=line_content,
+                        )
+                    )
+
+            # Check for blank line after section title (except for last line)
+            next_line = get_line(line_number + 1)
+            if next_line is not None:
+                if not next_line.is_blank and not next_line.startswith(":"):
+                    findings.append(
+                        Finding(
+                            rule_id=self.id,
+                            position=Position(line=line_number + 1),
+                            message="Section title should be followed by a blank line",
+                            severity=self.severity,
+                            context=line_content,
+                        )
+                    )
+        elif line_content.startswith("=") and line.kind != LineKind.DELIMITER:
             # Count leading = characters
             level = 0
             for char in line_content:
@@ -153,47 +213,10 @@ class WhitespaceRule(Rule):
                     break
                 level += 1
 
-            # Skip block delimiters (====) - they have only = characters
+            # Not a section title and missing space - report error, unless
+            # the line has only = characters
             rest = line_content[level:]
-            is_section_title = rest.startswith(" ") and rest.strip()
-
-            if is_section_title:
-                # Check for blank line before section title (except for first line)
-                if line_number > 0:
-                    prev_content = self.get_line_content(context[line_number - 1])
-                    prev_content_stripped = prev_content.strip()
-                    if prev_content_stripped and not prev_content_stripped.startswith(
-                        ("[.", "[[")
-                    ):
-                        findings.append(
-                            Finding(
-                                rule_id=self.id,
-                                position=Position(line=line_number + 1),
-                                message="Section title should be preceded by a blank line",
-                                severity=self.severity,
-                                context=line_content,
-                            )
-                        )
-
-                # Check for blank line after section title (except for last line)
-                if line_number < len(context) - 1:
-                    next_content = self.get_line_content(context[line_number + 1])
-                    stripped_next_content = next_content.strip()
-                    if stripped_next_content and not stripped_next_content.startswith(
-                        ":"
-                    ):
-                        findings.append(
-                            Finding(
-                                rule_id=self.id,
-                                position=Position(line=line_number + 1),
-                                message="Section title should be followed by a blank line",
-                                severity=self.severity,
-                                context=line_content,
-                            )
-                        )
-            elif len(line_content) > level and line_content[level] != " ":
-                # Not a block delimiter and missing space - report error
-                # But skip if it's a block delimiter (only = characters)
+            if len(line_content) > level and line_content[level] != " ":
                 if rest.strip():  # Has non-whitespace content after =
                     findings.append(
                         Finding(
@@ -206,21 +229,17 @@ class WhitespaceRule(Rule):
                     )
 
         # Check for proper admonition block spacing
-        admonition_markers = ["NOTE:", "TIP:", "IMPORTANT:", "WARNING:", "CAUTION:"]
-        if any(
-            line_content.strip().startswith(marker) for marker in admonition_markers
-        ):
-            if line_number > 0:
-                prev_content = self.get_line_content(context[line_number - 1])
-                if prev_content.strip():
-                    findings.append(
-                        Finding(
-                            rule_id=self.id,
-                            position=Position(line=line_number + 1),
-                            message="Admonition block should be preceded by a blank line",
-                            severity=self.severity,
-                            context=line_content,
-                        )
+        if line.startswith(self.ADMONITION_MARKERS):
+            prev_line = get_line(line_number - 1)
+            if prev_line is not None and not prev_line.is_blank:
+                findings.append(
+                    Finding(
+                        rule_id=self.id,
+                        position=Position(line=line_number + 1),
+                        message="Admonition block should be preceded by a blank line",
+                        severity=self.severity,
+                        context=line_content,
                     )
+                )
 
         return findings
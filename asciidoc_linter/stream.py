@@ -0,0 +1,118 @@
+# stream.py - Linting documents line by line
+"""
+Linting of documents streamed line by line, in memory independent of their
+size.
+
+Every line is classified and its delimited block is tracked as it is read
+(see blocks.BlockTracker). The line rules visit a line once the lines after
+it that they look at have been read. Only a window of lines is kept, as
+large as the largest window declared by the rules (see LineRule.window), and
+findings are yielded as soon as a rule reports them: in line order instead
+of rule order.
+
+Rules checking the parsed document, and line rules without a window, need
+the whole document and are not run on streamed documents.
+"""
+
+from collections import deque
+from typing import Deque, Iterable, Iterator, Sequence, TextIO, Tuple, Union
+
+from .blocks import BlockTracker
+from .line_table import LineInfo, LineKind
+from .rules.base import Finding, LineRule, Rule
+
+
+def can_stream(rule: Rule) -> bool:
+    """Check whether a rule can lint streamed documents"""
+    return isinstance(rule, LineRule) and rule.window is not None
+
+
+def read_lines(file: TextIO) -> Iterator[str]:
+    """Yield the lines of a text file, split like str.splitlines() splits"""
+    for line in file:
+        # Files only break at "\n", which always ends a line, so the lines in
+        # between are split on their own
+        yield from line.splitlines()
+
+
+class LineWindow(Sequence[LineInfo]):
+    """
+    The most recently read lines of a streamed document, given to line rules
+    instead of the line table. Lines are indexed by their 0-based index in
+    the document, and the length is the number of lines read so far.
+    """
+
+    def __init__(self, size: int):
+        self.lines: Deque[LineInfo] = deque(maxlen=size)
+        self.count = 0
+
+    def append(self, line: LineInfo) -> None:
+        self.lines.append(line)
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> LineInfo:
+        if index < 0:
+            index += self.count
+        offset = index - (self.count - len(self.lines))
+        if not 0 <= offset < len(self.lines):
+            raise IndexError(f"line index {index} is outside of the line window")
+        return self.lines[offset]
+
+    def __iter__(self) -> Iterator[LineInfo]:
+        return iter(self.lines)
+
+    def is_blank(self, index: int) -> bool:
+        return self[index].is_blank
+
+    def startswith(self, index: int, prefix: Union[str, Tuple[str, ...]]) -> bool:
+        """Check the content of a line after its indentation for a prefix"""
+        return self[index].startswith(prefix)
+
+
+def run_streaming_rules(
+    rules: Sequence[LineRule], lines: Iterable[str]
+) -> Iterator[Finding]:
+    """
+    Feed the lines of a document to line rules as they are read and yield
+    the findings. All rules need a window; disabled rules are skipped.
+    """
+    rules = [rule for rule in rules if rule.enabled]
+    for rule in rules:
+        if rule.window is None:
+            raise ValueError(f"Rule {rule.id} needs the whole document")
+    before = max((rule.window[0] for rule in rules), default=0)
+    after = max((rule.window[1] for rule in rules), default=0)
+
+    window = LineWindow(before + after + 1)
+    for rule in rules:
+        rule.start_document(window)
+    visitors = [rule.visit_line for rule in rules]
+
+    def visit(line: LineInfo) -> Iterator[Finding]:
+        for visit_line in visitors:
+            findings = visit_line(line)
+            if findings:
+                yield from findings
+
+    tracker = BlockTracker()
+    for index, text in enumerate(lines):
+        line = LineInfo(index, text)
+        # Like the line table, only delimiter lines open or close blocks
+        line.block = tracker.feed(
+            index, text if line.kind == LineKind.DELIMITER else ""
+        )
+        window.append(line)
+        if index >= after:
+            yield from visit(window[index - after])
+
+    # The last lines have no more lines after them
+    for index in range(max(window.count - after, 0), window.count):
+        yield from visit(window[index])
+
+    for rule in rules:
+        findings = rule.finish_document()
+        if findings:
+            yield from findings
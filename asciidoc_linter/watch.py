@@ -0,0 +1,230 @@
+# watch.py - Lint files again when they change
+"""
+Watch mode: lint files again whenever they change.
+
+The watched files are found like for a normal run (see files.py) and polled
+for changes of their modification time and size, together with the files
+they include. Directories are only walked again when the modification time
+of a walked directory or its .gitignore file changed, as adding, removing
+or renaming a file changes the modification time of its directory, or when
+an ignore file of their parents changed. The linter stays loaded between runs. After a change only the
+changed documents and the documents including a changed file are linted
+again, and the findings that appeared or disappeared are reported.
+
+Findings are compared by rule, message and the text of their line, so
+findings on lines that merely moved are neither new nor resolved.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, TextIO, Tuple
+
+from .files import GITIGNORE_FILE, FileFinder, affected_paths, include_targets
+from .linter import AsciiDocLinter
+from .reporter import ConsoleReporter, LintReport
+from .rules.base import Finding
+
+DEFAULT_INTERVAL = 1.0  # seconds between polls
+
+# Modification time and size of a file, None if it does not exist
+FileState = Optional[Tuple[int, int]]
+
+
+def file_state(path: str) -> FileState:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def finding_key(finding: Finding, lines: List[str]) -> Hashable:
+    """Identify a finding independently of the line number it is on"""
+    line = finding.position.line if finding.position else None
+    text = lines[line - 1] if line and line <= len(lines) else None
+    return finding.rule_id, finding.message, text
+
+
+def compare_findings(
+    old: List[Tuple[Hashable, Finding]], new: List[Tuple[Hashable, Finding]]
+) -> Tuple[List[Finding], List[Finding]]:
+    """Return the findings only in new and those only in old, by their keys"""
+    old_counts = Counter(key for key, _ in old)
+    new_counts = Counter(key for key, _ in new)
+    added = []
+    for key, finding in new:
+        if old_counts[key] > 0:
+            old_counts[key] -= 1
+        else:
+            added.append(finding)
+    resolved = []
+    for key, finding in old:
+        if new_counts[key] > 0:
+            new_counts[key] -= 1
+        else:
+            resolved.append(finding)
+    return added, resolved
+
+
+class Watcher:
+    """Lints files and lints them again when they change"""
+
+    def __init__(
+        self,
+        linter: AsciiDocLinter,
+        paths: Iterable[str],
+        reporter: Optional[ConsoleReporter] = None,
+        output: Optional[TextIO] = None,
+    ):
+        self.linter = linter
+        self.paths = list(paths)
+        self.reporter = reporter or ConsoleReporter(enable_color=False)
+        self.output = output or sys.stdout
+        if linter.config_path:
+            linter.load_config(linter.config_path)
+        # Documents and included files with their last seen state
+        self.states: Dict[str, FileState] = {}
+        # Findings of each document with their keys
+        self.findings: Dict[str, List[Tuple[Hashable, Finding]]] = {}
+        # Files included by each document
+        self.includes: Dict[str, Set[str]] = {}
+        self._documents: Optional[List[str]] = None
+        # States of the walked directories and their ignore files
+        self._directories: Dict[str, Tuple[FileState, FileState]] = {}
+        # States of the ignore files of the parents of the walked directories
+        self._ignore_files: Dict[str, FileState] = {}
+
+    def documents(self) -> List[str]:
+        """
+        Find the documents to lint, walks directories only if they or the
+        ignore files applying to them changed. Paths given as files are not
+        checked again, so they stay documents even when they are removed.
+        """
+        if (
+            self._documents is not None
+            and all(
+                (
+                    file_state(directory),
+                    file_state(os.path.join(directory, GITIGNORE_FILE)),
+                )
+                == states
+                for directory, states in self._directories.items()
+            )
+            and all(
+                file_state(path) == state for path, state in self._ignore_files.items()
+            )
+        ):
+            return self._documents
+
+        finder = FileFinder()
+        self._documents = [os.path.normpath(path) for path in finder.find(self.paths)]
+        self._directories = {
+            directory: (
+                (stat.st_mtime_ns, stat.st_size),
+                file_state(os.path.join(directory, GITIGNORE_FILE)),
+            )
+            for directory, stat in finder.directories.items()
+        }
+        self._ignore_files = {path: file_state(path) for path in finder.ignore_files}
+        return self._documents
+
+    def start(self) -> LintReport:
+        """Lint all documents and return the report"""
+        documents = self.documents()
+        for path in documents:
+            self.states[path] = file_state(path)
+            self._lint(path)
+        for targets in self.includes.values():
+            for target in targets:
+                self.states.setdefault(target, file_state(target))
+        return LintReport(
+            [
+                finding
+                for path in documents
+                for _, finding in self.findings.get(path, [])
+            ]
+        )
+
+    def poll(self) -> Tuple[List[Finding], List[Finding]]:
+        """
+        Lint the documents affected by changes since the last poll. Returns
+        the new and the resolved findings.
+        """
+        documents = self.documents()
+        watched = set(documents)
+        for targets in self.includes.values():
+            watched.update(targets)
+        states = {path: file_state(path) for path in watched}
+        changed = {
+            path
+            for path in watched | set(self.states)
+            if states.get(path) != self.states.get(path)
+        }
+        self.states = states
+        if not changed:
+            return [], []
+
+        includers: Dict[str, Set[str]] = {}
+        for path, targets in self.includes.items():
+            for target in targets:
+                includers.setdefault(target, set()).add(path)
+        affected = affected_paths(changed, includers)
+
+        added: List[Finding] = []
+        resolved: List[Finding] = []
+        present = set(documents)
+        for path in sorted(set(self.findings) - present):
+            # Removed or no longer selected
+            resolved.extend(finding for _, finding in self.findings.pop(path))
+            self.includes.pop(path, None)
+        for path in documents:
+            if path in affected:
+                old = self.findings.get(path, [])
+                self._lint(path)
+                new_findings, resolved_findings = compare_findings(
+                    old, self.findings[path]
+                )
+                added.extend(new_findings)
+                resolved.extend(resolved_findings)
+        for targets in self.includes.values():
+            for target in targets:
+                # Newly included files start to be watched
+                self.states.setdefault(target, file_state(target))
+        return added, resolved
+
+    def _lint(self, path: str) -> None:
+        try:
+            with open(path, "rb") as document:
+                data = document.read()
+        except OSError:
+            self.findings[path] = [
+                (finding_key(finding, []), finding)
+                for finding in self.linter.lint_file(path)
+            ]
+            self.includes.pop(path, None)
+            return
+        lines = data.decode("utf-8", "replace").splitlines()
+        self.findings[path] = [
+            (finding_key(finding, lines), finding)
+            for finding in self.linter.lint_data(path, data)
+        ]
+        self.includes[path] = include_targets(path, lines)
+
+    def run(self, interval: float = DEFAULT_INTERVAL) -> int:
+        """Lint and watch until interrupted, returns the exit code"""
+        self.print(self.reporter.format_report(self.start()))
+        self.print("Watching for changes, press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(interval)
+                added, resolved = self.poll()
+                if added or resolved:
+                    self.print(self.reporter.format_changes(added, resolved))
+        except KeyboardInterrupt:
+            return 0
+
+    def print(self, text: str) -> None:
+        self.output.write(text + "\n")
+        self.output.flush()
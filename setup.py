@@ -23,6 +23,9 @@ setup(
     entry_points={
         "console_scripts": [
             "asciidoc-lint=asciidoc_linter.cli:main",
+            "asciidoc-linter-daemon=asciidoc_linter.daemon:main",
+            "asciidoc-linter-client=asciidoc_linter.client:main",
+            "asciidoc-linter-lsp=asciidoc_linter.lsp:main",
         ],
     },
     author="Your Name",
@@ -110,6 +110,45 @@ class TestUnterminatedBlockRule(unittest.TestCase):
             len(findings), 1, "Only the unterminated listing block should be reported"
         )
 
+    def test_nested_and_long_delimiters(self):
+        """
+        Given a document with nested blocks using delimiters of any length
+        When the unterminated block rule is checked
+        Then only the unterminated inner block should be reported
+        """
+        # Given: Nested example blocks and an unterminated listing block
+        content = [
+            "======",
+            "====",
+            "Nested example",
+            "====",
+            "",
+            "------",
+            "code",
+            "======",
+        ]
+
+        # When: We check the whole document
+        findings = self.rule.check(content)
+
+        # Then: The listing block swallows the closing delimiter and is reported
+        self.assertEqual(len(findings), 2)
+        self.assertEqual(findings[0].line_number, 1)
+        self.assertEqual(findings[1].line_number, 6)
+        self.assertIn("listing block", findings[1].message)
+
+    def test_delimiters_inside_listing_block(self):
+        """
+        Given a listing block that contains other delimiters
+        When the unterminated block rule is checked
+        Then no findings should be reported
+        """
+        content = ["----", "====", "****", "----"]
+
+        findings = self.rule.check(content)
+
+        self.assertEqual(len(findings), 0)
+
 
 class TestBlockSpacingRule(unittest.TestCase):
     """Tests for BlockSpacingRule.
@@ -214,6 +253,52 @@ class TestBlockSpacingRule(unittest.TestCase):
             len(findings), 0, "Blocks adjacent to headings should not produce findings"
         )
 
+    def test_block_attributes_and_title_belong_to_block(self):
+        """
+        Given blocks with attribute lines, titles and list continuations
+        When the block spacing rule is checked
+        Then no findings should be reported
+        Because the lines above the delimiter belong to the block
+        """
+        # Given: Attribute and title lines directly above the delimiters
+        content = [
+            "Some text",
+            "",
+            "[[code]]",
+            ".Example",
+            "[source,python]",
+            "----",
+            "print('Hello')",
+            "----",
+            "",
+            "* List item",
+            "+",
+            "----",
+            "attached block",
+            "----",
+            "+",
+            "More text",
+        ]
+
+        # When: We check the whole document
+        findings = self.rule.check(content)
+
+        # Then: No findings should be reported
+        self.assertEqual(findings, [])
+
+    def test_block_attributes_after_text(self):
+        """
+        Given block attributes directly after a paragraph
+        When the block spacing rule is checked
+        Then the block should be reported at its delimiter
+        """
+        content = ["Some text", "[source,python]", "----", "code", "----"]
+
+        findings = self.rule.check(content)
+
+        self.assertEqual([f.line_number for f in findings], [3])
+        self.assertIn("preceded by", findings[0].message)
+
 
 if __name__ == "__main__":
     unittest.main()
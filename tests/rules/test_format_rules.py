@@ -291,6 +291,33 @@ class TestCodeBlockSkipping:
         assert "# " in findings[0].message
         assert "## " in findings[1].message
 
+    def test_skips_markdown_inside_comment_block(self, rule):
+        """Test that Markdown inside //// blocks is not flagged."""
+        content = [
+            "////",
+            "# Not a heading",
+            "> not a quote",
+            "////",
+        ]
+        findings = rule.check(content)
+
+        assert len(findings) == 0
+
+    def test_skips_markdown_inside_long_delimiter_block(self, rule):
+        """Test that delimiters longer than four characters are recognised."""
+        content = [
+            "------",
+            "# comment",
+            "----",
+            "# still code",
+            "------",
+            "# Heading",
+        ]
+        findings = rule.check(content)
+
+        assert len(findings) == 1
+        assert findings[0].position.line == 6
+
 
 class TestIntegration:
     """Integration tests with mixed content."""
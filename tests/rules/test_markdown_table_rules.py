@@ -107,6 +107,18 @@ class TestMarkdownTableRowDetection:
         # Lines 3, 4, 5 (1-indexed)
         assert 4 in line_numbers  # separator at line 4
 
+    def test_all_rows_before_separator(self, markdown_table_rule):
+        """Test that every row of the run before a separator is reported."""
+        content = [
+            "| a | b |",
+            "| A | B |",
+            "|---|---|",
+            "| 1 | 2 |",
+        ]
+        findings = markdown_table_rule.check(content)
+
+        assert sorted(f.position.line for f in findings) == [1, 2, 3, 4]
+
 
 class TestMarkdownTableIgnoresValidAsciiDoc:
     """Tests for ensuring valid AsciiDoc table syntax is not flagged."""
@@ -139,6 +151,21 @@ class TestMarkdownTableIgnoresValidAsciiDoc:
 
         assert len(findings) == 0
 
+    def test_ignores_nested_asciidoc_table(self, markdown_table_rule):
+        """Test that nested !=== tables inside a table are not flagged."""
+        content = [
+            "|===",
+            "a|",
+            "!===",
+            "! a ! b !",
+            "!===",
+            "|---|---|",
+            "|===",
+        ]
+        findings = markdown_table_rule.check(content)
+
+        assert len(findings) == 0
+
     def test_ignores_pipe_in_regular_text(self, markdown_table_rule):
         """Test that pipes in regular text are not flagged."""
         content = [
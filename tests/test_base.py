@@ -3,7 +3,17 @@
 
 import unittest
 from typing import Dict, Any, List
-from asciidoc_linter.rules.base import Severity, Position, Finding, Rule, RuleRegistry
+from asciidoc_linter.rules.base import (
+    Severity,
+    Position,
+    Finding,
+    Rule,
+    RuleRegistry,
+    LineInfo,
+    LineRule,
+    run_line_rules,
+    walk_line_rules,
+)
 
 
 class TestSeverity(unittest.TestCase):
@@ -54,6 +64,12 @@ class TestPosition(unittest.TestCase):
         self.assertEqual(pos1, pos2)
         self.assertNotEqual(pos1, pos3)
 
+        class LinePosition(Position):
+            __slots__ = ()
+
+        self.assertEqual(LinePosition(line=10, column=5), pos1)
+        self.assertNotEqual(pos1, "line 10, column 5")
+
 
 class TestFinding(unittest.TestCase):
     """Test the Finding dataclass"""
@@ -117,6 +133,48 @@ class TestFinding(unittest.TestCase):
         self.assertEqual(finding1, finding2)
         self.assertNotEqual(finding1, finding3)
 
+        class RuleFinding(Finding):
+            __slots__ = ()
+
+        self.assertEqual(finding1, RuleFinding(*finding1._fields()))
+
+    def test_finding_is_compact(self):
+        """Test that findings and positions have no instance dictionary"""
+        finding = Finding("Test message", Severity.ERROR, self.position)
+        self.assertFalse(hasattr(finding, "__dict__"))
+        self.assertFalse(hasattr(self.position, "__dict__"))
+        with self.assertRaises(AttributeError):
+            finding.line = 3
+
+    def test_finding_severity_names(self):
+        """Test that severity names are converted to severities"""
+        self.assertIs(Finding("Test", "ERROR").severity, Severity.ERROR)
+        self.assertIs(Finding("Test", "unknown").severity, Severity.WARNING)
+        self.assertEqual(Severity.INFO, "Info")
+        self.assertNotEqual(Severity.INFO, "error")
+
+    def test_finding_rule_ids_are_interned(self):
+        """Test that findings share one string per rule id"""
+        rule_id = "".join(["TEST", "001"])
+        finding = Finding("Test message", Severity.ERROR, rule_id=rule_id)
+        self.assertIs(
+            finding.rule_id, Finding("Test", Severity.ERROR, None, "TEST001").rule_id
+        )
+
+    def test_finding_replace(self):
+        """Test copying a finding with changed attributes"""
+        finding = Finding("Test", Severity.ERROR, self.position, "TEST001", file="a")
+        moved = finding.replace(position=Position(20))
+        self.assertEqual(moved.position, Position(20))
+        self.assertEqual(moved.to_json_object()["file"], "a")
+        self.assertEqual(finding.position, self.position)
+        self.assertEqual(
+            repr(moved),
+            "Finding(message='Test', severity=<Severity.ERROR: 'error'>, "
+            "position=Position(line=20, column=None), rule_id='TEST001', "
+            "context=None, file='a')",
+        )
+
 
 class TestRule(unittest.TestCase):
     """Test the Rule base class"""
@@ -204,6 +262,77 @@ class TestRule(unittest.TestCase):
             base_rule.check("some content")
 
 
+class TestLineRule(unittest.TestCase):
+    """Test the LineRule base class and the single-pass line walk"""
+
+    class RecordingRule(LineRule):
+        """Line rule that records its callbacks and flags lines with TODO"""
+
+        id = "TEST002"
+
+        def start_document(self, lines):
+            self.calls = ["start"]
+
+        def visit_line(self, line):
+            self.calls.append(line.index)
+            if "TODO" in line.text:
+                return [self.create_finding(line.index + 1, "Found TODO")]
+            return None
+
+        def finish_document(self):
+            self.calls.append("finish")
+            return [self.create_finding(0, "Done")]
+
+    def test_line_info_derived_values(self):
+        """Test that LineInfo computes the shared derived values"""
+        info = LineInfo(3, "  * item  ")
+        self.assertEqual(info.index, 3)
+        self.assertEqual(info.text, "  * item  ")
+        self.assertEqual(info.lstripped, "* item  ")
+        self.assertEqual(info.stripped, "* item")
+        self.assertEqual(info.first_char, "*")
+        self.assertEqual(LineInfo(0, "   ").first_char, "")
+
+    def test_check_runs_callbacks(self):
+        """Test that check drives the callbacks in document order"""
+        rule = self.RecordingRule()
+        findings = rule.check(["first", "TODO second"])
+
+        self.assertEqual(rule.calls, ["start", 0, 1, "finish"])
+        self.assertEqual([f.message for f in findings], ["Found TODO", "Done"])
+        self.assertEqual(findings[0].position.line, 2)
+
+    def test_run_line_rules_keeps_rule_order(self):
+        """Test that all rules see each line and findings stay per rule"""
+        first = self.RecordingRule()
+        second = self.RecordingRule()
+        second.enabled = False
+        third = self.RecordingRule()
+        lines = LineInfo.from_lines(["TODO", "ok"])
+
+        results = run_line_rules([first, second, third], lines)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(results[0]), 2)
+        self.assertEqual(results[1], [])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(first.calls, ["start", 0, 1, "finish"])
+        self.assertFalse(hasattr(second, "calls"))
+
+    def test_walk_line_rules_is_lazy(self):
+        """Test that the walk stops at the line of the first consumed finding"""
+        first = self.RecordingRule()
+        second = self.RecordingRule()
+        lines = LineInfo.from_lines(["ok", "TODO", "ok", "TODO"])
+
+        walk = walk_line_rules([first, second], lines)
+        self.assertEqual(next(walk)[0], 0)
+        self.assertEqual(first.calls, ["start", 0, 1])
+        self.assertEqual(next(walk)[0], 1)
+        self.assertEqual(second.calls, ["start", 0, 1])
+        self.assertEqual([index for index, _ in walk], [0, 1, 0, 1])
+
+
 class TestRuleRegistry(unittest.TestCase):
     """Test the RuleRegistry"""
 
@@ -0,0 +1,164 @@
+# test_blocks.py - Tests for delimited block matching
+"""Tests for the block delimiter matching (blocks.py)"""
+
+import unittest
+from asciidoc_linter.blocks import (
+    BlockMap,
+    BlockTracker,
+    RAW_BLOCK_TYPES,
+    block_type,
+    match_blocks,
+)
+
+
+class TestBlockType(unittest.TestCase):
+    """Test recognition of block delimiters"""
+
+    def test_fixed_length_delimiters(self):
+        """Test the standard four character delimiters"""
+        self.assertEqual(block_type("----"), "listing")
+        self.assertEqual(block_type("===="), "example")
+        self.assertEqual(block_type("****"), "sidebar")
+        self.assertEqual(block_type("...."), "literal")
+        self.assertEqual(block_type("____"), "quote")
+        self.assertEqual(block_type("////"), "comment")
+        self.assertEqual(block_type("++++"), "passthrough")
+        self.assertEqual(block_type("|==="), "table")
+        self.assertEqual(block_type("--"), "open")
+
+    def test_variable_length_delimiters(self):
+        """Test that longer delimiters are recognised"""
+        self.assertEqual(block_type("------"), "listing")
+        self.assertEqual(block_type("======"), "example")
+        self.assertEqual(block_type("|====="), "table")
+        self.assertEqual(block_type("!==="), "table")
+
+    def test_non_delimiters(self):
+        """Test lines that are not delimiters"""
+        for line in ["", "-", "---", "===", "== Title", "--x", "|==", "|=x=", "**a*"]:
+            self.assertIsNone(block_type(line), line)
+
+
+class TestMatchBlocks(unittest.TestCase):
+    """Test matching of opening and closing delimiters"""
+
+    def test_simple_block(self):
+        """Test a terminated block"""
+        blocks = match_blocks(["text", "----", "code", "----"])
+
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual((blocks[0].start, blocks[0].end), (1, 3))
+        self.assertEqual(blocks[0].name, "listing block")
+
+    def test_nested_blocks_of_same_type(self):
+        """Test nesting with delimiters of different length"""
+        blocks = match_blocks(["======", "====", "inner", "====", "======"])
+
+        self.assertEqual(
+            [(b.start, b.end, b.depth) for b in blocks], [(0, 4, 0), (1, 3, 1)]
+        )
+
+    def test_verbatim_content_is_not_parsed(self):
+        """Test that delimiters inside a listing block are content"""
+        blocks = match_blocks(["----", "====", "****", "----"])
+
+        self.assertEqual(len(blocks), 1)
+        self.assertTrue(blocks[0].terminated)
+
+    def test_closing_outer_block_leaves_inner_unterminated(self):
+        """Test that closing an outer block ends all blocks opened inside it"""
+        blocks = match_blocks(["====", "****", "text", "====", "", "text"])
+
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0].end, 3)
+        self.assertEqual(blocks[1].start, 1)
+        self.assertFalse(blocks[1].terminated)
+
+    def test_closing_must_match_length(self):
+        """Test that a delimiter of different length does not close a block"""
+        blocks = match_blocks(["------", "code", "----"])
+
+        self.assertEqual(len(blocks), 1)
+        self.assertFalse(blocks[0].terminated)
+
+    def test_indented_lines_are_not_delimiters(self):
+        """Test that only delimiters at the beginning of a line are matched"""
+        blocks = match_blocks(["----", "  ----", "code", "---- "])
+
+        self.assertEqual(len(blocks), 1)
+        self.assertEqual(blocks[0].end, 3)
+
+    def test_many_unterminated_blocks(self):
+        """Test a large document with many unterminated delimiters"""
+        lines = ["====", "text"] * 20000 + ["----"] * 3
+
+        blocks = match_blocks(lines)
+
+        self.assertEqual(len(blocks), 10002)
+        self.assertEqual(sum(1 for b in blocks if not b.terminated), 1)
+
+
+class TestBlockMap(unittest.TestCase):
+    """Test looking up the block context of lines"""
+
+    def setUp(self):
+        self.block_map = BlockMap(
+            ["text", "====", "example", "----", "code", "----", "====", "after"]
+        )
+
+    def test_block_at(self):
+        """Test that each line maps to its innermost block"""
+        kinds = [self.block_map.kind_at(i) for i in range(len(self.block_map))]
+        self.assertEqual(
+            kinds,
+            [
+                None,
+                "example",
+                "example",
+                "listing",
+                "listing",
+                "listing",
+                "example",
+                None,
+            ],
+        )
+
+    def test_iteration_matches_lookup(self):
+        """Test that iterating yields the block of every line"""
+        self.assertEqual(
+            list(self.block_map),
+            [self.block_map.block_at(i) for i in range(len(self.block_map))],
+        )
+
+    def test_in_block(self):
+        """Test checking the block type of a line"""
+        self.assertTrue(self.block_map.in_block(4, RAW_BLOCK_TYPES))
+        self.assertFalse(self.block_map.in_block(2, RAW_BLOCK_TYPES))
+        self.assertFalse(self.block_map.in_block(0, RAW_BLOCK_TYPES))
+
+    def test_unterminated_block_extends_to_end(self):
+        """Test that lines after an unterminated delimiter belong to the block"""
+        block_map = BlockMap(["....", "text", "", "more"])
+        self.assertEqual([block_map.kind_at(i) for i in range(4)], ["literal"] * 4)
+
+
+class TestBlockTracker(unittest.TestCase):
+    """Test tracking blocks line by line"""
+
+    def test_only_open_blocks_are_kept(self):
+        """Test that closed blocks are dropped and lines get their block"""
+        tracker = BlockTracker()
+        lines = ["====", "text", "----", "====", "----", "====", "after"]
+        blocks = [tracker.feed(index, line) for index, line in enumerate(lines)]
+        self.assertEqual(
+            [block.kind if block else None for block in blocks],
+            ["example", "example", "listing", "listing", "listing", "example", None],
+        )
+        self.assertEqual(blocks[0].end, 5)
+        self.assertEqual(blocks[2].index, 1)
+        self.assertEqual(tracker.stack, [])
+        self.assertEqual(tracker.count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# test_buffer.py - Tests for the document buffer
+"""Tests for the document text with its line index (buffer.py)"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from asciidoc_linter import buffer
+from asciidoc_linter.buffer import DocumentBuffer
+from asciidoc_linter.parser import AsciiDocParser
+
+
+class TestDocumentBuffer(unittest.TestCase):
+    """Test splitting and indexing lines"""
+
+    def test_lines_match_splitlines(self):
+        generator = random.Random(7)
+        alphabet = "ab =\n\r\x0b\x0c\x1c\x85  "
+        for _ in range(500):
+            text = "".join(
+                generator.choice(alphabet) for _ in range(generator.randint(0, 30))
+            )
+            lines = DocumentBuffer(text)
+            self.assertEqual(list(lines), text.splitlines(), repr(text))
+            self.assertEqual(len(lines), len(text.splitlines()), repr(text))
+
+    def test_lines_match_splitlines_across_chunks(self):
+        text = "line one\n\nline three\r\n" * 50 + "last"
+        with patch.object(buffer, "CHUNK_SIZE", 7):
+            lines = DocumentBuffer(text)
+        self.assertEqual(list(lines), text.splitlines())
+
+    def test_indexing(self):
+        lines = DocumentBuffer("a\nbb\n\ncccc")
+        self.assertEqual(lines[1], "bb")
+        self.assertEqual(lines[-1], "cccc")
+        self.assertEqual(lines[1:3], ["bb", ""])
+        self.assertEqual(lines[::-2], ["cccc", "bb"])
+        self.assertEqual(lines.line_length(3), 4)
+        with self.assertRaises(IndexError):
+            lines[4]
+
+    def test_position(self):
+        lines = DocumentBuffer("ab\ncd\n\nef")
+        self.assertEqual(lines.position(0), (1, 1))
+        self.assertEqual(lines.position(4), (2, 2))
+        self.assertEqual(lines.position(6), (3, 1))
+        self.assertEqual(lines.position(8), (4, 2))
+        self.assertEqual(DocumentBuffer("").position(0), (1, 1))
+
+    def test_from_bytes_translates_newlines(self):
+        lines = DocumentBuffer.from_bytes("ä\r\nb\rc\n".encode("utf-8"))
+        self.assertEqual(lines.text, "ä\nb\nc\n")
+        self.assertEqual(list(lines), ["ä", "b", "c"])
+        with self.assertRaises(UnicodeDecodeError):
+            DocumentBuffer.from_bytes(b"\xff")
+
+    def test_from_file(self):
+        handle, path = tempfile.mkstemp(suffix=".adoc")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "wb") as file:
+            file.write("= Tïtle\r\n\r\ntext\n".encode("utf-8"))
+        for threshold in (buffer.MMAP_THRESHOLD, 1):
+            with patch.object(buffer, "MMAP_THRESHOLD", threshold):
+                lines = DocumentBuffer.from_file(path)
+            self.assertEqual(lines.text, "= Tïtle\n\ntext\n")
+            self.assertEqual(list(lines), ["= Tïtle", "", "text"])
+
+    def test_parse_buffer(self):
+        text = "= Title\n\n== Section\n\n----\ncode\n----\n"
+        from_buffer = AsciiDocParser().parse(DocumentBuffer(text))
+        from_string = AsciiDocParser().parse(text)
+        self.assertEqual(
+            [(type(e), e.start_offset, e.end_offset) for e in from_buffer.walk()],
+            [(type(e), e.start_offset, e.end_offset) for e in from_string.walk()],
+        )
+        self.assertEqual(list(from_buffer.lines), from_string.lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
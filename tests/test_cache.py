@@ -0,0 +1,149 @@
+# test_cache.py - Tests for the result cache
+"""Tests for the on-disk result cache (cache.py)"""
+
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from asciidoc_linter.cache import (
+    INDEX_FILE,
+    ResultCache,
+    content_digest,
+    fingerprint,
+)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test storing and looking up results"""
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.cache = ResultCache(self.root / "cache", fingerprint="rules")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, content, age=10):
+        """Write a file with a modification time in the past"""
+        path = self.root / name
+        path.write_text(content)
+        past = time.time() - age
+        os.utime(path, (past, past))
+        return path
+
+    def test_put_and_get(self):
+        """Test that stored results are returned for the same content hash"""
+        self.assertIsNone(self.cache.get("abc"))
+        self.cache.put("abc", [["message", "warning", 1, None, "WS001", "ctx"]])
+        self.assertEqual(
+            self.cache.get("abc"), [["message", "warning", 1, None, "WS001", "ctx"]]
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertTrue((self.root / "cache" / ".gitignore").exists())
+
+    def test_fingerprint_separates_entries(self):
+        """Test that results of another rule set are not returned"""
+        self.cache.put("abc", [])
+        other = ResultCache(self.root / "cache", fingerprint="other rules")
+        self.assertIsNone(other.get("abc"))
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": 2}))
+
+    def test_unserialisable_results_are_not_cached(self):
+        """Test that results which cannot be stored as JSON are skipped"""
+        self.cache.put("abc", [[object()]])
+        self.assertIsNone(self.cache.get("abc"))
+
+    def test_file_digest_reads_new_files(self):
+        """Test that unknown files are read and hashed"""
+        path = self.write_file("doc.adoc", "= Title\n")
+        digest, data = self.cache.file_digest(path)
+        self.assertEqual(data, b"= Title\n")
+        self.assertEqual(digest, content_digest(data))
+
+    def test_file_digest_uses_index_for_unchanged_files(self):
+        """Test that the index avoids reading unchanged files"""
+        path = self.write_file("doc.adoc", "= Title\n")
+        digest, _ = self.cache.file_digest(path)
+        self.cache.save()
+
+        cache = ResultCache(self.root / "cache", fingerprint="rules")
+        self.assertIn(os.path.abspath(path), cache.index)
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            self.assertEqual(cache.file_digest(path), (digest, None))
+
+        # A changed file is read again
+        path = self.write_file("doc.adoc", "= Other\n", age=5)
+        digest, data = cache.file_digest(path)
+        self.assertEqual(data, b"= Other\n")
+        self.assertEqual(digest, content_digest(data))
+
+    def test_recently_modified_files_are_not_indexed(self):
+        """Test that files modified just now are hashed again next time"""
+        path = self.write_file("doc.adoc", "= Title\n", age=0)
+        self.cache.file_digest(path)
+        self.assertNotIn(os.path.abspath(path), self.cache.index)
+
+    def test_save_merges_index_and_drops_missing_files(self):
+        """Test that concurrent index updates are kept and missing files dropped"""
+        first = self.write_file("first.adoc", "first\n")
+        second = self.write_file("second.adoc", "second\n")
+        gone = self.write_file("gone.adoc", "gone\n")
+
+        other = ResultCache(self.root / "cache")
+        other.file_digest(first)
+        other.file_digest(gone)
+        self.cache.file_digest(second)
+        other.save()
+        gone.unlink()
+        with self.assertRaises(OSError):
+            self.cache.file_digest(gone)
+        self.cache.save()
+
+        index = ResultCache(self.root / "cache").index
+        self.assertEqual(
+            sorted(index), sorted([os.path.abspath(first), os.path.abspath(second)])
+        )
+        self.assertTrue((self.root / "cache" / INDEX_FILE).exists())
+
+    def test_prune_removes_least_recently_used_entries(self):
+        """Test size based eviction"""
+        cache = ResultCache(self.root / "cache", max_size=1000)
+        for number in range(10):
+            cache.put(f"entry{number}", ["x" * 200])
+            path = cache._entry_path(f"entry{number}")
+            os.utime(path, (number, number))
+
+        cache.prune()
+        remaining = [
+            number
+            for number in range(10)
+            if cache._entry_path(f"entry{number}").exists()
+        ]
+        self.assertEqual(remaining, [7, 8, 9])
+
+    def test_save_prunes_when_total_size_exceeds_maximum(self):
+        """Test that entries are only listed once the running total is too large"""
+        cache = ResultCache(self.root / "cache", max_size=1000)
+        cache.put("first", ["x" * 200])
+        cache.save()  # The first save lists the entries to learn their size
+        with patch.object(ResultCache, "prune", return_value=0) as prune:
+            cache = ResultCache(self.root / "cache", max_size=1000)
+            cache.put("second", ["x" * 200])
+            cache.save()
+            prune.assert_not_called()
+            cache = ResultCache(self.root / "cache", max_size=1000)
+            cache.save()
+            prune.assert_not_called()
+            cache = ResultCache(self.root / "cache", max_size=1000)
+            for number in range(5):
+                cache.put(f"entry{number}", ["x" * 200])
+            cache.save()
+            prune.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
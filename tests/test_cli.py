@@ -1,15 +1,23 @@
 # test_cli.py - Tests for command line interface
 """Tests for the command line interface"""
 
+import io
+import json
+import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 from unittest.mock import patch
-from asciidoc_linter.cli import main, create_parser, get_reporter
+from asciidoc_linter.cli import main, create_parser, get_reporter, parse_args
+from asciidoc_linter.git import GitError
+from asciidoc_linter.linter import AsciiDocLinter
 from asciidoc_linter.rules.base import Finding, Severity
 from asciidoc_linter.reporter import (
     ConsoleReporter,
     JsonReporter,
     HtmlReporter,
-    LintReport,
+    JsonLinesReporter,
+    SarifReporter,
 )
 
 
@@ -77,32 +85,135 @@ class TestCliArgumentParsing(unittest.TestCase):
 
         self.assertTrue(args.debug)
 
+    def test_jobs_option(self):
+        """Test the jobs option"""
+        parser = create_parser()
+        self.assertEqual(parser.parse_args(["test.adoc"]).jobs, 1)
+        self.assertEqual(parser.parse_args(["test.adoc", "--jobs", "4"]).jobs, 4)
+        self.assertGreaterEqual(parser.parse_args(["test.adoc", "-j", "auto"]).jobs, 1)
+
+    def test_cache_options(self):
+        """Test the cache options"""
+        parser = create_parser()
+        args = parser.parse_args(["test.adoc"])
+        self.assertFalse(args.cache)
+        self.assertEqual(args.cache_dir, ".asciidoc-linter-cache")
+
+        args = parser.parse_args(["--cache", "test.adoc", "--cache-dir", "tmp"])
+        self.assertTrue(args.cache)
+        self.assertEqual(args.files, ["test.adoc"])
+        self.assertEqual(args.cache_dir, "tmp")
+
+    def test_invalid_jobs_option(self):
+        """Test invalid values for the jobs option"""
+        parser = create_parser()
+        for value in ("0", "-2", "many"):
+            with self.assertRaises(SystemExit):
+                parser.parse_args(["test.adoc", "--jobs", value])
+
 
 class TestCliFileProcessing(unittest.TestCase):
     """Test file processing functionality"""
 
-    @patch("asciidoc_linter.linter.AsciiDocLinter.lint")
+    @patch("asciidoc_linter.linter.AsciiDocLinter.lint_results")
     def test_successful_lint(self, mock_lint):
         """Test successful file linting"""
-        mock_lint.return_value = LintReport([])  # No lint errors
+        mock_lint.return_value = [[]]  # No lint errors
 
         exit_code = main(["valid.adoc"])
 
         self.assertEqual(exit_code, 0)
         mock_lint.assert_called_once()
 
-    @patch("asciidoc_linter.linter.AsciiDocLinter.lint")
+    @patch("asciidoc_linter.linter.AsciiDocLinter.lint_results")
     def test_lint_with_errors(self, mock_lint):
         """Test file linting with errors"""
-        mock_lint.return_value = LintReport(
+        mock_lint.return_value = [
             [Finding(message="Foo", severity=Severity.ERROR)]
-        )  # Simulate lint error
+        ]  # Simulate lint error
 
         exit_code = main(["invalid.adoc"])
 
         self.assertEqual(exit_code, 1)
         mock_lint.assert_called_once()
 
+    def test_files_from(self):
+        """Test reading the files to lint from a file list"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            doc = os.path.join(temp_dir, "doc.adoc")
+            with open(doc, "w", encoding="utf-8") as doc_file:
+                doc_file.write("Text with trailing space \n")
+            file_list = os.path.join(temp_dir, "files.txt")
+            with open(file_list, "wb") as list_file:
+                list_file.write(os.fsencode(doc) + b"\0")
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                exit_code = main(["--format", "plain", "--files-from", file_list])
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("doc.adoc", output.getvalue())
+        self.assertIn("trailing whitespace", output.getvalue())
+
+    def test_files_from_stdin(self):
+        """Test reading the file list from standard input"""
+        stdin = io.TextIOWrapper(io.BytesIO(b"one.adoc\ntwo.adoc\n"))
+        with patch("sys.stdin", stdin), patch(
+            "asciidoc_linter.linter.AsciiDocLinter.lint_file", return_value=[]
+        ) as lint_file:
+            with redirect_stdout(io.StringIO()):
+                main(["--files-from", "-"])
+        self.assertEqual(
+            [call.args[0] for call in lint_file.call_args_list],
+            ["one.adoc", "two.adoc"],
+        )
+
+    @patch("asciidoc_linter.cli.changed_files", side_effect=GitError("bad revision"))
+    def test_changed_since_error(self, changed_files):
+        """Test that git errors are reported with exit code 2"""
+        with patch("sys.stderr", io.StringIO()) as stderr:
+            exit_code = main(["--changed-since", "nothing"])
+        self.assertEqual(exit_code, 2)
+        self.assertIn("bad revision", stderr.getvalue())
+        changed_files.assert_called_once()
+
+    def test_watch_options(self):
+        """Test that watch mode only supports console output of files"""
+        for args in (["--format", "json"], ["--staged"]):
+            with patch("sys.stderr", io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main(["--watch", "docs"] + args)
+
+    def test_stream_options(self):
+        """Test that streaming cannot be combined with cached or git contents"""
+        for args in (["--cache"], ["--watch"], ["--staged"], ["--diff-only", "HEAD"]):
+            with patch("sys.stderr", io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main(["--stream", "docs"] + args)
+
+    def test_limit_options(self):
+        """Test the options limiting the number of findings"""
+        args = parse_args(["--fail-fast", "docs"])
+        self.assertEqual(args.max_findings, 1)
+        args = parse_args(["--max-findings-per-file", "3", "docs"])
+        self.assertIsNone(args.max_findings)
+        self.assertEqual(args.max_findings_per_file, 3)
+        for args in (
+            ["--max-findings", "0"],
+            ["--max-findings-per-file", "x"],
+            ["--fail-fast", "--max-findings", "2"],
+            ["--fail-fast", "--watch"],
+        ):
+            with patch("sys.stderr", io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    main(["docs"] + args)
+
+    def test_no_files(self):
+        """Test that files or a file list are required"""
+        with patch("sys.stderr", io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main([])
+
 
 class TestCliReporters(unittest.TestCase):
     """Test reporter selection and usage"""
@@ -117,6 +228,57 @@ class TestCliReporters(unittest.TestCase):
         args = create_parser().parse_args(["test.adoc", "--format", "html"])
         self.assertIsInstance(get_reporter(args.format), HtmlReporter)
 
+    def test_jsonl_reporter(self):
+        """Test JSON Lines reporter selection"""
+        args = create_parser().parse_args(["test.adoc", "--format", "jsonl"])
+        self.assertIsInstance(get_reporter(args.format), JsonLinesReporter)
+
+    def test_sarif_reporter(self):
+        """Test that SARIF logs describe the rules of the linter"""
+        args = create_parser().parse_args(["test.adoc", "--format", "sarif"])
+        reporter = get_reporter(args.format, AsciiDocLinter().rules)
+        self.assertIsInstance(reporter, SarifReporter)
+        self.assertIn("WS001", reporter.rule_indexes)
+
+    def test_jsonl_output_file(self):
+        """Test that findings are written as JSON Lines with a summary"""
+        with tempfile.TemporaryDirectory() as directory:
+            document = os.path.join(directory, "doc.adoc")
+            with open(document, "w", encoding="utf-8") as file:
+                file.write("= Title\n\nText  \n\tTabbed\n")
+            output = os.path.join(directory, "report.jsonl")
+            exit_code = main([document, "--format", "jsonl", "--output", output])
+            with open(output, encoding="utf-8") as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual([record.get("line") for record in records[:-1]], [3, 4])
+        self.assertEqual(records[0]["file"], document)
+        self.assertEqual(
+            records[-1], {"summary": {"findings": 2, "files": 1, "truncated": False}}
+        )
+
+    def test_output_file(self):
+        """Test that other formats are written to the output file as well"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "report.json")
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exit_code = main(
+                    [
+                        os.path.join(directory, "missing.adoc"),
+                        "--format",
+                        "json",
+                        "-o",
+                        output,
+                    ]
+                )
+            with open(output, encoding="utf-8") as file:
+                data = json.load(file)
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(len(data["findings"]), 1)
+
     def test_console_reporter(self):
         """Test explicit console reporter"""
         args = create_parser().parse_args(["test.adoc", "--format", "console"])
@@ -0,0 +1,183 @@
+# test_daemon.py - Tests for the linter daemon and its client
+"""Tests for the daemon (daemon.py) and the thin client (client.py)"""
+
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from asciidoc_linter import client
+from asciidoc_linter.cli import main as cli_main
+from asciidoc_linter.daemon import LinterDaemon, stop
+
+SAMPLE = "= Title\nText with trailing space \n== Section\n"
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix sockets")
+class TestLinterDaemon(unittest.TestCase):
+    """Test linting through a daemon running in a thread"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "linter.sock")
+        self.doc = os.path.join(self.temp_dir, "doc.adoc")
+        with open(self.doc, "w", encoding="utf-8") as doc_file:
+            doc_file.write(SAMPLE)
+
+        self.daemon = LinterDaemon(self.socket_path, idle_timeout=10)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            threading.Event().wait(0.01)
+
+    def tearDown(self):
+        stop(self.socket_path)
+        self.thread.join(5)
+        shutil.rmtree(self.temp_dir)
+
+    def forward(self, args):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = client.forward(args, self.socket_path, stdout, stderr)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_report_matches_cli(self):
+        """Test that the daemon reports the same as running the linter directly"""
+        expected_output = io.StringIO()
+        with redirect_stdout(expected_output):
+            expected_code = cli_main(["--format", "plain", self.doc])
+
+        for _ in range(2):  # The second run uses the warm linter
+            exit_code, output, errors = self.forward(["--format", "plain", self.doc])
+            self.assertEqual(exit_code, expected_code)
+            self.assertEqual(output, expected_output.getvalue())
+            self.assertEqual(errors, "")
+
+    def test_report_is_streamed(self):
+        """Test that the report is sent while linting, before the exit code"""
+        other_doc = os.path.join(self.temp_dir, "other.adoc")
+        shutil.copy(self.doc, other_doc)
+        with client.connect(self.socket_path) as connection:
+            stream = connection.makefile("rwb")
+            client.send_message(
+                stream,
+                {
+                    "version": client.__version__,
+                    "argv": ["--format", "plain", self.doc, other_doc],
+                    "cwd": os.getcwd(),
+                },
+            )
+            messages = list(client.receive_messages(stream))
+        outputs = [message for message in messages if "stdout" in message]
+        self.assertGreater(len(outputs), 1)
+        self.assertEqual(messages[: len(outputs)], outputs)
+        self.assertIn("exit_code", messages[-1])
+
+    def test_request_without_arguments(self):
+        """Test that a request without argv and cwd is answered with an error"""
+        for request in ({}, {"argv": [1], "cwd": os.getcwd()}, {"argv": []}):
+            request["version"] = client.__version__
+            with client.connect(self.socket_path) as connection:
+                stream = connection.makefile("rwb")
+                client.send_message(stream, request)
+                messages = list(client.receive_messages(stream))
+            self.assertEqual(len(messages), 1)
+            self.assertIn("error", messages[0])
+
+        exit_code, _, _ = self.forward(["--format", "plain", self.doc])
+        self.assertEqual(exit_code, 1)
+
+    def test_relative_paths_use_client_directory(self):
+        """Test that files are resolved against the working directory of the client"""
+        previous_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        try:
+            exit_code, output, _ = self.forward(["--format", "plain", "doc.adoc"])
+        finally:
+            os.chdir(previous_cwd)
+        self.assertIn("Results for doc.adoc", output)
+        self.assertNotIn("Error linting file", output)
+
+    def test_invalid_arguments(self):
+        """Test that argument errors are reported to the client"""
+        exit_code, output, errors = self.forward(["--format", "invalid", self.doc])
+        self.assertEqual(exit_code, 2)
+        self.assertIn("invalid choice", errors)
+
+    def test_version_mismatch(self):
+        """Test that a daemon of another version does not handle requests"""
+        with patch.object(client, "__version__", "0.0.0"):
+            with self.assertRaises(client.DaemonUnavailable):
+                self.forward([self.doc])
+
+    def test_stop(self):
+        """Test that the daemon stops and removes its socket"""
+        self.assertTrue(stop(self.socket_path))
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertFalse(stop(self.socket_path))
+
+    def test_second_daemon_is_refused(self):
+        """Test that only one daemon can use a socket"""
+        with self.assertRaises(RuntimeError):
+            LinterDaemon(self.socket_path)._bind()
+
+
+class TestClient(unittest.TestCase):
+    """Test the client without a running daemon"""
+
+    def test_falls_back_to_linting_in_process(self):
+        """Test that the client lints itself if no daemon is running"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            doc = os.path.join(temp_dir, "doc.adoc")
+            with open(doc, "w", encoding="utf-8") as doc_file:
+                doc_file.write(SAMPLE)
+            socket_path = os.path.join(temp_dir, "missing.sock")
+
+            expected_output = io.StringIO()
+            with redirect_stdout(expected_output):
+                expected_code = cli_main(["--format", "plain", doc])
+
+            output = io.StringIO()
+            with patch.dict(os.environ, {client.SOCKET_ENV: socket_path}):
+                with redirect_stdout(output):
+                    exit_code = client.main(["--format", "plain", doc])
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(exit_code, expected_code)
+        self.assertEqual(output.getvalue(), expected_output.getvalue())
+        self.assertIn("trailing whitespace", output.getvalue())
+
+    def test_file_list_on_stdin_is_not_forwarded(self):
+        """Test that the client lints itself if it reads files from stdin"""
+        self.assertTrue(client.reads_stdin(["--files-from", "-"]))
+        self.assertTrue(client.reads_stdin(["-j", "2", "--files-from=-"]))
+        self.assertFalse(client.reads_stdin(["--files-from", "list.txt", "-"]))
+        with patch.object(client, "forward") as forward, patch(
+            "asciidoc_linter.cli.main", return_value=0
+        ):
+            self.assertEqual(client.main(["--files-from", "-"]), 0)
+        forward.assert_not_called()
+
+    def test_default_socket_path(self):
+        """Test that the socket path can be set in the environment"""
+        with patch.dict(os.environ, {client.SOCKET_ENV: "/tmp/custom.sock"}):
+            self.assertEqual(client.default_socket_path(), "/tmp/custom.sock")
+        with patch.dict(os.environ, {client.SOCKET_ENV: "", "XDG_RUNTIME_DIR": ""}):
+            self.assertTrue(client.default_socket_path().endswith(".sock"))
+        with patch.dict(os.environ, {client.SOCKET_ENV: "", "XDG_RUNTIME_DIR": "/run"}):
+            self.assertEqual(client.default_socket_path(), "/run/asciidoc-linter.sock")
+
+
+if __name__ == "__main__":
+    unittest.main()
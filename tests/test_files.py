@@ -0,0 +1,177 @@
+# test_files.py - Tests for finding the files to lint
+"""Tests for the directory walker and gitignore matching (files.py)"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from asciidoc_linter.files import IgnoreMatcher, find_files, read_file_list
+
+
+class TestIgnoreMatcher(unittest.TestCase):
+    """Test the translation of gitignore patterns"""
+
+    def assert_ignored(self, patterns, path, expected=True):
+        self.assertEqual(IgnoreMatcher(patterns).match(path), expected, path)
+
+    def test_basename_pattern_matches_in_any_directory(self):
+        self.assert_ignored(["*.adoc"], "a.adoc")
+        self.assert_ignored(["*.adoc"], "docs/deep/a.adoc")
+        self.assert_ignored(["build"], "docs/build/")
+        self.assert_ignored(["*.adoc"], "a.txt", None)
+
+    def test_anchored_pattern(self):
+        self.assert_ignored(["/build"], "build/")
+        self.assert_ignored(["/build"], "docs/build/", None)
+        self.assert_ignored(["docs/*.adoc"], "docs/a.adoc")
+        self.assert_ignored(["docs/*.adoc"], "docs/sub/a.adoc", None)
+
+    def test_directory_only_pattern(self):
+        self.assert_ignored(["out/"], "out/")
+        self.assert_ignored(["out/"], "out", None)
+
+    def test_double_asterisk(self):
+        self.assert_ignored(["**/tmp"], "tmp/")
+        self.assert_ignored(["**/tmp"], "a/b/tmp/")
+        self.assert_ignored(["a/**/b.adoc"], "a/b.adoc")
+        self.assert_ignored(["a/**/b.adoc"], "a/x/y/b.adoc")
+        self.assert_ignored(["a/**"], "a/x/y.adoc")
+
+    def test_character_classes_and_escapes(self):
+        self.assert_ignored(["draft[0-9].adoc"], "draft1.adoc")
+        self.assert_ignored(["draft[!0-9].adoc"], "draft1.adoc", None)
+        self.assert_ignored(["\\#notes.adoc"], "#notes.adoc")
+        self.assert_ignored(["?.adoc"], "ab.adoc", None)
+
+    def test_last_matching_pattern_decides(self):
+        patterns = ["*.adoc", "!keep.adoc"]
+        self.assert_ignored(patterns, "drop.adoc")
+        self.assert_ignored(patterns, "keep.adoc", False)
+        self.assert_ignored(["!keep.adoc", "*.adoc"], "keep.adoc")
+
+    def test_comments_and_blank_lines(self):
+        self.assertIsNone(IgnoreMatcher(["# comment", "", "   "])._pattern)
+
+
+class TestFindFiles(unittest.TestCase):
+    """Test walking directories"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.root, ".git"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, path, content=""):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def found(self, *paths):
+        return sorted(
+            os.path.relpath(path, self.root)
+            for path in find_files([os.path.join(self.root, path) for path in paths])
+        )
+
+    def test_extensions(self):
+        for name in ["a.adoc", "b.asciidoc", "c.asc", "d.md", "E.ADOC"]:
+            self.write(os.path.join("docs", name))
+        self.assertEqual(
+            self.found("."),
+            [
+                os.path.join("docs", name)
+                for name in ["E.ADOC", "a.adoc", "b.asciidoc", "c.asc"]
+            ],
+        )
+
+    def test_gitignore(self):
+        self.write(".gitignore", "build/\n*.tmp.adoc\n")
+        self.write("docs/.gitignore", "!keep.tmp.adoc\ndrafts\n")
+        self.write("build/out.adoc")
+        self.write("docs/a.adoc")
+        self.write("docs/skip.tmp.adoc")
+        self.write("docs/keep.tmp.adoc")
+        self.write("docs/drafts/draft.adoc")
+        self.write(".git/info/exclude", "local.adoc\n")
+        self.write("local.adoc")
+        expected = [
+            os.path.join("docs", "a.adoc"),
+            os.path.join("docs", "keep.tmp.adoc"),
+        ]
+        self.assertEqual(self.found("."), expected)
+        # Ignore files of parent directories apply when walking a subdirectory
+        self.assertEqual(self.found("docs"), expected)
+
+    def test_explicit_files_are_kept(self):
+        self.write(".gitignore", "*.adoc\n")
+        self.write("a.adoc")
+        self.assertEqual(
+            self.found("a.adoc", "missing.adoc"), ["a.adoc", "missing.adoc"]
+        )
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "requires symbolic links")
+    def test_symlink_loop_and_duplicates(self):
+        self.write("docs/a.adoc")
+        os.symlink(self.root, os.path.join(self.root, "docs", "loop"))
+        os.symlink(
+            os.path.join(self.root, "docs", "a.adoc"),
+            os.path.join(self.root, "link.adoc"),
+        )
+        os.link(
+            os.path.join(self.root, "docs", "a.adoc"),
+            os.path.join(self.root, "hard.adoc"),
+        )
+        self.assertEqual(len(self.found(".", "docs/a.adoc")), 1)
+
+
+class ChunkedStream(io.RawIOBase):
+    """A stream returning a few bytes per read, like a pipe"""
+
+    def __init__(self, data, size):
+        self.data = data
+        self.size = size
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        chunk, self.data = self.data[: self.size], self.data[self.size :]
+        return chunk
+
+
+class TestReadFileList(unittest.TestCase):
+    """Test reading file lists"""
+
+    def read(self, data, size=3):
+        return list(read_file_list(ChunkedStream(data, size)))
+
+    def test_line_separated(self):
+        self.assertEqual(
+            self.read(b"a.adoc\r\n\nb c.adoc\nlast.adoc"),
+            ["a.adoc", "b c.adoc", "last.adoc"],
+        )
+
+    def test_nul_separated(self):
+        self.assertEqual(
+            self.read(b"a.adoc\0new\nline.adoc\0b.adoc\0"),
+            ["a.adoc", "new\nline.adoc", "b.adoc"],
+        )
+
+    def test_empty_and_undecodable(self):
+        self.assertEqual(self.read(b""), [])
+        self.assertEqual(self.read(b"\xff.adoc\n"), [os.fsdecode(b"\xff.adoc")])
+
+    def test_paths_are_read_lazily(self):
+        stream = ChunkedStream(b"a.adoc\nb.adoc\n" + b"x" * 1000, 8)
+        paths = read_file_list(stream)
+        self.assertEqual(next(paths), "a.adoc")
+        self.assertGreater(len(stream.data), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
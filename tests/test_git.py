@@ -0,0 +1,214 @@
+# test_git.py - Tests for selecting files with git
+"""Tests for the files changed since a revision (git.py)"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from asciidoc_linter.git import (
+    GitError,
+    affected_paths,
+    changed_files,
+    changed_lines,
+    include_graph,
+    list_blobs,
+    parse_diff,
+    read_blobs,
+)
+from asciidoc_linter.intervals import LineIntervals
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+@unittest.skipUnless(shutil.which("git"), "requires git")
+class TestChangedFiles(unittest.TestCase):
+    """Test finding changed files in a temporary repository"""
+
+    def setUp(self):
+        self.root = os.path.realpath(tempfile.mkdtemp())
+        self.git("init", "-q")
+        self.write("index.adoc", "= Index\n\ninclude::chapters/one.adoc[]\n")
+        self.write("chapters/one.adoc", "== One\n\ninclude::../shared/note.txt[]\n")
+        self.write("chapters/two.adoc", "== Two\n")
+        self.write("shared/note.txt", "Note\n")
+        self.write("other.adoc", "include::{attr}/note.txt[]\n")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "Initial")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def git(self, *args):
+        subprocess.run(
+            ["git"] + list(args),
+            cwd=self.root,
+            check=True,
+            env=dict(os.environ, **GIT_ENV),
+        )
+
+    def write(self, path, content):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+    def changed(self, paths=None, cwd=None):
+        return changed_files("HEAD", paths, cwd=cwd or self.root)
+
+    def test_nothing_changed(self):
+        self.assertEqual(self.changed(), [])
+
+    def test_changed_fragment_selects_includers(self):
+        self.write("shared/note.txt", "Changed note\n")
+        self.assertEqual(self.changed(), ["chapters/one.adoc", "index.adoc"])
+
+    def test_changed_and_untracked_files(self):
+        self.write("chapters/two.adoc", "== Two changed\n")
+        self.write("chapters/three.adoc", "== Three\n")
+        self.assertEqual(self.changed(), ["chapters/three.adoc", "chapters/two.adoc"])
+
+    def test_rename(self):
+        self.git("mv", "chapters/one.adoc", "chapters/first.adoc")
+        # The includer of the old name is affected as well
+        self.assertEqual(self.changed(), ["chapters/first.adoc", "index.adoc"])
+
+    def test_paths_limit_the_selection(self):
+        self.write("shared/note.txt", "Changed note\n")
+        self.assertEqual(self.changed(["chapters"]), ["chapters/one.adoc"])
+        # Relative to the working directory
+        cwd = os.path.join(self.root, "chapters")
+        self.assertEqual(self.changed(["."], cwd=cwd), ["one.adoc"])
+        self.assertEqual(
+            self.changed(cwd=cwd),
+            ["one.adoc", os.path.join(self.root, "index.adoc")],
+        )
+
+    def test_changed_lines(self):
+        self.write("chapters/two.adoc", "== Two\n\nNew text\n")
+        self.write("chapters/three.adoc", "== Three\n")
+        self.write("shared/note.txt", "Changed note\n")
+        self.git("mv", "index.adoc", "main.adoc")
+        self.assertEqual(
+            changed_lines("HEAD", cwd=self.root),
+            {
+                "chapters/three.adoc": LineIntervals.whole_file(),
+                "chapters/two.adoc": LineIntervals([(2, 3)]),
+            },
+        )
+        # A renamed file without changes has no changed lines
+
+    def test_changed_lines_ignore_diff_prefix_settings(self):
+        self.write("chapters/two.adoc", "== Two\n\nNew text\n")
+        expected = {"chapters/two.adoc": LineIntervals([(2, 3)])}
+        for setting in ("diff.noprefix", "diff.mnemonicPrefix"):
+            self.git("config", setting, "true")
+            self.assertEqual(changed_lines("HEAD", cwd=self.root), expected, setting)
+            self.git("config", "--unset", setting)
+
+    def test_blobs_of_index_and_revision(self):
+        self.write("chapters/two.adoc", "== Two staged\n")
+        self.git("add", "chapters/two.adoc")
+        self.write("chapters/two.adoc", "== Two in the working tree\n")
+        os.remove(os.path.join(self.root, "index.adoc"))
+
+        root, blobs = list_blobs(None, ["chapters", "index.adoc"], cwd=self.root)
+        self.assertEqual(root, self.root)
+        contents = dict(read_blobs(root, blobs))
+        self.assertEqual(
+            contents,
+            {
+                "chapters/one.adoc": b"== One\n\ninclude::../shared/note.txt[]\n",
+                "chapters/two.adoc": b"== Two staged\n",
+                "index.adoc": b"= Index\n\ninclude::chapters/one.adoc[]\n",
+            },
+        )
+
+        root, blobs = list_blobs("HEAD", cwd=os.path.join(self.root, "chapters"))
+        contents = dict(read_blobs(root, blobs))
+        self.assertEqual(contents["two.adoc"], b"== Two\n")
+        self.assertEqual(
+            sorted(contents),
+            [
+                os.path.join(self.root, "index.adoc"),
+                os.path.join(self.root, "other.adoc"),
+                "one.adoc",
+                "two.adoc",
+            ],
+        )
+
+    def test_read_blobs_stops_early(self):
+        root, blobs = list_blobs("HEAD", cwd=self.root)
+        contents = read_blobs(root, blobs * 1000)
+        self.assertEqual(next(contents)[0], "chapters/one.adoc")
+        contents.close()
+
+    def test_include_graph(self):
+        includers = include_graph(self.root)
+        self.assertEqual(includers["shared/note.txt"], {"chapters/one.adoc"})
+        self.assertEqual(includers["chapters/one.adoc"], {"index.adoc"})
+        self.assertNotIn("{attr}/note.txt", includers)
+
+    def test_invalid_revision(self):
+        with self.assertRaises(GitError):
+            changed_files("no-such-revision", cwd=self.root)
+        with self.assertRaises(GitError):
+            changed_files("--output=file", cwd=self.root)
+
+
+class TestParseDiff(unittest.TestCase):
+    """Test parsing the hunks of git diff -U0"""
+
+    def test_hunks(self):
+        output = b"""diff --git a/a.adoc b/a.adoc
+index 1..2 100644
+--- a/a.adoc
++++ b/a.adoc
+@@ -2 +2 @@ heading
+-old
++new
+@@ -5,2 +4,0 @@
+-removed
+-++ b/not a file header
+@@ -9,0 +8,3 @@
++added
++++ b/not a file header
++added
+\\ No newline at end of file
+diff --git a/gone.adoc b/gone.adoc
+deleted file mode 100644
+--- a/gone.adoc
++++ /dev/null
+@@ -1 +0,0 @@
+-text
+diff --git "a/odd \\"name\\".adoc" "b/odd \\"name\\".adoc"
+--- "a/odd \\"name\\".adoc"\t
++++ "b/odd \\"name\\".adoc"\t
+@@ -1 +0,0 @@
+-text
+"""
+        self.assertEqual(
+            parse_diff(output),
+            {
+                "a.adoc": LineIntervals([(2, 2), (4, 5), (8, 10)]),
+                'odd "name".adoc': LineIntervals([(1, 1)]),
+            },
+        )
+
+
+class TestAffectedPaths(unittest.TestCase):
+    """Test the closure over the include graph"""
+
+    def test_cycle(self):
+        includers = {"a": {"b"}, "b": {"c", "a"}, "d": {"e"}}
+        self.assertEqual(affected_paths(["a"], includers), {"a", "b", "c"})
+
+
+if __name__ == "__main__":
+    unittest.main()
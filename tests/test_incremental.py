@@ -0,0 +1,207 @@
+# test_incremental.py - Tests for incremental linting
+"""Tests for the IncrementalDocument (incremental.py)"""
+
+import random
+import unittest
+
+from asciidoc_linter.incremental import IncrementalDocument, split_lines
+from asciidoc_linter.linter import AsciiDocLinter
+
+LINES = [
+    "",
+    "  ",
+    "= Title",
+    "== Section",
+    "==== Skipped level",
+    "=Missing space",
+    "----",
+    "====",
+    "|===",
+    "| a | b |",
+    "|---|---|",
+    "* item",
+    "*item",
+    "1. numbered",
+    "Text with trailing space ",
+    "\tTabbed",
+    "NOTE: Admonition",
+    "```",
+    "# Markdown heading",
+    "[source]",
+    "--",
+    "**Term**",
+    "image::missing.png[]",
+    ":attribute: value",
+    "// comment",
+    "////",
+]
+
+
+def finding_keys(findings):
+    return sorted(
+        (
+            finding.position.line if finding.position else 0,
+            finding.position.column or 0 if finding.position else 0,
+            finding.rule_id or "",
+            finding.message,
+        )
+        for finding in findings
+    )
+
+
+class RawLinesLinter(AsciiDocLinter):
+    """A linter passing the document lines instead of the parsed document
+    to the rules, so all rules report findings"""
+
+    def __init__(self):
+        super().__init__()
+        self.parser.parse = lambda content: (
+            content.splitlines() if isinstance(content, str) else list(content)
+        )
+
+
+class TestIncrementalDocument(unittest.TestCase):
+    """Test that incremental updates report the findings of a full run"""
+
+    def setUp(self):
+        self.linter = RawLinesLinter()
+
+    def assert_matches_full_run(self, document):
+        self.assertEqual(
+            finding_keys(document.findings),
+            finding_keys(self.linter.lint_string(document.text)),
+        )
+
+    def test_initial_findings(self):
+        text = "\n".join(LINES) + "\n"
+        document = IncrementalDocument(text, self.linter)
+        self.assertTrue(document.findings)
+        self.assert_matches_full_run(document)
+
+    def test_split_lines(self):
+        self.assertEqual(split_lines("a\r\nb\rc\n"), ["a", "b", "c", ""])
+        self.assertEqual(split_lines(""), [""])
+
+    def test_random_edits(self):
+        generator = random.Random(42)
+        for _ in range(150):
+            text = "\n".join(
+                generator.choice(LINES) for _ in range(generator.randint(0, 30))
+            )
+            document = IncrementalDocument(text, self.linter)
+            document.findings
+            for _ in range(5):
+                start = generator.randint(0, len(document.lines))
+                end = generator.randint(start, min(len(document.lines), start + 3))
+                new_lines = [
+                    generator.choice(LINES) for _ in range(generator.randint(0, 3))
+                ]
+                document.replace_lines(start, end, new_lines)
+                self.assert_matches_full_run(document)
+
+    def test_random_text_edits(self):
+        generator = random.Random(7)
+        for _ in range(100):
+            text = "\n".join(
+                generator.choice(LINES) for _ in range(generator.randint(0, 30))
+            )
+            document = IncrementalDocument(text, self.linter)
+            document.findings
+            for _ in range(5):
+                line = generator.randint(0, len(document.lines))
+                start = (line, generator.randint(0, 12))
+                end = (line + generator.randint(0, 2), generator.randint(0, 12))
+                if end < start:
+                    start, end = end, start
+                new_text = generator.choice(["", "\n", "x", "  ", "\n\n", "=", "\t"])
+                new_text += generator.choice(LINES)
+                document.apply_edit(start, end, new_text)
+                self.assert_matches_full_run(document)
+
+    def test_apply_edit(self):
+        document = IncrementalDocument("First line\nSecond line\n", self.linter)
+        document.apply_edit((0, 5), (1, 6), " and")
+        self.assertEqual(document.text, "First and line\n")
+        document.apply_edit((0, 9), (0, 9), "\n")
+        self.assertEqual(document.lines, ["First and", " line", ""])
+        # Positions beyond the end refer to the end
+        document.apply_edit((5, 0), (9, 9), "Last  ")
+        self.assertEqual(document.text, "First and\n line\nLast  ")
+        self.assertEqual([finding.position.line for finding in document.findings], [3])
+        with self.assertRaises(ValueError):
+            document.apply_edit((1, 2), (0, 1), "")
+
+    def test_heading_rules_run_only_for_moved_titles(self):
+        document = IncrementalDocument(
+            "= Title\n\n=== Skipped\n\nText\n\nEnd\n", self.linter
+        )
+        self.assertEqual(
+            [finding.rule_id for finding in document.findings], ["HEAD001"]
+        )
+
+        linted_rules = []
+        lint_lines = self.linter.lint_lines
+
+        def recording_lint_lines(lines, rules=None, content=None):
+            linted_rules.extend(rule.id for rule in rules or [])
+            return lint_lines(lines, rules, content)
+
+        self.linter.lint_lines = recording_lint_lines
+        # Lines added after the last title do not move any title
+        document.apply_edit((6, 3), (6, 3), "\n\nMore text")
+        document.update()
+        self.assertNotIn("HEAD001", linted_rules)
+        # Lines added before a title move it
+        document.apply_edit((1, 0), (1, 0), "Intro\n\n")
+        document.update()
+        self.assertIn("HEAD001", linted_rules)
+        self.assert_matches_full_run(document)
+
+    def test_opening_block_swallows_following_chunks(self):
+        document = IncrementalDocument("Text\n\n# Heading\n\nMore text\n", self.linter)
+        document.findings
+        document.replace_lines(1, 1, ["", "----"])
+        self.assert_matches_full_run(document)
+        self.assertEqual(
+            [finding.rule_id for finding in document.findings], ["BLOCK001"]
+        )
+
+    def test_edit_lints_only_affected_chunks(self):
+        paragraphs = [f"Paragraph {number}  " for number in range(100)]
+        document = IncrementalDocument("\n\n".join(paragraphs), self.linter)
+        document.findings
+
+        linted = []
+        lint_lines = self.linter.lint_lines
+
+        def recording_lint_lines(lines, rules=None, content=None):
+            linted.append(len(lines))
+            return lint_lines(lines, rules, content)
+
+        self.linter.lint_lines = recording_lint_lines
+        document.replace_lines(100, 101, ["Changed paragraph"])
+        self.assert_matches_full_run(document)
+        # Only the chunks around the edit are linted, apart from the full run
+        self.assertLessEqual(linted[0], 4)
+
+    def test_cancelled_update_resumes(self):
+        document = IncrementalDocument("Text  \n\nMore  \n", self.linter)
+        self.assertFalse(document.update(lambda: True))
+        self.assertTrue(document.update())
+        self.assert_matches_full_run(document)
+
+    def test_invalid_range(self):
+        document = IncrementalDocument("Text", self.linter)
+        with self.assertRaises(IndexError):
+            document.replace_lines(0, 2, [])
+
+    def test_default_linter(self):
+        document = IncrementalDocument("Text  \n")
+        self.assertEqual(
+            finding_keys(document.findings),
+            finding_keys(AsciiDocLinter().lint_string("Text  \n")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
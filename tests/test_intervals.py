@@ -0,0 +1,38 @@
+# test_intervals.py - Tests for sets of line ranges
+"""Tests for LineIntervals (intervals.py)"""
+
+import unittest
+
+from asciidoc_linter.intervals import END_OF_FILE, LineIntervals
+
+
+class TestLineIntervals(unittest.TestCase):
+    """Test merging and looking up line ranges"""
+
+    def test_ranges_are_merged(self):
+        intervals = LineIntervals([(10, 12), (1, 3), (4, 5), (11, 20), (30, 29)])
+        self.assertEqual(intervals.starts, [1, 10])
+        self.assertEqual(intervals.ends, [5, 20])
+
+    def test_contains(self):
+        intervals = LineIntervals([(3, 4), (8, 8)])
+        self.assertEqual([line for line in range(10) if line in intervals], [3, 4, 8])
+        self.assertNotIn(1, LineIntervals())
+        self.assertFalse(LineIntervals())
+
+    def test_overlaps(self):
+        intervals = LineIntervals([(3, 4), (8, 8)])
+        self.assertTrue(intervals.overlaps(1, 3))
+        self.assertTrue(intervals.overlaps(5, 9))
+        self.assertFalse(intervals.overlaps(5, 7))
+        self.assertFalse(intervals.overlaps(9, 100))
+
+    def test_lines(self):
+        intervals = LineIntervals([(2, 3), (6, END_OF_FILE)])
+        self.assertEqual(list(intervals.lines(8)), [2, 3, 6, 7, 8])
+        self.assertEqual(list(intervals.lines(1)), [])
+        self.assertIn(10**9, LineIntervals.whole_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
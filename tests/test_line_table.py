@@ -0,0 +1,151 @@
+# test_line_table.py - Tests for the line classification
+"""Tests for the per-document line table (line_table.py)"""
+
+import unittest
+from asciidoc_linter.line_table import (
+    HAS_TAB,
+    TRAILING_WHITESPACE,
+    LineInfo,
+    LineKind,
+    LineTable,
+    classify_line,
+)
+
+
+class TestClassifyLine(unittest.TestCase):
+    """Test the classification of single lines"""
+
+    def assertKind(self, text, kind, level=0):
+        result = classify_line(text)
+        self.assertEqual(result[0], kind, text)
+        self.assertEqual(result[1], level, text)
+
+    def test_blank_lines(self):
+        """Test empty and whitespace-only lines"""
+        self.assertEqual(classify_line(""), (LineKind.BLANK, 0, 0, 0))
+        self.assertEqual(
+            classify_line("  \t"), (LineKind.BLANK, 0, 3, TRAILING_WHITESPACE | HAS_TAB)
+        )
+
+    def test_headings(self):
+        """Test section titles and their level"""
+        self.assertKind("= Title", LineKind.HEADING, 1)
+        self.assertKind("=== Section", LineKind.HEADING, 3)
+        self.assertKind("==Section", LineKind.TEXT)
+        self.assertKind("=  ", LineKind.TEXT)
+
+    def test_deep_heading_level_is_clamped(self):
+        """Test that levels beyond the column range do not overflow"""
+        self.assertKind("=" * 256 + " Title", LineKind.HEADING, 255)
+        table = LineTable(["=" * 300 + " Title"])
+        self.assertEqual(table.levels[0], 255)
+
+    def test_delimiters(self):
+        """Test that delimiter lines take precedence over other kinds"""
+        for text in ("----", "====", "****", "....", "////", "|===", "--", "---- "):
+            self.assertKind(text, LineKind.DELIMITER)
+        self.assertKind("---", LineKind.TEXT)
+        self.assertKind("  ----", LineKind.TEXT)
+
+    def test_list_items(self):
+        """Test list markers and their depth"""
+        self.assertKind("* item", LineKind.LIST_ITEM, 1)
+        self.assertKind("  *** item", LineKind.LIST_ITEM, 3)
+        self.assertKind("- item", LineKind.LIST_ITEM, 1)
+        self.assertKind(".. item", LineKind.LIST_ITEM, 2)
+        self.assertKind("12. item", LineKind.LIST_ITEM, 1)
+        self.assertKind("*bold* text", LineKind.TEXT)
+
+    def test_other_kinds(self):
+        """Test attribute entries, comments, block attributes and titles"""
+        self.assertKind(":toc: left", LineKind.ATTRIBUTE_ENTRY)
+        self.assertKind(":!sectnums:", LineKind.ATTRIBUTE_ENTRY)
+        self.assertKind("// note", LineKind.COMMENT)
+        self.assertKind("[source,python]", LineKind.BLOCK_ATTRIBUTES)
+        self.assertKind(".Block title", LineKind.BLOCK_TITLE)
+        self.assertKind("Just text", LineKind.TEXT)
+
+    def test_indent_and_flags(self):
+        """Test indentation and whitespace flags"""
+        _, _, indent, flags = classify_line("  text\tmore ")
+        self.assertEqual(indent, 2)
+        self.assertEqual(flags, TRAILING_WHITESPACE | HAS_TAB)
+        self.assertEqual(classify_line("text")[3], 0)
+
+
+class TestLineTable(unittest.TestCase):
+    """Test the line table of a document"""
+
+    def setUp(self):
+        self.table = LineTable(
+            ["= Title", "", "----", "* not a list", "----", "  * item  "]
+        )
+
+    def test_columns(self):
+        """Test that every line is stored in the compact columns"""
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(
+            list(self.table.kinds),
+            [
+                LineKind.HEADING,
+                LineKind.BLANK,
+                LineKind.DELIMITER,
+                LineKind.LIST_ITEM,
+                LineKind.DELIMITER,
+                LineKind.LIST_ITEM,
+            ],
+        )
+        self.assertEqual(self.table.levels[0], 1)
+        self.assertEqual(self.table.indents[5], 2)
+        self.assertTrue(self.table.flags[5] & TRAILING_WHITESPACE)
+        self.assertTrue(self.table.is_blank(1))
+        self.assertTrue(self.table.startswith(5, "* "))
+
+    def test_line_views(self):
+        """Test that indexing returns the same values as a single LineInfo"""
+        for index, line in enumerate(self.table):
+            single = LineInfo(index, line.text)
+            self.assertEqual(line.index, index)
+            self.assertEqual(
+                (line.stripped, line.kind, line.level, line.indent, line.flags),
+                (
+                    single.stripped,
+                    single.kind,
+                    single.level,
+                    single.indent,
+                    single.flags,
+                ),
+            )
+        self.assertEqual(self.table[-1].index, 5)
+
+    def test_blocks(self):
+        """Test that the delimited blocks are matched for the table"""
+        self.assertIsNone(self.table[1].block)
+        self.assertEqual(self.table[3].block.kind, "listing")
+        self.assertTrue(self.table[4].block.terminated)
+        self.assertIsNone(self.table[5].block)
+
+    def test_line_objects(self):
+        """Test that objects with a content attribute are accepted"""
+
+        class Line:
+            def __init__(self, content):
+                self.content = content
+
+        table = LineTable([Line("text"), Line("")])
+        self.assertEqual(table.texts, ["text", ""])
+        self.assertTrue(table.is_blank(1))
+
+    def test_line_info_derived_values(self):
+        """Test the values derived on demand"""
+        info = self.table[5]
+        self.assertEqual(info.first_char, "*")
+        self.assertEqual(info.lstripped, "* item  ")
+        self.assertEqual(info.stripped, "* item")
+        self.assertTrue(info.trailing_whitespace)
+        self.assertFalse(info.has_tab)
+        self.assertEqual(self.table[1].first_char, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,20 @@
 Tests for the main linter module (linter.py)
 """
 
+import itertools
+
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from asciidoc_linter.linter import AsciiDocLinter
+from asciidoc_linter.blocks import BlockMap
+from asciidoc_linter.buffer import DocumentBuffer
+from asciidoc_linter.cache import ResultCache
+from asciidoc_linter.intervals import LineIntervals
+from asciidoc_linter.linter import AsciiDocLinter, FindingLimits, resolve_jobs
 from asciidoc_linter.parser import AsciiDocParser
 from asciidoc_linter.reporter import LintReport
-from asciidoc_linter.rules.base import Finding, Severity
+from asciidoc_linter.rules.base import Finding, Severity, LineRule, Rule
 
 # Fixtures
 
@@ -68,7 +74,10 @@ def test_lint_string_no_errors(mock_parser, mock_rule):
         findings = linter.lint_string("Some content")
 
         assert len(findings) == 0
-        mock_parser.parse.assert_called_once_with("Some content")
+        mock_parser.parse.assert_called_once()
+        (content,), _ = mock_parser.parse.call_args
+        assert isinstance(content, DocumentBuffer)
+        assert content.text == "Some content"
         mock_rule.check.assert_called_once()
 
 
@@ -107,6 +116,132 @@ def test_lint_string_multiple_rules(mock_parser):
         assert rule2.check.called
 
 
+def test_lint_string_single_pass_matches_rule_check(sample_asciidoc):
+    """Test that the shared line walk reports the same findings as each rule"""
+    content = sample_asciidoc + "\n\n\n# Markdown heading\n1. item  \n"
+    linter = AsciiDocLinter()
+
+    expected = []
+    for rule in AsciiDocLinter().rules:
+        if isinstance(rule, LineRule):
+            expected.extend(rule.check(content.splitlines()))
+        else:
+            expected.extend(rule.check(linter.parser.parse(content)))
+
+    assert linter.lint_string(content) == expected
+
+
+def test_lint_string_reports_unterminated_blocks():
+    """Test that block rules check the lines of the parsed document"""
+    findings = AsciiDocLinter().lint_string("= Title\n\n----\ncode\n")
+    assert [(f.rule_id, f.position.line) for f in findings] == [("BLOCK001", 3)]
+
+
+def test_lint_string_accepts_block_attributes_and_titles():
+    """Test that block attributes and titles are not separated from their block"""
+    content = "= Title\n\n.Example\n[source,python]\n----\nprint('Hello')\n----\n"
+    findings = AsciiDocLinter().lint_string(content)
+    assert [f for f in findings if f.rule_id.startswith("BLOCK")] == []
+
+
+def test_lint_string_matches_blocks_once():
+    """Test that the block rules use the block map of the line table"""
+    matched = []
+    original = BlockMap.__init__
+
+    def init(self, lines):
+        matched.append(self)
+        original(self, lines)
+
+    with patch.object(BlockMap, "__init__", init):
+        findings = AsciiDocLinter().lint_string("= Title\n\n----\ncode\n")
+    assert len(matched) == 1
+    assert [f.rule_id for f in findings] == ["BLOCK001"]
+
+
+def test_lint_string_does_not_build_block_tree():
+    """Test that the rules only use the headers of the parsed document"""
+    with patch("asciidoc_linter.parser._BlockParser.parse") as parse:
+        AsciiDocLinter().lint_string("= Title\n\nSome text\n\n== Section\n")
+    parse.assert_not_called()
+
+
+def test_lint_string_resets_line_rule_state():
+    """Test that line rule state does not leak from one document to the next"""
+    linter = AsciiDocLinter()
+    linter.lint_string("Text\n\n")
+
+    assert linter.lint_string("\nText\n") == []
+
+
+class GeneratorRule(Rule):
+    """A rule yielding its findings lazily and counting them"""
+
+    id = "GEN001"
+
+    def __init__(self):
+        super().__init__()
+        self.yielded = 0
+
+    def check(self, document):
+        for line in range(1, 100):
+            self.yielded += 1
+            yield self.create_finding(line, "Generated")
+
+
+def test_lint_lines_accepts_generator_rules():
+    """Test that rules may yield findings and the order stays by rule"""
+    linter = AsciiDocLinter()
+    rule = GeneratorRule()
+    linter.rules = [rule] + linter.rules
+    findings = linter.lint_lines(["Text  ", "more"])
+
+    assert [f.rule_id for f in findings[:99]] == ["GEN001"] * 99
+    assert [f.rule_id for f in findings[99:]] == ["WS001"]
+
+
+def test_iter_lines_stops_rule_work_early():
+    """Test that a consumer stopping early stops the rules as well"""
+    linter = AsciiDocLinter()
+    rule = GeneratorRule()
+    linter.rules = [rule] + linter.rules
+    linter.parser = Mock(wraps=linter.parser)
+    lines = ["Text  "] + ["text"] * 1000
+
+    findings = linter.iter_lines(lines)
+    first = next(findings)
+    # Line rules report first, the document is not parsed yet
+    assert first.rule_id == "WS001"
+    assert not linter.parser.parse.called
+    assert next(findings).rule_id == "GEN001"
+    assert rule.yielded == 1
+    findings.close()
+
+    assert list(itertools.islice(linter.iter_lines(lines), 3)) == (
+        [first] + linter.lint_lines(lines, [rule])[:2]
+    )
+
+
+def test_iter_lint_reads_files_lazily(tmp_path):
+    """Test that files are only linted as far as findings are consumed"""
+    paths = []
+    for index in range(3):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_text("Text  \n", encoding="utf-8")
+        paths.append(str(test_file))
+    consumed = []
+
+    def file_paths():
+        for path in paths:
+            consumed.append(path)
+            yield path
+
+    findings = AsciiDocLinter().iter_lint(file_paths())
+    assert next(findings).file == paths[0]
+    assert consumed == paths[:1]
+    assert [f.file for f in findings] == paths[1:]
+
+
 # Tests for lint_file method
 
 
@@ -171,13 +306,11 @@ def test_lint_with_config_file(tmp_path, sample_asciidoc):
     test_file.write_text(sample_asciidoc)
 
     config_file = tmp_path / ".asciidoc-lint.yml"
-    config_file.write_text(
-        """
+    config_file.write_text("""
 rules:
   WS001:
     enabled: false
-"""
-    )
+""")
 
     linter = AsciiDocLinter(config_path=config_file)
     report = linter.lint([test_file])
@@ -186,6 +319,124 @@ rules:
     assert len(report.findings) == 0
 
 
+# Tests for parallel linting
+
+
+def test_lint_parallel_matches_serial(tmp_path):
+    """Test that linting with several jobs gives the same report as one job"""
+    files = []
+    for index in range(6):
+        test_file = tmp_path / f"doc{index}.adoc"
+        body = "Text with trailing space \n\n" * (index * 20 + 1)
+        test_file.write_text(f"= Title {index}\n{body}----\nunterminated\n")
+        files.append(test_file)
+    files.insert(2, tmp_path / "missing.adoc")
+
+    serial = AsciiDocLinter().lint(files)
+    parallel = AsciiDocLinter().lint(files, jobs=3)
+
+    assert len(serial.findings) > len(files)
+    assert [f.to_json_object() for f in parallel.findings] == [
+        f.to_json_object() for f in serial.findings
+    ]
+
+
+def test_lint_parallel_uses_linter_config(tmp_path, sample_asciidoc):
+    """Test that worker processes use the configuration of the linter"""
+    files = []
+    for index in range(3):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_text(sample_asciidoc + "trailing \n")
+        files.append(test_file)
+
+    config_file = tmp_path / ".asciidoc-lint.yml"
+    config_file.write_text("rules:\n  WS001:\n    enabled: false\n")
+
+    report = AsciiDocLinter(config_path=config_file).lint(files, jobs=2)
+    assert len(report.findings) == 0
+
+
+def test_resolve_jobs():
+    """Test the conversion of jobs values"""
+    assert resolve_jobs(None) == 1
+    assert resolve_jobs(4) == 4
+    assert resolve_jobs("2") == 2
+    assert resolve_jobs("auto") >= 1
+    with pytest.raises(ValueError):
+        resolve_jobs(0)
+    with pytest.raises(ValueError):
+        resolve_jobs("many")
+
+
+# Tests for the result cache
+
+
+def test_lint_with_cache_matches_uncached(tmp_path):
+    """Test that cached results are reported like fresh ones"""
+    files = []
+    for index in range(3):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_text(f"= Title {index}\nText \n----\n")
+        files.append(test_file)
+    files.append(tmp_path / "missing.adoc")
+    cache_dir = tmp_path / "cache"
+
+    expected = [f.to_json_object() for f in AsciiDocLinter().lint(files).findings]
+    first = AsciiDocLinter().lint(files, cache=ResultCache(cache_dir))
+    cache = ResultCache(cache_dir)
+    second = AsciiDocLinter().lint(files, cache=cache)
+
+    assert [f.to_json_object() for f in first.findings] == expected
+    assert [f.to_json_object() for f in second.findings] == expected
+    assert cache.hits == 3
+
+
+def test_lint_with_cache_lints_identical_files_once(tmp_path):
+    """Test that copies of a file are linted only once"""
+    files = []
+    for index in range(3):
+        test_file = tmp_path / f"copy{index}.adoc"
+        test_file.write_text("= Title\nText \n")
+        files.append(test_file)
+
+    linter = AsciiDocLinter()
+    with patch.object(linter, "lint_data", wraps=linter.lint_data) as lint_data:
+        report = linter.lint(files, cache=ResultCache(tmp_path / "cache"))
+
+    assert lint_data.call_count == 1
+    assert sorted({f.file for f in report.findings}) == [str(f) for f in files]
+
+
+def test_lint_with_cache_detects_config_changes(tmp_path, sample_asciidoc):
+    """Test that a different configuration does not use cached results"""
+    test_file = tmp_path / "test.adoc"
+    test_file.write_text(sample_asciidoc + "trailing \n")
+    config_file = tmp_path / ".asciidoc-lint.yml"
+    config_file.write_text("rules:\n  WS001:\n    severity: error\n")
+    cache_dir = tmp_path / "cache"
+
+    default = AsciiDocLinter().lint([test_file], cache=ResultCache(cache_dir))
+    configured = AsciiDocLinter(config_path=config_file).lint(
+        [test_file], cache=ResultCache(cache_dir)
+    )
+
+    assert default.findings[0].severity == Severity.WARNING
+    assert configured.findings[0].severity == Severity.ERROR
+
+
+def test_lint_parallel_with_cache(tmp_path):
+    """Test that files missing from the cache can be linted in parallel"""
+    files = []
+    for index in range(4):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_text(f"= Title {index}\n" + "Text \n" * index)
+        files.append(test_file)
+
+    expected = [f.to_json_object() for f in AsciiDocLinter().lint(files).findings]
+    report = AsciiDocLinter().lint(files, jobs=2, cache=ResultCache(tmp_path / "cache"))
+    assert [f.to_json_object() for f in report.findings] == expected
+
+
 # Tests for UTF-8 encoding support (Issue #24)
 
 
@@ -266,13 +517,13 @@ def test_lint_file_uses_explicit_utf8_encoding(tmp_path):
 
     linter = AsciiDocLinter()
 
-    # Mock Path.read_text to verify encoding parameter is passed
-    with patch.object(Path, "read_text") as mock_read_text:
-        mock_read_text.return_value = "= Title\n\nContent\n"
+    # The file is read as bytes and decoded as UTF-8, whatever the locale
+    with patch.object(
+        DocumentBuffer, "from_bytes", wraps=DocumentBuffer.from_bytes
+    ) as from_bytes:
         linter.lint_file(test_file)
 
-        # Verify read_text was called with encoding='utf-8'
-        mock_read_text.assert_called_once_with(encoding="utf-8")
+        from_bytes.assert_called_once_with(b"= Title\n\nContent\n")
 
 
 def test_load_config_uses_explicit_utf8_encoding(tmp_path):
@@ -300,3 +551,148 @@ def test_load_config_uses_explicit_utf8_encoding(tmp_path):
     assert len(config_call) == 1
     # Verify encoding='utf-8' was passed
     assert config_call[0][1].get("encoding") == "utf-8"
+
+
+def test_lint_changes_reports_changed_lines_only(tmp_path):
+    """Test that only findings on changed lines are reported"""
+    test_file = tmp_path / "test.adoc"
+    test_file.write_text("Old text  \n\nNew text  \n\nMore new text  \n")
+    changes = {str(test_file): LineIntervals([(3, 5)])}
+
+    for jobs, cache in [(1, None), (2, None), (1, ResultCache(tmp_path / "cache"))]:
+        report = AsciiDocLinter().lint(
+            [test_file], jobs=jobs, cache=cache, changes=changes
+        )
+        assert [f.position.line for f in report.findings] == [3, 5]
+
+
+def test_lint_changes_skips_heading_rules_without_changed_titles():
+    """Test that rules on section titles only run if a title changed"""
+    linter = AsciiDocLinter()
+    checked = []
+    for rule in linter.rules:
+        rule.check = lambda document, rule_id=rule.id: checked.append(rule_id) or []
+    content = "= Title\n\nText\n"
+
+    linter.lint_changes(content, LineIntervals([(3, 3)]))
+    assert "HEAD001" not in checked
+    linter.lint_changes(content, LineIntervals([(1, 1)]))
+    assert "HEAD001" in checked
+
+
+def test_lint_contents_matches_lint(tmp_path):
+    """Test that linting given contents reports like linting the files"""
+    files = []
+    for index in range(4):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_bytes(b"= Title\r\n\nText  \n" * (index + 1))
+        files.append(test_file)
+    contents = [(str(test_file), test_file.read_bytes()) for test_file in files]
+
+    expected = [f.to_json_object() for f in AsciiDocLinter().lint(files).findings]
+    assert expected
+    for jobs, cache in [(1, None), (2, None), (2, ResultCache(tmp_path / "cache"))]:
+        report = AsciiDocLinter().lint_contents(contents, jobs=jobs, cache=cache)
+        assert [f.to_json_object() for f in report.findings] == expected
+
+
+# Tests for finding limits
+
+
+def write_limited_files(tmp_path, count=4):
+    files = []
+    for index in range(count):
+        test_file = tmp_path / f"doc{index}.adoc"
+        test_file.write_text("Text  \n" * 5 + "----\n", encoding="utf-8")
+        files.append(str(test_file))
+    return files
+
+
+def assert_in_order(findings, full):
+    """Assert that findings are some of the full findings, in the same order"""
+    remaining = iter([f.to_json_object() for f in full])
+    assert all(f.to_json_object() in remaining for f in findings)
+
+
+def test_lint_stops_at_max_findings(tmp_path):
+    """Test that linting stops once the total limit is reached"""
+    files = write_limited_files(tmp_path)
+    consumed = []
+
+    def file_paths():
+        for path in files:
+            consumed.append(path)
+            yield path
+
+    for jobs in (1, 2):
+        full = AsciiDocLinter().lint(files, jobs=jobs)
+        assert not full.truncated
+        report = AsciiDocLinter().lint(
+            file_paths(), jobs=jobs, limits=FindingLimits(max_findings=8)
+        )
+        assert report.truncated
+        assert len(report.findings) == 8
+        # Rules stop at the limit, so these need not be the first findings
+        assert_in_order(report.findings, full.findings)
+        assert {f.file for f in report.findings} < set(files)
+    # Only the next path is taken to see whether files are left out
+    consumed.clear()
+    with patch.object(DocumentBuffer, "from_file", wraps=DocumentBuffer.from_file):
+        report = AsciiDocLinter().lint(
+            file_paths(), limits=FindingLimits(max_findings=3)
+        )
+        assert DocumentBuffer.from_file.call_count == 1
+    assert len(report.findings) == 3
+    assert consumed == files[:2]
+
+
+def test_lint_limits_findings_per_file(tmp_path):
+    """Test that each file reports at most the given number of findings"""
+    files = write_limited_files(tmp_path, 3)
+    full = AsciiDocLinter().lint(files)
+    for jobs in (1, 2):
+        report = AsciiDocLinter().lint(
+            files, jobs=jobs, limits=FindingLimits(max_file_findings=2)
+        )
+        assert report.truncated
+        assert [len(found) for found in report.grouped_findings().values()] == [2] * 3
+        assert_in_order(report.findings, full.findings)
+
+
+def test_finding_limits_stop_rule_work():
+    """Test that the rules of a file stop once its limit is reached"""
+    linter = AsciiDocLinter()
+    rule = GeneratorRule()
+    linter.rules = [rule]
+    limits = FindingLimits(max_findings=5)
+    findings = limits.take(linter._walk(["text"], linter.rules, None))
+
+    assert len(findings) == 5
+    assert rule.yielded == 6
+    assert limits.reached and limits.truncated
+
+
+def test_finding_limits_not_reached(tmp_path):
+    """Test that a report is complete when the limit is not exceeded"""
+    files = write_limited_files(tmp_path, 1)
+    findings = AsciiDocLinter().lint(files).findings
+    for cache in (None, ResultCache(tmp_path / "cache")):
+        report = AsciiDocLinter().lint(
+            files, cache=cache, limits=FindingLimits(max_findings=len(findings))
+        )
+        assert not report.truncated
+        assert len(report.findings) == len(findings)
+
+
+def test_lint_contents_with_limits(tmp_path):
+    """Test that limits apply to linting given contents"""
+    files = write_limited_files(tmp_path)
+    contents = [(path, Path(path).read_bytes()) for path in files]
+    full = AsciiDocLinter().lint(files)
+    for jobs, cache in [(1, None), (2, None), (1, ResultCache(tmp_path / "cache"))]:
+        report = AsciiDocLinter().lint_contents(
+            contents, jobs=jobs, cache=cache, limits=FindingLimits(max_findings=9)
+        )
+        assert report.truncated
+        assert len(report.findings) == 9
+        assert_in_order(report.findings, full.findings)
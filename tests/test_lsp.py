@@ -0,0 +1,253 @@
+# test_lsp.py - Tests for the language server
+"""Tests for the language server (lsp.py)"""
+
+import io
+import os
+import threading
+import time
+import unittest
+
+from asciidoc_linter.lsp import (
+    LanguageServer,
+    read_message,
+    utf16_index,
+    utf16_length,
+    write_message,
+)
+
+URI = "file:///tmp/doc.adoc"
+
+
+def encode(*messages):
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, message)
+    return stream.getvalue()
+
+
+def decode(data):
+    stream = io.BytesIO(data)
+    messages = []
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def request(request_id, method, params=None):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+def notification(method, params):
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def change(start, end, text, version):
+    return notification(
+        "textDocument/didChange",
+        {
+            "textDocument": {"uri": URI, "version": version},
+            "contentChanges": [
+                {
+                    "range": {
+                        "start": {"line": start[0], "character": start[1]},
+                        "end": {"line": end[0], "character": end[1]},
+                    },
+                    "text": text,
+                }
+            ],
+        },
+    )
+
+
+def open_document(text):
+    return notification(
+        "textDocument/didOpen",
+        {
+            "textDocument": {
+                "uri": URI,
+                "languageId": "asciidoc",
+                "version": 1,
+                "text": text,
+            }
+        },
+    )
+
+
+class TestMessages(unittest.TestCase):
+    """Test the message framing and position conversion"""
+
+    def test_round_trip(self):
+        message = request(1, "initialize", {"text": "äöü"})
+        self.assertEqual(decode(encode(message, message)), [message, message])
+
+    def test_header_case(self):
+        body = b'{"id":1}'
+        stream = io.BytesIO(b"content-length: 8\r\n\r\n" + body)
+        self.assertEqual(read_message(stream), {"id": 1})
+
+    def test_utf16(self):
+        text = "a\U0001f600b"
+        self.assertEqual(utf16_length(text), 4)
+        self.assertEqual(utf16_index(text, 3), 2)
+        self.assertEqual(utf16_index(text, 10), 3)
+        self.assertEqual(utf16_index("abc", 10), 3)
+
+
+class TestLanguageServer(unittest.TestCase):
+    """Test the server by handling messages directly"""
+
+    def setUp(self):
+        self.output = io.BytesIO()
+        self.server = LanguageServer(debounce=0, output_stream=self.output)
+
+    def messages(self):
+        messages = decode(self.output.getvalue())
+        self.output.seek(0)
+        self.output.truncate()
+        return messages
+
+    def diagnostics(self):
+        self.server.flush()
+        published = [
+            message["params"]
+            for message in self.messages()
+            if message.get("method") == "textDocument/publishDiagnostics"
+        ]
+        self.assertEqual(len(published), 1)
+        return published[0]
+
+    def test_initialize(self):
+        self.server.handle(request(1, "initialize", {"capabilities": {}}))
+        response = self.messages()[0]
+        self.assertEqual(response["id"], 1)
+        capabilities = response["result"]["capabilities"]
+        self.assertEqual(capabilities["textDocumentSync"]["change"], 2)
+        self.assertEqual(capabilities["positionEncoding"], "utf-16")
+
+    def test_initialize_utf32(self):
+        general = {"positionEncodings": ["utf-16", "utf-32"]}
+        self.server.handle(
+            request(1, "initialize", {"capabilities": {"general": general}})
+        )
+        capabilities = self.messages()[0]["result"]["capabilities"]
+        self.assertEqual(capabilities["positionEncoding"], "utf-32")
+        self.assertFalse(self.server.utf16)
+
+    def test_unknown_request(self):
+        self.server.handle(request(7, "textDocument/hover", {}))
+        self.assertEqual(self.messages()[0]["error"]["code"], -32601)
+
+    def test_diagnostics_after_open_and_change(self):
+        self.server.handle(open_document("= Title\n\nText  \n"))
+        params = self.diagnostics()
+        self.assertEqual(params["uri"], URI)
+        self.assertEqual(params["version"], 1)
+        diagnostic = params["diagnostics"][0]
+        self.assertEqual(diagnostic["code"], "WS001")
+        self.assertEqual(diagnostic["severity"], 2)
+        self.assertEqual(diagnostic["range"]["start"], {"line": 2, "character": 0})
+        self.assertEqual(diagnostic["range"]["end"], {"line": 2, "character": 6})
+
+        # Remove the trailing whitespace and add a tab on a new line
+        self.server.handle(change((2, 4), (2, 6), "\n\tMore", 2))
+        self.assertEqual(
+            self.server.documents[URI].document.text, "= Title\n\nText\n\tMore\n"
+        )
+        params = self.diagnostics()
+        self.assertEqual(params["version"], 2)
+        self.assertEqual(
+            [
+                diagnostic["range"]["start"]["line"]
+                for diagnostic in params["diagnostics"]
+            ],
+            [3],
+        )
+
+    def test_change_with_surrogate_pairs(self):
+        self.server.handle(open_document("\U0001f600 x\n"))
+        self.server.handle(change((0, 3), (0, 4), "y", 2))
+        self.assertEqual(self.server.documents[URI].document.text, "\U0001f600 y\n")
+
+    def test_full_change(self):
+        self.server.handle(open_document("Text\n"))
+        self.diagnostics()
+        self.server.handle(
+            notification(
+                "textDocument/didChange",
+                {
+                    "textDocument": {"uri": URI, "version": 2},
+                    "contentChanges": [{"text": "Text  \n"}],
+                },
+            )
+        )
+        self.assertEqual(len(self.diagnostics()["diagnostics"]), 1)
+
+    def test_close_clears_diagnostics(self):
+        self.server.handle(open_document("Text  \n"))
+        self.server.handle(
+            notification("textDocument/didClose", {"textDocument": {"uri": URI}})
+        )
+        self.assertEqual(self.diagnostics()["diagnostics"], [])
+        self.assertNotIn(URI, self.server.documents)
+
+    def test_stale_run_is_abandoned(self):
+        self.server.handle(open_document("Text  \n"))
+        self.server.flush()
+        self.messages()
+        open_document_ = self.server.documents[URI]
+        open_document_.document.replace_lines(0, 1, ["Text\t"])
+        update = open_document_.document.update
+
+        def update_during_change(cancelled=None):
+            open_document_.changes += 1  # A change arrives while linting
+            return update(cancelled)
+
+        open_document_.document.update = update_during_change
+        self.assertFalse(self.server.lint(open_document_))
+        self.assertEqual(self.messages(), [])
+
+
+class TestServe(unittest.TestCase):
+    """Test the server reading from a pipe with the lint thread running"""
+
+    def test_session(self):
+        read_fd, write_fd = os.pipe()
+        output = io.BytesIO()
+        server = LanguageServer(
+            debounce=0.01, input_stream=os.fdopen(read_fd, "rb"), output_stream=output
+        )
+        exit_codes = []
+        thread = threading.Thread(target=lambda: exit_codes.append(server.serve()))
+        thread.start()
+
+        with os.fdopen(write_fd, "wb") as client:
+            client.write(encode(request(1, "initialize", {}), open_document("Text  ")))
+            client.flush()
+            for _ in range(500):
+                if b"publishDiagnostics" in output.getvalue():
+                    break
+                time.sleep(0.01)
+            client.write(encode(request(2, "shutdown"), notification("exit", None)))
+
+        thread.join(5)
+        self.assertEqual(exit_codes, [0])
+        messages = decode(output.getvalue())
+        self.assertEqual(messages[0]["id"], 1)
+        published = [
+            message for message in messages if message.get("method") is not None
+        ]
+        self.assertEqual(published[0]["params"]["diagnostics"][0]["code"], "WS001")
+        self.assertEqual(messages[-1], {"jsonrpc": "2.0", "id": 2, "result": None})
+
+    def test_exit_without_shutdown(self):
+        server = LanguageServer(
+            input_stream=io.BytesIO(encode(notification("exit", None))),
+            output_stream=io.BytesIO(),
+        )
+        self.assertEqual(server.serve(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
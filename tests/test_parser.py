@@ -0,0 +1,176 @@
+# test_parser.py - Tests for the AsciiDoc parser
+"""Tests for the block parser (parser.py)"""
+
+import unittest
+from asciidoc_linter.parser import (
+    AsciiDocParser,
+    AttributeEntry,
+    Block,
+    BlockAttributes,
+    BlockMacro,
+    CodeBlock,
+    Header,
+    ListBlock,
+    ListItem,
+    Paragraph,
+    Section,
+    Table,
+    split_lines,
+)
+
+SAMPLE = """= Document Title
+:toc: left
+
+== First Section
+
+Some text
+spanning two lines.
+
+[source,python]
+----
+== not a section
+----
+
+* item one
+* item two
+continued text
+
+=== Nested Section
+
+[cols="1,2,3"]
+|===
+|a |b |c
+|===
+
+== Second Section
+
+====
+Example text
+====
+
+image::diagram.png[Diagram]
+"""
+
+
+class TestAsciiDocParser(unittest.TestCase):
+    """Test the block tree produced by the parser"""
+
+    def setUp(self):
+        self.document = AsciiDocParser().parse(SAMPLE)
+
+    def test_sections(self):
+        """Test that sections are nested by level"""
+        title = self.document.blocks[0]
+        self.assertIsInstance(title, Section)
+        self.assertEqual(title.title, "Document Title")
+
+        sections = [c for c in title.children if isinstance(c, Section)]
+        self.assertEqual(
+            [s.title for s in sections], ["First Section", "Second Section"]
+        )
+        nested = [c for c in sections[0].children if isinstance(c, Section)]
+        self.assertEqual(nested[0].level, 3)
+        self.assertEqual(sections[0].end_line, 23)
+
+    def test_document_lists_headers(self):
+        """Test that the document is the list of headers outside code blocks"""
+        self.assertTrue(all(isinstance(h, Header) for h in self.document))
+        self.assertEqual([h.line_number for h in self.document], [1, 4, 18, 25])
+        self.assertEqual(
+            [h.line_number for h in self.document],
+            [h.line_number for h in self.document.find_all(Header)],
+        )
+
+    def test_blocks_are_built_on_first_use(self):
+        """Test that listing the headers does not build the block tree"""
+        document = AsciiDocParser().parse(SAMPLE)
+        self.assertEqual(len(document), 4)
+        self.assertIsNone(document._blocks)
+        self.assertIs(document.blocks, document.blocks)
+
+    def test_attribute_entry(self):
+        """Test attribute entries"""
+        entry = self.document.find_all(AttributeEntry)[0]
+        self.assertEqual((entry.name, entry.value), ("toc", "left"))
+
+    def test_paragraph_source_range(self):
+        """Test line range and offsets of a paragraph"""
+        paragraph = self.document.find_all(Paragraph)[0]
+        self.assertEqual((paragraph.line_number, paragraph.end_line), (6, 7))
+        self.assertEqual(paragraph.content, "Some text\nspanning two lines.")
+        self.assertEqual(
+            SAMPLE[paragraph.start_offset : paragraph.end_offset], paragraph.content
+        )
+
+    def test_code_block(self):
+        """Test that code blocks take the language from the block attributes"""
+        attributes = self.document.find_all(BlockAttributes)[0]
+        self.assertEqual(attributes.attributes, "source,python")
+        code = self.document.find_all(CodeBlock)[0]
+        self.assertEqual(code.language, "python")
+        self.assertEqual((code.line_number, code.end_line), (10, 12))
+        self.assertTrue(code.terminated)
+
+    def test_list(self):
+        """Test list items and item text spanning several lines"""
+        lists = self.document.find_all(ListBlock)
+        self.assertEqual(len(lists), 1)
+        items = lists[0].children
+        self.assertTrue(all(isinstance(item, ListItem) for item in items))
+        self.assertEqual(items[1].content, "* item two\ncontinued text")
+        self.assertEqual(lists[0].end_line, 16)
+
+    def test_table(self):
+        """Test that tables know their number of columns"""
+        table = self.document.find_all(Table)[0]
+        self.assertEqual(table.columns, 3)
+        self.assertEqual(table.kind, "table")
+
+    def test_compound_block_and_macro(self):
+        """Test example blocks and block macros"""
+        block = self.document.find_all(Block)[0]
+        self.assertEqual(block.kind, "example")
+        self.assertIsInstance(block.children[0], Paragraph)
+        macro = self.document.find_all(BlockMacro)[0]
+        self.assertEqual((macro.name, macro.target), ("image", "diagram.png"))
+
+    def test_unterminated_block(self):
+        """Test that unterminated blocks extend to the end of the document"""
+        document = AsciiDocParser().parse("----\ncode\nmore code")
+        block = document.blocks[0]
+        self.assertFalse(block.terminated)
+        self.assertEqual(block.end_line, 3)
+
+    def test_indented_delimiter_is_content(self):
+        """Test that indented delimiter lines neither close nor open blocks"""
+        document = AsciiDocParser().parse("----\n  ----\ncode\n----\n\n  ====")
+        self.assertEqual(len(document.blocks), 2)
+        self.assertEqual(document.blocks[0].end_line, 4)
+        self.assertIsInstance(document.blocks[1], Paragraph)
+
+    def test_table_columns_from_first_row(self):
+        """Test column counting without cols attribute"""
+        document = AsciiDocParser().parse("|===\n\n|a |b\n|===")
+        self.assertEqual(document.blocks[0].columns, 2)
+
+    def test_list_continuation(self):
+        """Test that blocks attached with + belong to the list item"""
+        document = AsciiDocParser().parse("* item\n+\n----\ncode\n----\n* next")
+        items = document.blocks[0].children
+        self.assertEqual(len(items), 2)
+        self.assertIsInstance(items[0].children[0], CodeBlock)
+
+
+class TestSplitLines(unittest.TestCase):
+    """Test splitting content into lines with offsets"""
+
+    def test_split_lines_matches_splitlines(self):
+        """Test that lines match str.splitlines for mixed line endings"""
+        content = "a\r\nb\n\nc\rd"
+        lines, offsets = split_lines(content)
+        self.assertEqual(lines, content.splitlines())
+        self.assertEqual(offsets, [0, 3, 5, 6, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,18 @@
 Tests for the reporter module that handles formatting of lint results
 """
 
+import io
 import json
 import pytest
-from asciidoc_linter.rules.base import Finding, Severity, Position
+from asciidoc_linter.rules.base import Finding, Severity, Position, Rule
 from asciidoc_linter.reporter import (
     LintReport,
     ConsoleReporter,
     JsonReporter,
     HtmlReporter,
+    JsonLinesReporter,
+    SarifReporter,
+    TRUNCATED_NOTE,
 )
 
 # Test Data
@@ -130,6 +134,28 @@ def test_console_reporter_empty_colored(empty_report):
     assert output == "\033[32m✓ No issues found\033[0m"
 
 
+def test_console_reporter_writes_files(sample_report, sample_finding):
+    """Test that the findings of a file are written as the file is done"""
+    reporter = ConsoleReporter(enable_color=False)
+    output = io.StringIO()
+    written = []
+
+    def results():
+        for findings in sample_report.grouped_findings().values():
+            yield findings
+            written.append(len(output.getvalue()))
+
+    assert reporter.write_results(results(), output) == 3
+    reporter.write_end(output, False)
+    assert written[0] > 0
+    assert output.getvalue() == reporter.format_report(sample_report) + "\n"
+
+    output = io.StringIO()
+    reporter.write_results([], output)
+    reporter.write_end(output, False)
+    assert output.getvalue() == "✓ No issues found\n"
+
+
 # Test JSON Reporter
 
 
@@ -151,17 +177,148 @@ def test_json_reporter(sample_report):
     assert data["findings"][2]["column"] is None
 
 
+def test_reporters_mark_truncated_reports(sample_finding):
+    """Test that a report cut off at a finding limit says so"""
+    report = LintReport([sample_finding], truncated=True)
+    assert json.loads(JsonReporter().format_report(report))["truncated"] is True
+    assert (
+        json.loads(JsonReporter().format_report(LintReport([])))["truncated"] is False
+    )
+    assert ConsoleReporter(False).format_report(report).endswith(TRUNCATED_NOTE)
+    assert TRUNCATED_NOTE in HtmlReporter().format_report(report)
+
+
+# Test JSON Lines Reporter
+
+
+def test_jsonl_reporter(sample_report):
+    """Test that every finding is a compact JSON line, followed by a summary"""
+    lines = JsonLinesReporter().format_report(sample_report).splitlines()
+    assert len(lines) == 4
+    assert '": ' not in lines[0] and ", " not in lines[0]
+    records = [json.loads(line) for line in lines]
+    assert records[:3] == [f.to_json_object() for f in sample_report.findings]
+    assert records[3] == {"summary": {"findings": 3, "files": 2, "truncated": False}}
+
+
+def test_jsonl_reporter_writes_results(sample_finding):
+    """Test that the findings of files are written as they arrive"""
+    output = io.StringIO()
+    written = []
+
+    def results():
+        yield [sample_finding, sample_finding]
+        written.append(output.getvalue().count("\n"))
+        yield []
+
+    reporter = JsonLinesReporter()
+    assert reporter.write_results(results(), output) == 2
+    assert written == [2]
+    reporter.write_end(output, True)
+    assert json.loads(output.getvalue().splitlines()[-1]) == {
+        "summary": {"findings": 2, "files": 1, "truncated": True}
+    }
+
+
+# Test SARIF Reporter
+
+
+class SampleRule(Rule):
+    id = "TEST001"
+    name = "Test Rule"
+    description = "Checks for tests"
+    severity = Severity.ERROR
+
+
+def test_sarif_reporter(sample_report):
+    """Test that results refer to rules and files by index"""
+    rules = [SampleRule(), SampleRule()]
+    log = json.loads(SarifReporter(rules).format_report(sample_report))
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    assert run["tool"]["driver"]["rules"] == [
+        {
+            "id": "TEST001",
+            "name": "Test Rule",
+            "shortDescription": {"text": "Checks for tests"},
+            "defaultConfiguration": {"level": "error"},
+        }
+    ]
+    assert run["artifacts"] == [{"location": {"uri": "test.adoc"}}]
+    assert run["properties"] == {"truncated": False}
+    first, second, third = run["results"]
+    assert first == {
+        "ruleId": "TEST001",
+        "ruleIndex": 0,
+        "level": "error",
+        "message": {"text": "Test error message"},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "test.adoc", "index": 0},
+                    "region": {"startLine": 42, "startColumn": 3},
+                }
+            }
+        ],
+    }
+    assert second["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "test.adoc", "index": 0}
+    }
+    assert "locations" not in third and "ruleId" not in third
+
+
+def test_sarif_reporter_writes_results(sample_finding):
+    """Test that a SARIF log written file by file is valid"""
+    other = Finding("Other", Severity.INFO, Position(1), "TEST002", file="/a b.adoc")
+    output = io.StringIO()
+    reporter = SarifReporter()
+    assert reporter.write_results([[sample_finding], [], [other]], output) == 2
+    reporter.write_end(output, True)
+    run = json.loads(output.getvalue())["runs"][0]
+    assert [r["level"] for r in run["results"]] == ["error", "note"]
+    assert run["artifacts"][1] == {"location": {"uri": "file:///a%20b.adoc"}}
+    assert run["properties"] == {"truncated": True}
+    assert (
+        json.loads(SarifReporter().format_report(LintReport([])))["runs"][0]["results"]
+        == []
+    )
+
+
 # Test HTML Reporter
 
 
+def html_data(output, element_id):
+    start = output.index(f'<script type="application/json" id="{element_id}">')
+    start = output.index(">", start) + 1
+    return json.loads(output[start : output.index("</script>", start)])
+
+
 def test_html_reporter(sample_report):
-    """Test HTML formatting of a report"""
+    """Test that findings are embedded as rows with counts"""
     reporter = HtmlReporter()
-    lines = reporter.format_report(sample_report).split("\n")
-    assert "<td>error</td>" in lines
-    assert "<td>TEST001</td>" in lines
-    assert "<td>test.adoc, line 42, column 3</td>" in lines
-    assert "<td>Test error message</td>" in lines
+    output = reporter.format_report(sample_report)
+    summary = html_data(output, "summary")
+    assert html_data(output, "findings") == [
+        [0, 42, 3, 0, 0, 0],
+        [0, None, None, 1, 1, 1],
+        [1, None, None, 1, 1, 2],
+    ]
+    assert summary["files"] == ["test.adoc", None]
+    assert summary["file_counts"] == [2, 1]
+    assert summary["rules"] == ["TEST001", None]
+    assert summary["rule_counts"] == [1, 2]
+    assert summary["severity_counts"] == [1, 2, 0]
+    assert summary["messages"][0] == "Test error message"
+    assert summary["findings"] == 3
+    assert "<th>Rule ID</th>" in output
+
+
+def test_html_reporter_escapes_script_end():
+    """Test that messages cannot end the embedded data early"""
+    finding = Finding("<b>a</script>", Severity.WARNING, file="a.adoc")
+    output = HtmlReporter().format_report(LintReport([finding]))
+    assert "\\u003cb>a\\u003c/script>" in output
+    assert html_data(output, "summary")["messages"] == ["<b>a</script>"]
 
 
 def test_html_reporter_styling(sample_report):
@@ -0,0 +1,151 @@
+# test_stream.py - Tests for linting streamed documents
+"""Tests for linting documents line by line (stream.py)"""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from asciidoc_linter.line_table import LineInfo
+from asciidoc_linter.linter import AsciiDocLinter
+from asciidoc_linter.rules.base import LineRule
+from asciidoc_linter.stream import (
+    LineWindow,
+    can_stream,
+    read_lines,
+    run_streaming_rules,
+)
+
+LINES = [
+    "",
+    "= Title",
+    "=Missing space",
+    "----",
+    "|===",
+    "| a | b |",
+    "|---|---|",
+    "*item",
+    "Text with trailing space ",
+    "\tTabbed",
+    "NOTE: Admonition",
+    "# Markdown heading",
+    "1. numbered",
+    "**Term**",
+    "{counter:a}",
+    "////",
+]
+
+
+def finding_keys(findings):
+    return sorted(
+        (finding.position.line, finding.rule_id, finding.message)
+        for finding in findings
+    )
+
+
+class WindowRecorder(LineRule):
+    """A rule recording how many lines are held while visiting a line"""
+
+    id = "TEST"
+    window = (2, 1)
+
+    def start_document(self, lines):
+        self.lines = lines
+        self.held = []
+
+    def visit_line(self, line):
+        self.held.append(len(self.lines.lines))
+        self.lines[line.index - 2 if line.index >= 2 else 0]
+        if line.index + 1 < len(self.lines):
+            self.lines[line.index + 1]
+        return None
+
+
+class TestStreaming(unittest.TestCase):
+    """Test linting documents line by line"""
+
+    def setUp(self):
+        self.linter = AsciiDocLinter()
+        self.rules = self.linter.streaming_rules()
+
+    def test_streaming_rules(self):
+        self.assertEqual(
+            [rule.id for rule in self.rules],
+            ["WS001", "FMT004", "FMT001", "FMT002", "FMT003", "FMT005"],
+        )
+        self.assertFalse(any(can_stream(rule) for rule in self.linter.rules[:5]))
+
+    def test_findings_match_lint_lines(self):
+        generator = random.Random(5)
+        for _ in range(300):
+            lines = [generator.choice(LINES) for _ in range(generator.randint(0, 30))]
+            self.assertEqual(
+                finding_keys(self.linter.lint_stream(iter(lines))),
+                finding_keys(self.linter.lint_lines(lines, self.rules)),
+                lines,
+            )
+
+    def test_window_is_bounded(self):
+        rule = WindowRecorder()
+        list(run_streaming_rules([rule], (f"line {i}" for i in range(100))))
+        self.assertEqual(len(rule.held), 100)
+        self.assertLessEqual(max(rule.held), 4)
+
+    def test_lines_outside_of_the_window(self):
+        window = LineWindow(2)
+        for index in range(5):
+            window.append(LineInfo(index, "text"))
+        self.assertEqual(len(window), 5)
+        self.assertEqual(window[3].index, 3)
+        self.assertEqual(window[-1].index, 4)
+        with self.assertRaises(IndexError):
+            window[2]
+        with self.assertRaises(IndexError):
+            window[5]
+
+    def test_rules_without_window_are_rejected(self):
+        rule = WindowRecorder()
+        rule.window = None
+        with self.assertRaises(ValueError):
+            list(run_streaming_rules([rule], ["text"]))
+
+    def test_findings_are_yielded_while_reading(self):
+        read = []
+
+        def lines():
+            for index in range(1000):
+                read.append(index)
+                yield "trailing " if index == 10 else "text"
+
+        findings = self.linter.lint_stream(lines())
+        finding = next(findings)
+        self.assertEqual(finding.position.line, 11)
+        self.assertLess(len(read), 20)
+
+    def test_read_lines(self):
+        text = "a\r\nb\rc\x0cd\n\ne"
+        file = io.TextIOWrapper(io.BytesIO(text.encode("utf-8")), encoding="utf-8")
+        self.assertEqual(list(read_lines(file)), ["a", "b", "c", "d", "", "e"])
+
+    def test_stream_file(self):
+        handle, path = tempfile.mkstemp(suffix=".adoc")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "wb") as file:
+            file.write(b"= Title\r\n\r\ntext \r\n")
+        findings = list(self.linter.stream_file(path))
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(findings[0].file, path)
+        self.assertEqual(findings[0].position.line, 3)
+
+        report = self.linter.lint([path, path], jobs=2, stream=True)
+        self.assertEqual(len(report.findings), 2)
+
+    def test_stream_file_errors(self):
+        findings = list(self.linter.stream_file("missing.adoc"))
+        self.assertEqual(len(findings), 1)
+        self.assertIn("Error linting file", findings[0].message)
+
+
+if __name__ == "__main__":
+    unittest.main()
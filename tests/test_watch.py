@@ -0,0 +1,121 @@
+# test_watch.py - Tests for watch mode
+"""Tests for linting files again when they change (watch.py)"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from asciidoc_linter.linter import AsciiDocLinter
+from asciidoc_linter.reporter import ConsoleReporter
+from asciidoc_linter.watch import Watcher
+
+
+class TestWatcher(unittest.TestCase):
+    """Test polling for changes"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.linted = []
+        self.linter = AsciiDocLinter()
+        lint_data = self.linter.lint_data
+
+        def recording_lint_data(path, data):
+            self.linted.append(os.path.basename(path))
+            return lint_data(path, data)
+
+        self.linter.lint_data = recording_lint_data
+        self.write("main.adoc", "= Main\n\ninclude::parts/note.txt[]\n")
+        self.write("other.adoc", "Text  \n")
+        self.write("parts/note.txt", "Note\n")
+        self.watcher = Watcher(self.linter, [self.root])
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, path, content):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        # Make sure the change is visible within the file system resolution
+        os.utime(path, ns=(previous + 10**9, previous + 10**9))
+
+    def poll(self):
+        self.linted.clear()
+        added, resolved = self.watcher.poll()
+        return (
+            [finding.position.line for finding in added],
+            [finding.position.line for finding in resolved],
+        )
+
+    def test_start(self):
+        report = self.watcher.start()
+        self.assertEqual([f.rule_id for f in report.findings], ["WS001"])
+        self.assertEqual(sorted(self.linted), ["main.adoc", "other.adoc"])
+
+    def test_nothing_changed(self):
+        self.watcher.start()
+        self.assertEqual(self.poll(), ([], []))
+        self.assertEqual(self.linted, [])
+
+    def test_changed_document(self):
+        self.watcher.start()
+        self.write("other.adoc", "New line  \nText  \nFixed\n")
+        # The finding of the moved line is neither new nor resolved
+        self.assertEqual(self.poll(), ([1], []))
+        self.assertEqual(self.linted, ["other.adoc"])
+        self.write("other.adoc", "Fixed\n")
+        self.assertEqual(self.poll(), ([], [1, 2]))
+
+    def test_changed_include_relints_includer(self):
+        self.watcher.start()
+        self.write("parts/note.txt", "Changed note\n")
+        self.poll()
+        self.assertEqual(self.linted, ["main.adoc"])
+
+    def test_new_and_removed_documents(self):
+        self.watcher.start()
+        self.write("new.adoc", "Text  \n")
+        self.assertEqual(self.poll(), ([1], []))
+        self.assertEqual(self.linted, ["new.adoc"])
+        os.remove(os.path.join(self.root, "other.adoc"))
+        self.assertEqual(self.poll(), ([], [1]))
+        self.assertEqual(self.linted, [])
+
+    def test_changed_parent_ignore_file(self):
+        os.makedirs(os.path.join(self.root, ".git", "info"))
+        self.watcher = Watcher(self.linter, [os.path.join(self.root, "parts")])
+        self.write("parts/part.adoc", "Text  \n")
+        self.watcher.start()
+        self.write(".gitignore", "part.adoc\n")
+        self.assertEqual(self.poll(), ([], [1]))
+        os.remove(os.path.join(self.root, ".gitignore"))
+        self.assertEqual(self.poll(), ([1], []))
+
+    def test_format_changes(self):
+        self.watcher.start()
+        self.write("other.adoc", "Text\tand tab\n")
+        added, resolved = self.watcher.poll()
+        output = ConsoleReporter(enable_color=False).format_changes(added, resolved)
+        lines = output.splitlines()
+        self.assertTrue(lines[0].startswith("+ ✗ "))
+        self.assertTrue(lines[-2].startswith("- ✓ "))
+        self.assertEqual(lines[-1], f"{len(added)} new, 1 resolved")
+
+    def test_run_until_interrupted(self):
+        output = io.StringIO()
+        watcher = Watcher(self.linter, [self.root], output=output)
+
+        def interrupt():
+            raise KeyboardInterrupt
+
+        watcher.poll = interrupt
+        self.assertEqual(watcher.run(0), 0)
+        self.assertIn("Watching for changes", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()